@@ -2,6 +2,9 @@
 ASGI config for volunteer_management project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with e.g.
+``gunicorn volunteer_management.asgi:application -k uvicorn.workers.UvicornWorker``
+to use the async views in volunteers/async_views.py.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
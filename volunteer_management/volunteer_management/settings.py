@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -44,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'volunteers.middleware.RequestMetricsMiddleware',  # first, so it times the whole stack
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -56,6 +58,9 @@ MIDDLEWARE = [
 
 CORS_ALLOW_ALL_ORIGINS = True
 
+# Queries slower than this are logged (with the line that issued them) to `volunteers.slow_queries`
+SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 200))
+
 ROOT_URLCONF = 'volunteer_management.urls'
 
 TEMPLATES = [
@@ -80,43 +85,138 @@ WSGI_APPLICATION = 'volunteer_management.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': 'prabhav_volunteers',
-        'USER': 'postgres',
-        'PASSWORD': 'varain15',
-        'HOST': 'localhost',
-        'PORT': '5432',
+def _env_int(name, default):
+    return int(os.environ.get(name, default))
+
+
+# DB_CONN_MODE chooses how connections are reused between requests:
+#   none        a new connection per request (Django's default)
+#   persistent  keep each worker's connection for DB_CONN_MAX_AGE seconds, health-checked before reuse
+#   pool        a psycopg 3 connection pool per worker (needs `psycopg[pool]`), sized by DB_POOL_MIN_SIZE /
+#               DB_POOL_MAX_SIZE, with requests waiting up to DB_POOL_TIMEOUT seconds for a free connection
+# volunteers.db_metrics reports checkouts, wait time and connection churn at /api/admin/db-pool/.
+DB_CONN_MODE = os.environ.get('DB_CONN_MODE', 'persistent')
+
+if os.environ.get('DB_ENGINE') == 'sqlite':
+    # Local runs without PostgreSQL; pooling does not apply
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', str(BASE_DIR / 'db.sqlite3')),
+        }
     }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'prabhav_volunteers'),
+            'USER': os.environ.get('DB_USER', 'postgres'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', 'varain15'),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+        }
+    }
+    if DB_CONN_MODE == 'persistent':
+        DATABASES['default']['CONN_MAX_AGE'] = _env_int('DB_CONN_MAX_AGE', 60)
+        DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    elif DB_CONN_MODE == 'pool':
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': _env_int('DB_POOL_MIN_SIZE', 2),
+                'max_size': _env_int('DB_POOL_MAX_SIZE', 10),
+                'timeout': _env_int('DB_POOL_TIMEOUT', 10),
+            },
+        }
+
+# Caches
+# `default` holds versioned response caches (volunteers.cache); `auth_tokens` holds token -> user
+# lookups for CachedTokenAuthentication. LocMemCache is per process: with several workers point
+# both at a shared backend (Redis/Memcached) so invalidations reach every worker.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'auth_tokens': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'auth-tokens',
+        'TIMEOUT': 300,
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
 }
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'volunteers.authentication.CachedTokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
+    # ✅ Opt-in: only paginates when the request sends `page_size` or `cursor`
+    'DEFAULT_PAGINATION_CLASS': 'volunteers.pagination.OptInCursorPagination',
+    # ✅ orjson when installed; byte-identical to the stock JSON renderer/parser either way
+    'DEFAULT_RENDERER_CLASSES': [
+        'volunteers.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'volunteers.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
+# Background jobs (`manage.py run_worker`): where export jobs write their files
+JOB_FILES_DIR = Path(os.environ.get('JOB_FILES_DIR', BASE_DIR / 'job_files'))
+
+# Logging
+# Records go through a bounded queue to a background thread that writes JSON lines, so request
+# threads never wait on I/O (volunteers.logging_pipeline). By default they go to stderr for the
+# process manager or container runtime to collect. Controls:
+#   LOG_DIR=/var/log/volunteers                  opt-in: append to LOG_DIR/app.log instead; the file is
+#                                                reopened when moved, so rotate it externally (logrotate)
+#   LOG_LEVEL                                    root level for the project loggers (default INFO)
+#   LOG_LEVELS="django.request=WARNING,..."      per-logger level overrides
+#   LOG_SAMPLE_RATES="django.request=0.1,..."    per-logger sampling (fraction of records kept)
+#   SQL_LOG_SAMPLE_RATE=0.01                     log that fraction of SQL statements to `volunteers.sql` (off by default)
+def _env_map(name):
+    items = (part.partition('=') for part in os.environ.get(name, '').split(',') if '=' in part)
+    return {key.strip(): value.strip() for key, _, value in items}
+
+
+LOG_DIR = os.environ.get('LOG_DIR')
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+SQL_LOG_SAMPLE_RATE = float(os.environ.get('SQL_LOG_SAMPLE_RATE', 0))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': False,
+    'formatters': {
+        'json': {'()': 'volunteers.logging_pipeline.JsonFormatter'},
+    },
+    'filters': {
+        'sample_sql': {'()': 'volunteers.logging_pipeline.SamplingFilter', 'rate': SQL_LOG_SAMPLE_RATE},
+    },
     'handlers': {
-        'file': {
-            'level': 'DEBUG',
-            'class': 'logging.FileHandler',
-            'filename': 'debug.log',
+        'app': {
+            'class': 'volunteers.logging_pipeline.QueuedLogHandler',
+            'filename': str(Path(LOG_DIR) / 'app.log') if LOG_DIR else None,
+            'formatter': 'json',
         },
     },
     'loggers': {
-        'django': {
-            'handlers': ['file'],
-            'level': 'DEBUG',
-            'propagate': True,
-        },
+        'django': {'handlers': ['app'], 'level': LOG_LEVEL, 'propagate': True},
+        # Never the per-statement DEBUG stream; use SQL_LOG_SAMPLE_RATE instead
+        'django.db.backends': {'level': 'INFO'},
+        'volunteers': {'handlers': ['app'], 'level': LOG_LEVEL, 'propagate': False},
+        'volunteers.sql': {'handlers': ['app'], 'level': 'INFO', 'filters': ['sample_sql'], 'propagate': False},
     },
 }
+for _name, _level in _env_map('LOG_LEVELS').items():
+    LOGGING['loggers'].setdefault(_name, {'handlers': ['app'], 'propagate': False})['level'] = _level.upper()
+for _name, _rate in _env_map('LOG_SAMPLE_RATES').items():
+    LOGGING['filters'][f'sample_{_name}'] = {'()': 'volunteers.logging_pipeline.SamplingFilter', 'rate': float(_rate)}
+    _logger = LOGGING['loggers'].setdefault(_name, {'handlers': ['app'], 'level': LOG_LEVEL, 'propagate': False})
+    _logger.setdefault('filters', []).append(f'sample_{_name}')
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -3,11 +3,14 @@ from django.urls import path
 from volunteers.views import (  
     RegisterView, CustomAuthToken, UserView, 
     EventListCreateView, VolunteerListView, 
-    AssignVolunteerHoursView, VolunteerHoursSummaryView, 
-    DeleteEventView, MarkAttendanceView, 
+    AssignVolunteerHoursView, AssignVolunteerHoursBatchView, VolunteerHoursSummaryView, 
+    ImportVolunteersView, LeaderboardView, AnalyticsView, RefreshAnalyticsView, ChangeFeedView, 
+    DeleteEventView, MarkAttendanceView, ExportView, JobStatusView, JobFileView, 
     VolunteerAttendanceView, VolunteerProfileView, 
-    EventViewSet, reset_volunteer_password
+    EventViewSet, reset_volunteer_password, auth_cache_stats, db_pool_stats,
+    request_metrics
 )
+from volunteers import async_views
 
 urlpatterns = [
     # 🔐 Authentication
@@ -22,16 +25,32 @@ urlpatterns = [
     path('api/events/', EventListCreateView.as_view(), name='events'),  # List & Add Events
     path('api/events/list/', EventViewSet.as_view({'get': 'list_events'}), name='event-list'),  # Filtered Event List
     path('api/events/delete_event/', DeleteEventView.as_view(), name='delete_event'),  # Delete by title & date
+    path('api/changes/', ChangeFeedView.as_view(), name='changes'),  # Delta sync feed (?since=<token>)
 
     # 👥 Admin Panel APIs
     path('api/admin/volunteers/', VolunteerListView.as_view(), name='volunteers'),  # List/Search Volunteers
+    path('api/admin/volunteers/import/', ImportVolunteersView.as_view(), name='import_volunteers'),  # Bulk CSV import
     path('api/assign_hours/', AssignVolunteerHoursView.as_view(), name='assign_hours'),  # Assign Hours
+    path('api/assign_hours/batch/', AssignVolunteerHoursBatchView.as_view(), name='assign_hours_batch'),  # Assign Hours (JSON/CSV batch)
     path('api/admin/hours/summary/', VolunteerHoursSummaryView.as_view(), name='volunteers_summary'),  # Summary
+    path('api/admin/leaderboard/', LeaderboardView.as_view(), name='leaderboard'),  # Ranked top N / around a volunteer
+    path('api/admin/analytics/refresh/', RefreshAnalyticsView.as_view(), name='refresh_analytics'),  # Rollup rebuild (202 + job)
+    path('api/admin/analytics/<str:dimension>/', AnalyticsView.as_view(), name='analytics'),  # Hours series from rollups
+    path('api/admin/export/<str:dataset>/', ExportView.as_view(), name='export'),  # Streaming CSV/NDJSON export
+    path('api/admin/jobs/<int:job_id>/', JobStatusView.as_view(), name='job_status'),  # Background job status / progress
+    path('api/admin/jobs/<int:job_id>/file/', JobFileView.as_view(), name='job_file'),  # File written by an export job
     path('api/admin/attendance/mark/', MarkAttendanceView.as_view(), name='mark_attendance'),  # Mark Attendance
     path('api/admin/reset-password/', reset_volunteer_password),
+    path('api/admin/auth-cache/', auth_cache_stats, name='auth_cache_stats'),  # Token cache hit/miss counters
+    path('api/admin/db-pool/', db_pool_stats, name='db_pool_stats'),  # Connection churn / pool counters
+    path('api/admin/metrics/', request_metrics, name='request_metrics'),  # Prometheus per-view metrics
 
 
     # 🙋 Volunteer (Self View)
     path('api/volunteer/attendance/', VolunteerAttendanceView.as_view(), name='volunteer_attendance'),  # Attendance View
     path('api/volunteer/profile/', VolunteerProfileView.as_view(), name='volunteer_profile'),  # Dashboard Profile
+
+    # ⚡ Async (ASGI) versions of the dashboard endpoints
+    path('api/async/user/', async_views.user_info, name='async_user'),
+    path('api/async/volunteer/profile/', async_views.volunteer_profile, name='async_volunteer_profile'),
 ]
@@ -0,0 +1,234 @@
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate, TruncMonth
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import AttendanceRecord, HoursRollup, RollupDirtyDay, RollupWatermark, VolunteerHours
+
+
+WATERMARK = "hours"
+# Rows are picked up by updated_at, which is stamped before their transaction commits;
+# re-reading this far behind the watermark catches rows from transactions still open last run
+OVERLAP = timedelta(minutes=5)
+DAY_CHUNK = 200
+BATCH_SIZE = 1000
+DEFAULT_POINTS = {HoursRollup.DAY: 30, HoursRollup.MONTH: 12}
+MAX_POINTS = {HoursRollup.DAY: 366, HoursRollup.MONTH: 120}
+
+
+class AnalyticsError(ValueError):
+    pass
+
+
+def mark_dirty(days):
+    """Queue days for recomputation on the next refresh (used for deletes and moved events)."""
+    days = {d for d in days if d is not None}
+    if days:
+        RollupDirtyDay.objects.bulk_create([RollupDirtyDay(day=d) for d in days])
+
+
+def _day_range(days):
+    # created_at bounds for a set of days, so the index on it applies
+    tz = timezone.get_current_timezone()
+    return (
+        timezone.make_aware(datetime.combine(min(days), time.min), tz),
+        timezone.make_aware(datetime.combine(max(days) + timedelta(days=1), time.min), tz),
+    )
+
+
+def _changed_days(since=None):
+    hours = VolunteerHours.objects.all()
+    attendance = AttendanceRecord.objects.all()
+    if since is not None:
+        hours = hours.filter(updated_at__gt=since)
+        attendance = attendance.filter(updated_at__gt=since)
+    days = set(hours.order_by().values_list("event__date", flat=True).distinct())
+    days |= set(attendance.annotate(day=TruncDate("created_at")).order_by().values_list("day", flat=True).distinct())
+    return days
+
+
+def _rebuild_days(days):
+    """Recompute the daily rollups for `days` from the raw rows; returns the number of rows written."""
+    written = 0
+    days = sorted(days)
+    for i in range(0, len(days), DAY_CHUNK):
+        chunk = set(days[i:i + DAY_CHUNK])
+        totals = {}
+
+        def add(dimension, key, day, event_hours=0, online_hours=0, entries=0):
+            row = totals.setdefault((dimension, str(key), day), [0, Decimal(0), 0])
+            row[0] += event_hours or 0
+            row[1] += online_hours or 0
+            row[2] += entries
+
+        hours = VolunteerHours.objects.filter(event__date__in=chunk).order_by()
+        for group in ("event_id", "volunteer_id"):
+            dimension = HoursRollup.EVENT if group == "event_id" else HoursRollup.VOLUNTEER
+            for r in hours.values("event__date", group).annotate(total=Sum("hours"), n=Count("id")):
+                add(dimension, r[group], r["event__date"], event_hours=r["total"], entries=r["n"])
+
+        start, end = _day_range(chunk)
+        attendance = AttendanceRecord.objects.filter(created_at__gte=start, created_at__lt=end).annotate(
+            day=TruncDate("created_at")
+        ).order_by()
+        for group in ("topic", "volunteer_id"):
+            dimension = HoursRollup.TOPIC if group == "topic" else HoursRollup.VOLUNTEER
+            for r in attendance.values("day", group).annotate(total=Sum("online_hours"), n=Count("id")):
+                if r["day"] in chunk:
+                    add(dimension, r[group] or "", r["day"], online_hours=r["total"], entries=r["n"])
+
+        HoursRollup.objects.filter(granularity=HoursRollup.DAY, bucket__in=chunk).delete()
+        HoursRollup.objects.bulk_create([
+            HoursRollup(
+                granularity=HoursRollup.DAY, dimension=dimension, key=key, bucket=day,
+                event_hours=event_hours, online_hours=online_hours, entries=entries,
+            )
+            for (dimension, key, day), (event_hours, online_hours, entries) in totals.items()
+        ], batch_size=BATCH_SIZE)
+        written += len(totals)
+    return written
+
+
+def _rebuild_months(months):
+    """Recompute the monthly rollups for `months` (first days) by summing their daily rollups."""
+    if not months:
+        return 0
+    daily = HoursRollup.objects.filter(
+        granularity=HoursRollup.DAY, bucket__gte=min(months), bucket__lt=_add_months(max(months), 1)
+    ).annotate(month=TruncMonth("bucket")).order_by().values("dimension", "key", "month").annotate(
+        event_total=Sum("event_hours"), online_total=Sum("online_hours"), entry_total=Sum("entries")
+    )
+    rows = [
+        HoursRollup(
+            granularity=HoursRollup.MONTH, dimension=r["dimension"], key=r["key"], bucket=r["month"],
+            event_hours=r["event_total"], online_hours=r["online_total"], entries=r["entry_total"],
+        )
+        for r in daily
+        if r["month"] in months
+    ]
+    HoursRollup.objects.filter(granularity=HoursRollup.MONTH, bucket__in=months).delete()
+    HoursRollup.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def refresh(full=False):
+    """
+    Fold hours and attendance changed since the last run into HoursRollup.
+
+    Only the days touched by rows updated after the watermark (less OVERLAP),
+    plus days queued by mark_dirty, are recomputed from the raw rows, then the
+    months containing them. `full` (or a first run) rebuilds everything.
+    """
+    with transaction.atomic():
+        mark, _ = RollupWatermark.objects.select_for_update().get_or_create(name=WATERMARK)
+        started = timezone.now()
+        if full or mark.value is None:
+            HoursRollup.objects.all().delete()
+            RollupDirtyDay.objects.all().delete()
+            days = _changed_days()
+        else:
+            dirty = list(RollupDirtyDay.objects.values_list("id", "day"))
+            days = _changed_days(mark.value - OVERLAP) | {day for _, day in dirty}
+            RollupDirtyDay.objects.filter(id__in=[pk for pk, _ in dirty]).delete()
+
+        rows = _rebuild_days(days)
+        rows += _rebuild_months({day.replace(day=1) for day in days})
+        mark.value = started
+        mark.save(update_fields=["value"])
+    return {"days": len(days), "rows": rows, "watermark": started}
+
+
+def _add_months(day, months):
+    month = day.month - 1 + months
+    return date(day.year + month // 12, month % 12 + 1, 1)
+
+
+def _parse_bound(name, value):
+    try:
+        parsed = parse_date(value) if value else None
+    except ValueError:
+        parsed = None
+    if value and parsed is None:
+        raise AnalyticsError(f"Invalid {name} date. Use YYYY-MM-DD.")
+    return parsed
+
+
+def _span(granularity, start, end):
+    # Number of buckets from start to end inclusive, worked out before any are built
+    if granularity == HoursRollup.DAY:
+        return (end - start).days + 1
+    return (end.year * 12 + end.month) - (start.year * 12 + start.month) + 1
+
+
+def _buckets(granularity, start, end):
+    # Counted rather than stepped past `end`, so 9999-12-31 never overflows
+    if granularity == HoursRollup.DAY:
+        return [start + timedelta(days=i) for i in range(_span(granularity, start, end))]
+    return [_add_months(start, i) for i in range(_span(granularity, start, end))]
+
+
+def series(dimension, granularity=HoursRollup.DAY, key=None, start=None, end=None):
+    """
+    A zero-filled series read straight from HoursRollup: one point per day or
+    month between `start` and `end`, for one `key` or summed over all keys.
+    """
+    if dimension not in dict(HoursRollup.DIMENSIONS):
+        raise AnalyticsError(f"Unknown dimension. Choose one of: {', '.join(dict(HoursRollup.DIMENSIONS))}.")
+    if granularity not in dict(HoursRollup.GRANULARITIES):
+        raise AnalyticsError(f"Unknown granularity. Choose one of: {', '.join(dict(HoursRollup.GRANULARITIES))}.")
+
+    start, end = _parse_bound("start", start), _parse_bound("end", end)
+    end = end or date.today()
+    try:
+        if granularity == HoursRollup.MONTH:
+            end = end.replace(day=1)
+            start = start.replace(day=1) if start else _add_months(end, 1 - DEFAULT_POINTS[granularity])
+        else:
+            start = start or end - timedelta(days=DEFAULT_POINTS[granularity] - 1)
+    except (OverflowError, ValueError):
+        raise AnalyticsError("Dates out of range.")
+    if start > end:
+        raise AnalyticsError("start must not be after end.")
+    if _span(granularity, start, end) > MAX_POINTS[granularity]:
+        raise AnalyticsError(f"At most {MAX_POINTS[granularity]} {granularity} points per request.")
+    buckets = _buckets(granularity, start, end)
+
+    rows = HoursRollup.objects.filter(
+        dimension=dimension, granularity=granularity, bucket__gte=start, bucket__lte=end
+    ).order_by()
+    if key is not None:
+        rows = rows.filter(key=key)
+    found = {
+        r["bucket"]: r
+        for r in rows.values("bucket").annotate(
+            event_total=Sum("event_hours"), online_total=Sum("online_hours"), entry_total=Sum("entries")
+        )
+    }
+
+    points = []
+    for bucket in buckets:
+        r = found.get(bucket, {})
+        event_hours = r.get("event_total") or 0
+        online_hours = float(r.get("online_total") or 0)
+        points.append({
+            "bucket": bucket.isoformat(),
+            "event_hours": event_hours,
+            "online_hours": online_hours,
+            "total_hours": event_hours + online_hours,
+            "entries": r.get("entry_total") or 0,
+        })
+
+    refreshed = RollupWatermark.objects.filter(name=WATERMARK).values_list("value", flat=True).first()
+    return {
+        "dimension": dimension,
+        "granularity": granularity,
+        "key": key,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "refreshed_at": refreshed.isoformat() if refreshed else None,
+        "series": points,
+    }
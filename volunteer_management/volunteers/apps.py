@@ -1,6 +1,27 @@
 from django.apps import AppConfig
+from django.core.signals import request_started
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+def create_search_tables(sender, using, **kwargs):
+    from .search import ensure_sqlite_fts
+    ensure_sqlite_fts(using)
 
 
 class VolunteersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'volunteers'
+
+    def ready(self):
+        # ✅ SQLite search uses FTS5 tables kept in sync by triggers
+        post_migrate.connect(create_search_tables, sender=self)
+
+        # ✅ Connection reuse counters for /api/admin/db-pool/
+        from . import db_metrics
+        request_started.connect(db_metrics.count_request)
+        connection_created.connect(db_metrics.count_connection)
+
+        # ✅ Per-request SQL timing for RequestMetricsMiddleware
+        from .request_metrics import install_query_recorder
+        connection_created.connect(install_query_recorder)
@@ -0,0 +1,65 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.http import JsonResponse
+from rest_framework import exceptions
+from rest_framework.authentication import get_authorization_header
+
+from .authentication import CachedTokenAuthentication
+from .cache import acached_profile
+from .dashboard import abuild_parts, profile_payload, user_info_payload, PROFILE_PARTS, USER_INFO_PARTS
+
+
+# ✅ Async versions of the dashboard endpoints, served under ASGI (see asgi.py)
+# DRF's APIView is sync-only, so these are plain Django async views that
+# authenticate with the same cached token lookup and return the same payloads.
+
+async def _authenticate(request):
+    auth = get_authorization_header(request).split()
+    if not auth or auth[0].lower() != b'token':
+        return None, JsonResponse({"detail": "Authentication credentials were not provided."}, status=401)
+    if len(auth) != 2:
+        return None, JsonResponse({"detail": "Invalid token header."}, status=401)
+    try:
+        key = auth[1].decode()
+        user, _ = await sync_to_async(CachedTokenAuthentication().authenticate_credentials)(key)
+    except UnicodeError:
+        return None, JsonResponse({"detail": "Invalid token header."}, status=401)
+    except exceptions.AuthenticationFailed as exc:
+        return None, JsonResponse({"detail": str(exc.detail)}, status=401)
+    return user, None
+
+
+# ✅ Retrieve User Info (Admin Only) — async
+async def user_info(request):
+    if request.method != "GET":
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    user, error = await _authenticate(request)
+    if error:
+        return error
+    if not user.is_staff:
+        return JsonResponse({"detail": "You do not have permission to perform this action."}, status=403)
+
+    name = request.GET.get("name", "")
+    if not name:
+        return JsonResponse({"error": "Name parameter is required"}, status=400)
+
+    volunteer = await User.objects.filter(username__iexact=name).afirst()
+    if not volunteer:
+        return JsonResponse({"error": "Volunteer not found"}, status=404)
+
+    parts = await abuild_parts(volunteer, USER_INFO_PARTS)
+    return JsonResponse(user_info_payload(volunteer, parts))
+
+
+# ✅ Volunteer Dashboard Profile — async
+async def volunteer_profile(request):
+    if request.method != "GET":
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    user, error = await _authenticate(request)
+    if error:
+        return error
+
+    async def build():
+        return profile_payload(user, await abuild_parts(user, PROFILE_PARTS))
+
+    return JsonResponse(await acached_profile(user.pk, build))
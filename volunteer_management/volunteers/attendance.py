@@ -0,0 +1,92 @@
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+
+from .models import AttendanceRecord, AttendanceSubmission
+from .cache import bump_users
+from .stats import apply_stats_deltas, online_hours_delta
+
+
+BATCH_SIZE = 1000
+MAX_HOURS = Decimal('1000')
+HOURS_PRECISION = Decimal('0.01')
+
+
+class InvalidHours(ValueError):
+    def __init__(self, username):
+        super().__init__(f"Invalid hours for {username}.")
+        self.username = username
+
+
+def parse_hours(volunteer_hours):
+    """
+    Validate {username: hours} up front; raise InvalidHours on the first bad value.
+
+    Hours become Decimals rounded to 0.01, finite and in [0, MAX_HOURS), which is
+    what AttendanceRecord.online_hours (max_digits=5) can hold.
+    """
+    parsed = {}
+    for username, hours in volunteer_hours.items():
+        if isinstance(hours, bool):
+            raise InvalidHours(username)
+        try:
+            value = Decimal(str(hours).strip()).quantize(HOURS_PRECISION)
+        except (TypeError, ValueError, ArithmeticError):
+            raise InvalidHours(username)
+        if not value.is_finite() or not 0 <= value < MAX_HOURS:
+            raise InvalidHours(username)
+        parsed[username] = value
+    return parsed
+
+
+def mark_attendance(topic, volunteer_hours, idempotency_key=None):
+    """
+    Log one attendance session for many volunteers.
+
+    Usernames are resolved with a single `username__in` query and every record
+    is written with one `bulk_create`, all inside a single transaction. When an
+    `idempotency_key` is given and was already used, nothing is written and the
+    original result is returned with `replayed=True`.
+    """
+    parsed = parse_hours(volunteer_hours)
+
+    try:
+        with transaction.atomic():
+            submission = None
+            if idempotency_key:
+                submission = AttendanceSubmission.objects.create(key=idempotency_key, topic=topic)
+
+            volunteers = dict(
+                User.objects.filter(is_staff=False, username__in=list(parsed)).values_list("username", "id")
+            )
+            unknown = sorted(set(parsed) - set(volunteers))
+
+            records = []
+            deltas = {}
+            for username, volunteer_id in volunteers.items():
+                online, meetings = online_hours_delta(parsed[username])
+                records.append(AttendanceRecord(volunteer_id=volunteer_id, topic=topic, online_hours=online))
+                deltas[volunteer_id] = {"online_hours": online, "meeting_count": meetings}
+
+            AttendanceRecord.objects.bulk_create(records, batch_size=BATCH_SIZE)
+            apply_stats_deltas(deltas)
+            bump_users(deltas)  # bulk_create sends no post_save
+
+            if submission:
+                submission.records_created = len(records)
+                submission.unknown_usernames = unknown
+                submission.save(update_fields=["records_created", "unknown_usernames"])
+    except IntegrityError:
+        if not idempotency_key:
+            raise
+        submission = AttendanceSubmission.objects.filter(key=idempotency_key).first()
+        if submission is None:
+            raise
+        return {
+            "records_created": submission.records_created,
+            "unknown_usernames": submission.unknown_usernames,
+            "replayed": True,
+        }
+
+    return {"records_created": len(records), "unknown_usernames": unknown, "replayed": False}
@@ -0,0 +1,105 @@
+import hashlib
+import threading
+import time
+
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+
+CACHE_ALIAS = 'auth_tokens'
+
+
+class _Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def incr(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def reset(self):
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.invalidations = 0
+
+    def snapshot(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+counters = _Counters()
+
+
+def _token_cache_key(key):
+    # Never store raw tokens as cache keys
+    return 'authtoken:key:' + hashlib.sha256(key.encode()).hexdigest()
+
+
+def _version_cache_key(user_id):
+    return f'authtoken:version:{user_id}'
+
+
+def _seed():
+    # Start from the clock so a version key lost to eviction never repeats an old value
+    return time.time_ns()
+
+
+def invalidate_token(key):
+    caches[CACHE_ALIAS].delete(_token_cache_key(key))
+    counters.incr('invalidations')
+
+
+def invalidate_user(user_id):
+    """
+    Retire every cached token resolution for `user_id` (password reset, deactivation,
+    staff change...) by bumping its version. If the version key was evicted, the
+    cached entries already fail the comparison, so there is nothing to miss.
+    """
+    cache = caches[CACHE_ALIAS]
+    key = _version_cache_key(user_id)
+    if not cache.add(key, _seed(), timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:  # evicted between add() and incr()
+            cache.add(key, _seed(), timeout=None)
+    counters.incr('invalidations')
+
+
+# ✅ Token auth that skips the authtoken_token/auth_user join on repeat requests
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    DRF token authentication with the token -> user resolution cached.
+
+    Entries live in the `auth_tokens` cache (a bounded LRU with a TTL when it is
+    LocMemCache; point it at a shared backend when running several workers so
+    invalidation reaches all of them). Each entry carries the user's version,
+    which is read on every hit and bumped by invalidate_user, so an evicted or
+    bumped version turns the entry into a miss. Receivers in volunteers.models
+    invalidate on user saves and deletes and on token deletion.
+    """
+
+    def authenticate_credentials(self, key):
+        cache = caches[CACHE_ALIAS]
+        entry = cache.get(_token_cache_key(key))
+        if entry is not None:
+            user, version = entry
+            if cache.get(_version_cache_key(user.pk)) == version:
+                counters.incr('hits')
+                return (user, self.get_model()(key=key, user=user))
+
+        counters.incr('misses')
+        user, token = super().authenticate_credentials(key)
+        version_key = _version_cache_key(user.pk)
+        cache.add(version_key, _seed(), timeout=None)
+        version = cache.get(version_key)
+        if version is not None:
+            cache.set(_token_cache_key(key), (user, version))
+        return (user, token)
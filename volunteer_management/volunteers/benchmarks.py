@@ -0,0 +1,234 @@
+import json
+import statistics
+import time
+from datetime import date
+
+from django.core.cache import caches
+from django.test import Client
+from django.urls import get_resolver
+from django.utils import timezone
+
+from .changes import make_token
+from .jobs import enqueue, run_pending
+from .models import Event
+from .request_metrics import registry
+from .seeding import seed, SEED_PASSWORD
+
+
+# Routes with no case here: the Django admin site is not part of the API
+SKIPPED_ROUTES = {"admin/"}
+
+
+class Case:
+    """One benchmarked request: the route it covers, who sends it, and its query budget."""
+
+    def __init__(self, route, method, path, max_queries, role="admin", data=None, setup=None, name=None,
+                 known_issue=None):
+        self.route = route
+        self.method = method
+        self.path = path
+        self.max_queries = max_queries
+        self.role = role
+        self.data = data  # callable(ctx, i) -> request body
+        self.setup = setup  # callable(ctx, i), run before the (timed) request
+        self.name = name or f"{method} {'/' + route if callable(path) else path}"
+        self.known_issue = known_issue  # reported, but does not fail the run until it is fixed
+
+
+def _volunteer(ctx):
+    return ctx["volunteers"][0]
+
+
+def _event(ctx):
+    return ctx["events"][0]
+
+
+def _fresh_event(ctx, i, title="Benchmark delete"):
+    Event.objects.create(title=f"{title} {i}", description="", date=date(2099, 1, 1))
+
+
+def _queued_job(ctx, i):
+    ctx["job"] = enqueue("refresh_analytics", {}, user=ctx["admin"])
+
+
+def _finished_export(ctx, i):
+    ctx["export_job"] = enqueue("export", {"dataset": "hours", "output": "csv"}, user=ctx["admin"])
+    run_pending(kinds=["export"])
+
+
+def _hours_entries(ctx, i):
+    event = _event(ctx)
+    return {"entries": [
+        {"volunteer": v.username, "event": event.title, "event_date": str(event.date), "hours": (i % 8) + 1}
+        for v in ctx["volunteers"][:50]
+    ]}
+
+
+CASES = [
+    Case("register/", "post", "/register/", 5, role=None,
+         data=lambda ctx, i: {"username": f"bench_register_{ctx['scale']}_{i}", "password": "bench-pass-123"}),
+    Case("token/", "post", "/token/", 2, role=None,
+         data=lambda ctx, i: {"username": _volunteer(ctx).username, "password": SEED_PASSWORD}),
+    Case("user/", "get", lambda ctx: f"/user/?name={_volunteer(ctx).username}", 5),
+    Case("api/events/", "get", "/api/events/", 2),
+    Case("api/events/list/", "get", "/api/events/list/", 1),
+    Case("api/events/list/", "get", "/api/events/list/?search=event", 2, name="get /api/events/list/?search"),
+    Case("api/events/delete_event/", "delete",
+         lambda ctx: "/api/events/delete_event/?event_name=Benchmark%20delete%20{i}&event_date=2099-01-01", 11,
+         setup=_fresh_event),
+    Case("api/events/delete_event/", "delete",
+         lambda ctx: "/api/events/delete_event/?event_name=Benchmark%20queued%20{i}&event_date=2099-01-01&background=1", 2,
+         setup=lambda ctx, i: _fresh_event(ctx, i, "Benchmark queued"), name="delete /api/events/delete_event/ (background)"),
+    Case("api/changes/", "get", "/api/changes/", 0, name="get /api/changes/ (bootstrap)"),
+    Case("api/changes/", "get", lambda ctx: f"/api/changes/?since={make_token(timezone.now())}", 9),
+    Case("api/admin/volunteers/", "get", "/api/admin/volunteers/", 3),
+    Case("api/admin/volunteers/", "get", "/api/admin/volunteers/?page_size=50", 3, name="get /api/admin/volunteers/ (page)"),
+    Case("api/admin/volunteers/import/", "post", "/api/admin/volunteers/import/", 5,
+         data=lambda ctx, i: {"volunteers": [
+             {"username": f"bench_import_{ctx['scale']}_{i}_{n}", "password": "bench-pass-123"} for n in range(20)
+         ]}),
+    Case("api/admin/volunteers/import/", "post", "/api/admin/volunteers/import/?background=1", 1,
+         data=lambda ctx, i: {"volunteers": [
+             {"username": f"bench_queued_{ctx['scale']}_{i}_{n}", "password": "bench-pass-123"} for n in range(20)
+         ]}, name="post /api/admin/volunteers/import/ (background)"),
+    Case("api/assign_hours/", "post", "/api/assign_hours/", 14,
+         data=lambda ctx, i: {"volunteer": _volunteer(ctx).username, "event": _event(ctx).title,
+                              "event_date": str(_event(ctx).date), "hours": (i % 8) + 1}),
+    Case("api/assign_hours/batch/", "post", "/api/assign_hours/batch/", 11, data=_hours_entries),
+    Case("api/admin/hours/summary/", "get", "/api/admin/hours/summary/", 1),
+    Case("api/admin/leaderboard/", "get", "/api/admin/leaderboard/?limit=10", 0),  # cached after the warm-up
+    Case("api/admin/leaderboard/", "get", lambda ctx: f"/api/admin/leaderboard/?period=year&around={_volunteer(ctx).username}&size={{i}}",
+         4, name="get /api/admin/leaderboard/?around"),
+    Case("api/admin/analytics/refresh/", "post", "/api/admin/analytics/refresh/", 1, data=lambda ctx, i: {"full": False}),
+    Case("api/admin/analytics/<str:dimension>/", "get", "/api/admin/analytics/event/?granularity=month", 2),
+    Case("api/admin/analytics/<str:dimension>/", "get", "/api/admin/analytics/topic/?start=2025-01-01&end=2025-12-31", 2,
+         name="get /api/admin/analytics/ (year of days)"),
+    # Streamed rows are read after the middleware returns, so only the setup queries count here
+    Case("api/admin/export/<str:dataset>/", "get", "/api/admin/export/hours/?output=csv", 0),
+    Case("api/admin/export/<str:dataset>/", "get", "/api/admin/export/hours/?output=csv&background=1", 1,
+         name="get /api/admin/export/ (background)"),
+    Case("api/admin/jobs/<int:job_id>/", "get", lambda ctx: f"/api/admin/jobs/{ctx['job'].pk}/", 1, setup=_queued_job),
+    Case("api/admin/jobs/<int:job_id>/file/", "get", lambda ctx: f"/api/admin/jobs/{ctx['export_job'].pk}/file/", 1,
+         setup=_finished_export),
+    Case("api/admin/attendance/mark/", "post", "/api/admin/attendance/mark/", 7,
+         data=lambda ctx, i: {"topic": f"Benchmark session {i}",
+                              "volunteer_hours": {v.username: 1 for v in ctx["volunteers"][:50]}}),
+    Case("api/admin/attendance/mark/", "post", "/api/admin/attendance/mark/?background=1", 1,
+         data=lambda ctx, i: {"topic": f"Benchmark background session {i}",
+                              "volunteer_hours": {v.username: 1 for v in ctx["volunteers"][:50]}},
+         name="post /api/admin/attendance/mark/ (background)"),
+    Case("api/admin/reset-password/", "post", "/api/admin/reset-password/", 4,
+         data=lambda ctx, i: {"username": ctx["volunteers"][-1].username, "new_password": SEED_PASSWORD}),
+    Case("api/admin/auth-cache/", "get", "/api/admin/auth-cache/", 1),
+    Case("api/admin/db-pool/", "get", "/api/admin/db-pool/", 1),
+    Case("api/admin/metrics/", "get", "/api/admin/metrics/", 1),
+    Case("api/volunteer/attendance/", "get", "/api/volunteer/attendance/", 1, role="volunteer"),
+    Case("api/volunteer/profile/", "get", "/api/volunteer/profile/", 0, role="volunteer"),
+    Case("api/async/user/", "get", lambda ctx: f"/api/async/user/?name={_volunteer(ctx).username}", 5),
+    Case("api/async/volunteer/profile/", "get", "/api/async/volunteer/profile/", 0, role="volunteer"),
+]
+
+
+def route_patterns(resolver=None):
+    """Every top-level route in urls.py, as written there."""
+    return {str(p.pattern) for p in (resolver or get_resolver()).url_patterns}
+
+
+def uncovered_routes(cases=CASES):
+    return sorted(route_patterns() - SKIPPED_ROUTES - {c.route for c in cases})
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+def _send(client, case, ctx, i):
+    path = case.path(ctx) if callable(case.path) else case.path
+    path = path.replace("{i}", str(i))
+    kwargs = {}
+    if case.role:
+        kwargs["HTTP_AUTHORIZATION"] = f"Token {ctx['tokens'][ctx[case.role].id]}"
+    if case.data:
+        kwargs["data"] = json.dumps(case.data(ctx, i))
+        kwargs["content_type"] = "application/json"
+
+    registry.reset()
+    started = time.perf_counter()
+    response = getattr(client, case.method)(path, **kwargs)
+    if response.streaming:
+        b"".join(response.streaming_content)
+    elapsed = (time.perf_counter() - started) * 1000
+
+    if response.status_code >= 400:
+        raise AssertionError(f"{case.name}: HTTP {response.status_code} {response.content[:200]!r}")
+    queries = sum(v["queries"] for v in registry.snapshot().values())
+    return elapsed, queries
+
+
+def run_case(case, ctx, repeat):
+    """Time `repeat` requests after one warm-up; return (latencies in ms, max queries per request)."""
+    client = Client()
+    if case.setup:
+        case.setup(ctx, 0)
+    _send(client, case, ctx, 0)  # warm-up: fills the token and response caches like a live worker
+
+    samples, queries = [], 0
+    for i in range(1, repeat + 1):
+        if case.setup:
+            case.setup(ctx, i)
+        elapsed, count = _send(client, case, ctx, i)
+        samples.append(elapsed)
+        queries = max(queries, count)
+    return samples, queries
+
+
+def run_suite(scales, repeat=20, cases=CASES):
+    """
+    Seed each scale and run every case against it.
+
+    Returns one result dict per (scale, case). A case fails when it issues more
+    queries than its budget or when its query count changes with the scale,
+    which is how an N+1 shows up.
+    """
+    results = []
+    first_counts = {}
+    for scale in scales:
+        caches["default"].clear()
+        data = seed(volunteers=scale, events=max(scale // 10, 2), roster_size=min(25, scale),
+                    prefix=f"bench{scale}")
+        ctx = {**data, "scale": scale, "volunteer": data["volunteers"][0]}
+
+        for case in cases:
+            samples, queries = run_case(case, ctx, repeat)
+            failures = []
+            if queries > case.max_queries:
+                failures.append(f"{queries} queries > budget {case.max_queries}")
+            previous = first_counts.setdefault(case.name, queries)
+            if queries != previous:
+                failures.append(f"query count changed with scale ({previous} -> {queries})")
+            warnings = []
+            if case.known_issue:
+                warnings = [f"{f} (known: {case.known_issue})" for f in failures]
+                failures = []
+            results.append({
+                "scale": scale,
+                "case": case.name,
+                "queries": queries,
+                "p50_ms": round(statistics.median(samples), 2),
+                "p95_ms": round(_percentile(samples, 95), 2),
+                "failures": failures,
+                "warnings": warnings,
+            })
+    return results
+
+
+def latency_regressions(results, baseline, tolerance):
+    """Results whose p95 exceeds the baseline's by more than `tolerance` (0.5 = 50%)."""
+    previous = {(r["scale"], r["case"]): r["p95_ms"] for r in baseline}
+    regressions = []
+    for r in results:
+        before = previous.get((r["scale"], r["case"]))
+        if before is not None and r["p95_ms"] > before * (1 + tolerance):
+            regressions.append(f"{r['case']} at {r['scale']}: p95 {r['p95_ms']} ms > baseline {before} ms")
+    return regressions
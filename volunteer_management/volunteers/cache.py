@@ -0,0 +1,175 @@
+import hashlib
+import threading
+import time
+from datetime import date
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db import transaction
+
+
+PROFILE_TIMEOUT = 600
+EVENTS_TIMEOUT = 600
+LOCK_TIMEOUT = 10
+POLL_INTERVAL = 0.05
+EVENTS_SCOPE = "events"
+ROSTERS_SCOPE = "rosters"
+MISSING = object()
+
+_local_locks = [threading.Lock() for _ in range(64)]
+
+
+def user_scope(user_id):
+    return f"user:{user_id}"
+
+
+def _version_key(scope):
+    return f"version:{scope}"
+
+
+def _seed():
+    # Start from the clock so a version key lost to eviction never repeats an old value
+    return time.time_ns()
+
+
+def ensure_version(scope):
+    key = _version_key(scope)
+    cache.add(key, _seed(), timeout=None)
+    return cache.get(key)
+
+
+def bump_versions(scopes):
+    """
+    Invalidate everything cached under `scopes`.
+
+    Bumps immediately and again on commit: the second bump drops entries that a
+    concurrent reader built from pre-commit data while the write was in flight.
+    """
+    scopes = set(scopes)
+
+    def bump():
+        for scope in scopes:
+            key = _version_key(scope)
+            if not cache.add(key, _seed(), timeout=None):
+                try:
+                    cache.incr(key)
+                except ValueError:  # evicted between add() and incr()
+                    cache.add(key, _seed(), timeout=None)
+
+    if scopes:
+        bump()
+        if transaction.get_connection().in_atomic_block:
+            transaction.on_commit(bump)
+
+
+def bump_users(user_ids):
+    bump_versions(user_scope(uid) for uid in user_ids)
+
+
+def versions_etag(scopes, *parts):
+    """
+    An ETag for a response built from `scopes`: one `get_many` of their versions,
+    hashed with `parts` (whatever else the response depends on). Any write that
+    bumps one of the scopes changes it, so no SQL is needed to validate.
+    """
+    version_keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(version_keys)
+    versions = tuple(found.get(vk) or ensure_version(scope) for vk, scope in zip(version_keys, scopes))
+    return hashlib.blake2b(repr((versions, parts)).encode(), digest_size=16).hexdigest()
+
+
+def _lock_for(key):
+    # Striped so the number of locks stays fixed however many keys there are
+    return _local_locks[hash(key) % len(_local_locks)]
+
+
+def _lookup(key, scopes, tag):
+    version_keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many([key, *version_keys])
+    versions = tuple(
+        found.get(vk) or ensure_version(scope) for vk, scope in zip(version_keys, scopes)
+    ) + (tag,)
+    entry = found.get(key)
+    return versions, entry[1] if entry is not None and entry[0] == versions else MISSING
+
+
+def cached_versioned(key, scopes, compute, timeout, tag=None):
+    """
+    Return the value cached under `key`, recomputing it with `compute()` on a miss.
+
+    The entry and the versions of `scopes` are read in one `get_many`; an entry
+    is only served if it was built under the current versions (and `tag`), so a
+    write, which bumps a version, makes every older entry unreachable.
+
+    Misses are single-flight: within a process one thread recomputes while the
+    others wait on a lock, and across processes a short-lived `cache.add` lock
+    lets one worker recompute while the rest poll for its result.
+    """
+    versions, value = _lookup(key, scopes, tag)
+    if value is not MISSING:
+        return value
+
+    with _lock_for(key):
+        versions, value = _lookup(key, scopes, tag)
+        if value is not MISSING:
+            return value
+
+        lock_key = f"lock:{key}"
+        if cache.add(lock_key, 1, LOCK_TIMEOUT):
+            try:
+                value = compute()
+                cache.set(key, (versions, value), timeout)
+            finally:
+                cache.delete(lock_key)
+            return value
+
+        deadline = time.monotonic() + LOCK_TIMEOUT
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            versions, value = _lookup(key, scopes, tag)
+            if value is not MISSING:
+                return value
+        return compute()  # the other worker died or is too slow; do not wait forever
+
+
+def cached_profile(user_id, build):
+    """Dashboard payload for `user_id`, invalidated by the user's writes and by event changes."""
+    return cached_versioned(
+        f"profile:{user_id}", (user_scope(user_id), EVENTS_SCOPE), build, PROFILE_TIMEOUT,
+        tag=date.today().isoformat(),
+    )
+
+
+def cached_upcoming_events():
+    """The shared upcoming-event list, keyed on today's date and the event-table version."""
+    from .models import Event  # models imports this module for its signal receivers
+
+    today = date.today()
+    return cached_versioned(
+        "upcoming_events", (EVENTS_SCOPE,),
+        lambda: list(Event.objects.filter(date__gte=today).values("title", "date", "time", "description")),
+        EVENTS_TIMEOUT, tag=today.isoformat(),
+    )
+
+
+def cached_event_list(build):
+    """The unfiltered event list (with rosters), shared by every user."""
+    return cached_versioned("event_list", (EVENTS_SCOPE, ROSTERS_SCOPE), build, EVENTS_TIMEOUT)
+
+
+async def acached_profile(user_id, abuild):
+    """
+    Async counterpart of `cached_profile` for the ASGI views.
+
+    Hits cost the same single `get_many`. Misses are not single-flight: the
+    payload is built with `await abuild()` and stored under the versions read
+    before building, so a write that lands meanwhile still invalidates it.
+    """
+    key = f"profile:{user_id}"
+    versions, value = await sync_to_async(_lookup)(
+        key, (user_scope(user_id), EVENTS_SCOPE), date.today().isoformat()
+    )
+    if value is MISSING:
+        value = await abuild()
+        await cache.aset(key, (versions, value), PROFILE_TIMEOUT)
+    return value
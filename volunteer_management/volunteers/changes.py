@@ -0,0 +1,141 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import AttendanceRecord, Event, Tombstone, UserProfile, VolunteerHours
+from .serializers import ChangedEventSerializer
+
+
+# updated_at is stamped before a transaction commits, so each poll re-reads this far
+# behind the client's token; clients apply changes as upserts, so repeats are harmless
+OVERLAP = timedelta(seconds=30)
+TOMBSTONE_RETENTION = timedelta(days=30)
+MAX_CHANGES = 1000  # per model; past this a client is better off reloading the full list
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class ChangeFeedError(ValueError):
+    pass
+
+
+class ResyncRequired(ChangeFeedError):
+    """The token is too old (or too much changed) to answer with a delta."""
+
+
+def record_deletes(ids_by_kind):
+    """Write tombstones for `{feed name: ids}` in one INSERT."""
+    now = timezone.now()
+    Tombstone.objects.bulk_create([
+        Tombstone(model=kind, object_id=object_id, deleted_at=now)
+        for kind, ids in ids_by_kind.items()
+        for object_id in ids
+    ])
+
+
+def touch_events(ids):
+    """Mark events as updated; roster changes live in the M2M table, not the event row."""
+    Event.objects.filter(pk__in=ids).update(updated_at=timezone.now())
+
+
+def make_token(moment):
+    delta = moment - EPOCH
+    return str((delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds)
+
+
+def parse_token(token):
+    try:
+        micros = int(token)
+    except (TypeError, ValueError):
+        raise ChangeFeedError("Invalid since token.")
+    if micros < 0:
+        raise ChangeFeedError("Invalid since token.")
+    try:
+        return EPOCH + timedelta(microseconds=micros)
+    except OverflowError:  # past datetime.max
+        raise ChangeFeedError("Invalid since token.")
+
+
+# Builders return (created_at, row) pairs so created and updated rows can be told apart
+
+def _events(queryset):
+    events = list(ChangedEventSerializer.setup_eager_loading(queryset))
+    return [(e.created_at, dict(row)) for e, row in zip(events, ChangedEventSerializer(events, many=True).data)]
+
+
+def _pairs(rows):
+    return [(row["created_at"], row) for row in rows]
+
+
+def _hours(queryset):
+    return _pairs(queryset.values(
+        "id", "volunteer_id", "event_id", "hours", "created_at", "updated_at", volunteer_username=F("volunteer__username")
+    ))
+
+
+def _attendance(queryset):
+    rows = list(queryset.values(
+        "id", "volunteer_id", "topic", "online_hours", "created_at", "updated_at",
+        volunteer_username=F("volunteer__username"),
+    ))
+    for row in rows:
+        row["online_hours"] = float(row["online_hours"]) if row["online_hours"] is not None else None
+    return _pairs(rows)
+
+
+def _profiles(queryset):
+    return _pairs(queryset.values(
+        "id", "user_id", "phone_number", "created_at", "updated_at", username=F("user__username")
+    ))
+
+
+# Feed name -> (model, rows builder, staff only)
+FEEDS = {
+    "event": (Event, _events, False),
+    "hours": (VolunteerHours, _hours, True),
+    "attendance": (AttendanceRecord, _attendance, True),
+    "profile": (UserProfile, _profiles, True),
+}
+
+
+def available_feeds(user):
+    return [name for name, (_, _, staff_only) in FEEDS.items() if user.is_staff or not staff_only]
+
+
+def changes(since, feeds):
+    """
+    Rows created, updated and deleted in each of `feeds` since the `since` token.
+
+    Without a token only the current token is returned: take it before loading
+    the full lists, then poll with it. Every response carries the next token.
+    """
+    now = timezone.now()
+    payload = {"token": make_token(now), "changes": {}}
+    if not since:
+        return payload
+
+    after = parse_token(since) - OVERLAP
+    if after < now - TOMBSTONE_RETENTION:
+        raise ResyncRequired("Token has expired; reload the full lists.")
+
+    for name in feeds:
+        model, build, _ = FEEDS[name]
+        changed = model.objects.filter(updated_at__gt=after).order_by("updated_at", "id")[:MAX_CHANGES + 1]
+        rows = build(changed)
+        if len(rows) > MAX_CHANGES:
+            raise ResyncRequired(f"More than {MAX_CHANGES} {name} changes; reload the full list.")
+        deleted = Tombstone.objects.filter(model=name, deleted_at__gt=after).order_by().values_list(
+            "object_id", flat=True
+        ).distinct()
+        payload["changes"][name] = {
+            "created": [row for created_at, row in rows if created_at > after],
+            "updated": [row for created_at, row in rows if created_at <= after],
+            "deleted": sorted(deleted),
+        }
+    return payload
+
+
+def prune(older_than=TOMBSTONE_RETENTION):
+    """Delete tombstones no valid token can still ask for."""
+    deleted, _ = Tombstone.objects.filter(deleted_at__lt=timezone.now() - older_than).delete()
+    return deleted
@@ -0,0 +1,113 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections, connection
+
+from .cache import cached_upcoming_events
+from .models import AttendanceRecord, Event, UserProfile
+from .stats import stats_for
+
+
+# ✅ Independent pieces of the dashboard payloads; each is one query (or a cache read)
+def hours_worked(user):
+    return stats_for(user).event_hours
+
+
+def events_attended(user):
+    return list(Event.objects.filter(volunteers=user).values("title", "date"))
+
+
+def upcoming_events(user):
+    return list(cached_upcoming_events())
+
+
+def attendance(user):
+    records = AttendanceRecord.objects.filter(volunteer=user).order_by("-id").values("topic", "online_hours")
+    return [
+        {
+            "topic": record["topic"],
+            "hours": float(record["online_hours"]) if record["online_hours"] is not None else 0
+        }
+        for record in records
+    ]
+
+
+def topics_attended(user):
+    return list(AttendanceRecord.objects.filter(volunteer=user, online_hours__gt=0).values_list("topic", flat=True))
+
+
+def phone_number(user):
+    return UserProfile.objects.filter(user=user).values_list("phone_number", flat=True).first()
+
+
+PROFILE_PARTS = {
+    "hours_worked": hours_worked,
+    "events_attended": events_attended,
+    "upcoming_events": upcoming_events,
+    "attendance": attendance,
+    "phone_number": phone_number,
+}
+
+USER_INFO_PARTS = {
+    "hours_worked": hours_worked,
+    "events_attended": events_attended,
+    "topics_attended": topics_attended,
+    "phone_number": phone_number,
+}
+
+
+def profile_payload(user, parts):
+    return {
+        "username": user.username,
+        "email": user.email,
+        "phone_number": parts["phone_number"],
+        "hours_worked": parts["hours_worked"],
+        "events_attended": parts["events_attended"],
+        "upcoming_events": parts["upcoming_events"],
+        "attendance": parts["attendance"],
+    }
+
+
+def user_info_payload(user, parts):
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "phone_number": parts["phone_number"],
+        "hours_worked": parts["hours_worked"],
+        "events_attended": parts["events_attended"],
+        "topics_attended": parts["topics_attended"],
+    }
+
+
+def build_parts(user, parts):
+    return {name: fn(user) for name, fn in parts.items()}
+
+
+def _in_worker_thread(fn, user):
+    def run():
+        try:
+            return fn(user)
+        finally:
+            close_old_connections()  # honour CONN_MAX_AGE for the worker thread's own connection
+    return run
+
+
+async def abuild_parts(user, parts):
+    """
+    Run the independent queries of a payload concurrently.
+
+    Django's async ORM methods all funnel through one thread per request, so
+    awaiting several of them with `asyncio.gather` still runs them back to back.
+    Here each query runs on its own worker thread (and database connection)
+    instead. SQLite serialises connections anyway, so it keeps the single thread.
+    """
+    names = list(parts)
+    if connection.vendor == "sqlite":
+        results = [await sync_to_async(parts[name])(user) for name in names]
+    else:
+        results = await asyncio.gather(*(
+            sync_to_async(_in_worker_thread(parts[name], user), thread_sensitive=False)()
+            for name in names
+        ))
+    return dict(zip(names, results))
@@ -0,0 +1,76 @@
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+
+class _Counters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def incr(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def reset(self):
+        with self._lock:
+            self.requests = 0
+            self.connects = 0
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "connects": self.connects,
+                # connects per request: 1.0 means a new connection every time. With a pool every
+                # checkout counts as a connect, so see pool.connections_opened for real churn there
+                "churn": round(self.connects / self.requests, 4) if self.requests else 0.0,
+            }
+
+
+counters = _Counters()
+
+
+def count_request(sender, **kwargs):
+    counters.incr('requests')
+
+
+def count_connection(sender, connection, **kwargs):
+    counters.incr('connects')
+
+
+def _pool_stats(alias):
+    connection = connections[alias]
+    if connection.vendor != 'postgresql' or not connection.settings_dict.get('OPTIONS', {}).get('pool'):
+        return None
+    stats = connection.pool.get_stats()  # psycopg_pool counters since the pool was opened
+    return {
+        "size": stats.get("pool_size", 0),
+        "available": stats.get("pool_available", 0),
+        "min_size": stats.get("pool_min", 0),
+        "max_size": stats.get("pool_max", 0),
+        "checkouts": stats.get("requests_num", 0),
+        "checkouts_queued": stats.get("requests_queued", 0),
+        "waiting": stats.get("requests_waiting", 0),
+        "wait_ms": stats.get("requests_wait_ms", 0),
+        "checkout_errors": stats.get("requests_errors", 0),
+        "connections_opened": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+        "connect_ms": stats.get("connections_ms", 0),
+    }
+
+
+def snapshot(alias='default'):
+    """Connection reuse for this worker process: mode, settings, churn and (when pooled) pool counters."""
+    connection = connections[alias]
+    settings_dict = connection.settings_dict
+    data = {
+        "vendor": connection.vendor,
+        "mode": getattr(settings, 'DB_CONN_MODE', 'none') if connection.vendor == 'postgresql' else 'not applicable',
+        "conn_max_age": settings_dict.get('CONN_MAX_AGE', 0),
+        "health_checks": settings_dict.get('CONN_HEALTH_CHECKS', False),
+        **counters.snapshot(),
+    }
+    data["pool"] = _pool_stats(alias)
+    return data
@@ -0,0 +1,151 @@
+import csv
+import io
+
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils.dateparse import parse_date
+
+from .models import Event, VolunteerHours
+from .cache import bump_users, bump_versions, ROSTERS_SCOPE
+from .stats import apply_stats_deltas
+from .changes import touch_events
+
+
+MAX_BATCH_ENTRIES = 2000
+BATCH_SIZE = 1000
+MAX_HOURS = 2147483647  # PositiveIntegerField's limit on every backend
+CSV_COLUMNS = ("volunteer", "event", "event_date", "hours")
+
+
+def read_csv_entries(text):
+    """Parse a CSV with a `volunteer,event,event_date,hours` header into entry dicts."""
+    reader = csv.DictReader(io.StringIO(text))
+    missing = [c for c in CSV_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(missing)}")
+    return [{c: (row.get(c) or "").strip() for c in CSV_COLUMNS} for row in reader]
+
+
+def _clean_entry(entry):
+    if not isinstance(entry, dict):
+        return None, "Entry must be an object."
+
+    volunteer = entry.get("volunteer")
+    event = entry.get("event")
+    event_date = entry.get("event_date")
+    hours = entry.get("hours")
+    if not all([volunteer, event, event_date]) or hours in (None, ""):
+        return None, "Missing required fields"
+
+    try:
+        parsed_date = parse_date(str(event_date))
+    except ValueError:
+        parsed_date = None
+    if parsed_date is None:
+        return None, "Invalid event_date."
+
+    # int() would truncate 2.7 and accept true, so only integral numbers and digit strings pass
+    if isinstance(hours, bool) or (isinstance(hours, float) and not hours.is_integer()):
+        return None, "Hours must be a whole number."
+    try:
+        hours = int(hours)
+    except (TypeError, ValueError):
+        return None, "Hours must be a whole number."
+    if hours < 0:
+        return None, "Hours must not be negative."
+    if hours > MAX_HOURS:
+        return None, f"Hours must be at most {MAX_HOURS}."
+
+    return (str(volunteer), str(event), parsed_date, hours), None
+
+
+def assign_hours_batch(entries):
+    """
+    Assign hours for many volunteer/event pairs in one transaction.
+
+    Users and events are resolved with one query each, VolunteerHours rows are
+    upserted with ON CONFLICT (volunteer, event) DO UPDATE, and the
+    Event.volunteers links are inserted with ON CONFLICT DO NOTHING. Rows that
+    fail validation are skipped and reported by index; the rest are written.
+    """
+    errors = []
+    cleaned = {}
+    for index, entry in enumerate(entries):
+        values, error = _clean_entry(entry)
+        if error:
+            errors.append({"row": index, "error": error})
+        else:
+            cleaned[index] = values
+
+    usernames = {v[0] for v in cleaned.values()}
+    users = dict(User.objects.filter(username__in=usernames).values_list("username", "id"))
+
+    # ✅ Narrow with two IN lists, then match the exact (title, date) pairs in Python
+    event_keys = {(v[1], v[2]) for v in cleaned.values()}
+    events = {}
+    candidates = Event.objects.filter(
+        title__in={k[0] for k in event_keys}, date__in={k[1] for k in event_keys}
+    ).values_list("id", "title", "date")
+    for event_id, title, event_date in candidates:
+        if (title, event_date) in event_keys:
+            events.setdefault((title, event_date), []).append(event_id)
+
+    pairs = {}
+    for index, (username, title, event_date, hours) in cleaned.items():
+        matches = events.get((title, event_date), [])
+        if username not in users:
+            errors.append({"row": index, "error": "User not found."})
+        elif not matches:
+            errors.append({"row": index, "error": "Event not found with this title and date."})
+        elif len(matches) > 1:
+            errors.append({"row": index, "error": "More than one event has this title and date."})
+        else:
+            pair = (users[username], matches[0])
+            if pair in pairs:
+                errors.append({"row": index, "error": "Duplicate volunteer/event pair in this batch."})
+            else:
+                pairs[pair] = hours
+
+    created = updated = 0
+    if pairs:
+        with transaction.atomic():
+            # Lock the events first: SELECT ... FOR UPDATE below only locks rows that already exist, so
+            # two batches inserting the same new pair would both count it as created. Every writer of
+            # these pairs takes the event locks (in id order), which serialises them.
+            list(Event.objects.select_for_update().filter(pk__in={p[1] for p in pairs}).order_by("pk").values_list("pk"))
+            existing = VolunteerHours.objects.select_for_update().filter(
+                volunteer_id__in={p[0] for p in pairs}, event_id__in={p[1] for p in pairs}
+            ).values_list("volunteer_id", "event_id", "hours")
+            previous = {(v, e): h for v, e, h in existing if (v, e) in pairs}
+
+            VolunteerHours.objects.bulk_create(
+                [VolunteerHours(volunteer_id=v, event_id=e, hours=h) for (v, e), h in pairs.items()],
+                update_conflicts=True,
+                unique_fields=["volunteer", "event"],
+                update_fields=["hours", "updated_at"],
+                batch_size=BATCH_SIZE,
+            )
+
+            Event.volunteers.through.objects.bulk_create(
+                [Event.volunteers.through(event_id=e, user_id=v) for v, e in pairs],
+                ignore_conflicts=True,
+                batch_size=BATCH_SIZE,
+            )
+
+            deltas = {}
+            for (volunteer_id, event_id), hours in pairs.items():
+                delta = deltas.setdefault(volunteer_id, {"event_hours": 0, "event_count": 0})
+                if (volunteer_id, event_id) in previous:
+                    delta["event_hours"] += hours - previous[(volunteer_id, event_id)]
+                    updated += 1
+                else:
+                    delta["event_hours"] += hours
+                    delta["event_count"] += 1
+                    created += 1
+            apply_stats_deltas(deltas)
+            touch_events({e for v, e in pairs if (v, e) not in previous})  # rosters grew
+            bump_users(deltas)  # bulk_create sends no post_save / m2m_changed
+            bump_versions([ROSTERS_SCOPE])
+
+    errors.sort(key=lambda e: e["row"])
+    return {"created": created, "updated": updated, "errors": errors}
@@ -0,0 +1,138 @@
+import csv
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import IntegrityError, transaction
+from rest_framework.authtoken.models import Token
+
+from .models import UserProfile
+
+
+MAX_IMPORT_ROWS = 10000
+SYNC_IMPORT_ROWS = 200  # larger API imports go to the job queue instead of hashing in the request
+BATCH_SIZE = 1000
+PARALLEL_THRESHOLD = 64  # below this, starting worker processes costs more than it saves
+CSV_COLUMNS = ("username", "email", "password", "phone_number")
+REQUIRED_COLUMNS = ("username",)
+
+
+def read_csv_rows(text):
+    """Parse a CSV with a `username[,email,password,phone_number]` header into row dicts."""
+    reader = csv.DictReader(io.StringIO(text))
+    missing = [c for c in REQUIRED_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"CSV is missing column(s): {', '.join(missing)}")
+    return [{c: (row.get(c) or "").strip() for c in CSV_COLUMNS} for row in reader]
+
+
+def _init_worker():
+    # Workers started with "spawn" (macOS, Windows) have not configured Django yet
+    import django
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+
+
+def _hash(password):
+    return make_password(password or None)  # None -> unusable password
+
+
+def hash_passwords(passwords, workers=None):
+    """
+    PBKDF2-hash `passwords` in a process pool; each hash is CPU-bound and holds the GIL.
+    `workers=1` hashes in this process, as web requests must: never fork a web worker.
+    """
+    workers = workers or min(4, os.cpu_count() or 1)
+    if workers <= 1 or len(passwords) < PARALLEL_THRESHOLD:
+        return [_hash(p) for p in passwords]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        return list(pool.map(_hash, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+def _clean_row(row):
+    if not isinstance(row, dict):
+        return "Row must be an object."
+    username = row.get("username") or ""
+    if not username:
+        return "Username is required."
+    if len(username) > User._meta.get_field("username").max_length:
+        return "Username is too long."
+    try:
+        User.username_validator(username)
+    except ValidationError:
+        return "Username may only contain letters, digits and @/./+/-/_."
+    if row.get("email"):
+        try:
+            validate_email(row["email"])
+        except ValidationError:
+            return "Invalid email."
+    if len(row.get("phone_number") or "") > UserProfile._meta.get_field("phone_number").max_length:
+        return "Phone number is too long."
+    return None
+
+
+def import_volunteers(rows, workers=None):
+    """
+    Create volunteers (user, profile and token) for many CSV rows at once.
+
+    Invalid rows and usernames that are repeated in the file or already taken
+    are skipped and reported by index; the rest are written with three
+    bulk_creates in one transaction. bulk_create sends no post_save, so the
+    profile and token rows are built here rather than by the receivers.
+    """
+    errors = []
+    valid = {}
+    seen = set()
+    for index, row in enumerate(rows):
+        error = _clean_row(row)
+        if error is None:
+            username = User.normalize_username(row["username"])
+            if username in seen:
+                error = "Duplicate username in this file."
+            else:
+                seen.add(username)
+                valid[index] = {**row, "username": username}
+        if error:
+            errors.append({"row": index, "username": row.get("username") if isinstance(row, dict) else None, "error": error})
+
+    created = []
+    for attempt in range(2):
+        taken = set(User.objects.filter(username__in=[r["username"] for r in valid.values()]).values_list("username", flat=True))
+        for index in [i for i, r in valid.items() if r["username"] in taken]:
+            errors.append({"row": index, "username": valid.pop(index)["username"], "error": "Username already exists."})
+        if not valid:
+            break
+
+        if attempt == 0:
+            hashes = dict(zip(valid, hash_passwords([r.get("password") for r in valid.values()], workers)))
+        try:
+            with transaction.atomic():
+                created = User.objects.bulk_create([
+                    User(
+                        username=r["username"],
+                        email=User.objects.normalize_email(r.get("email") or ""),
+                        password=hashes[index],
+                    )
+                    for index, r in valid.items()
+                ], batch_size=BATCH_SIZE)
+                UserProfile.objects.bulk_create([
+                    UserProfile(user=user, phone_number=r.get("phone_number") or "")
+                    for user, r in zip(created, valid.values())
+                ], batch_size=BATCH_SIZE)
+                Token.objects.bulk_create(
+                    [Token(key=Token.generate_key(), user=user) for user in created], batch_size=BATCH_SIZE
+                )
+            break
+        except IntegrityError:
+            # A username was registered concurrently; the re-check above will report it
+            created = []
+            if attempt:
+                raise
+
+    errors.sort(key=lambda e: e["row"])
+    return {"created": len(created), "errors": errors}
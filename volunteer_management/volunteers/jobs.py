@@ -0,0 +1,391 @@
+import logging
+import os
+import socket
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, F
+from django.urls import reverse
+from django.utils import timezone
+
+from . import analytics
+from .attendance import mark_attendance, InvalidHours
+from .exports import export_rows, parse_filters, ExportError, FORMATS as EXPORT_FORMATS
+from .imports import import_volunteers
+from .models import Event, Job
+
+
+logger = logging.getLogger(__name__)
+
+LEASE = timedelta(minutes=10)  # a running job whose heartbeat is older than this is presumed dead
+HEARTBEAT = timedelta(seconds=30)  # how often a worker beats for its jobs and sweeps stale/old ones
+RETRY_DELAY = timedelta(seconds=30)  # doubled for each further attempt
+RETENTION = timedelta(days=7)  # finished jobs (and export files) are pruned after this
+EXPORT_PROGRESS_EVERY = 5000  # lines
+CLAIM_CANDIDATES = 10
+
+
+class JobError(ValueError):
+    pass
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help (bad input, missing rows)."""
+
+
+def _claimed(job):
+    # The job's row while it is still this claim's: requeue_stale may have handed it to another run
+    return Job.objects.filter(pk=job.pk, status=Job.RUNNING, worker=job.worker, attempts=job.attempts)
+
+
+def report(job, done, total=None, message=None):
+    """
+    Record a running job's progress. Call it outside the handler's transactions,
+    or pollers will not see it until the transaction commits.
+    """
+    fields = {"progress": done, "heartbeat_at": timezone.now()}
+    if total is not None:
+        fields["total"] = total
+    if message is not None:
+        fields["message"] = message[:255]
+    _claimed(job).update(**fields)
+    for name, value in fields.items():
+        setattr(job, name, value)
+
+
+def job_file(job, suffix):
+    return Path(settings.JOB_FILES_DIR) / f"job-{job.pk}.{suffix}"
+
+
+def result_file(job):
+    """The file a finished job wrote, or None."""
+    name = (job.result or {}).get("file")
+    return Path(settings.JOB_FILES_DIR) / name if name else None
+
+
+# Handlers take the claimed job and return a JSON-serialisable result
+
+def _mark_attendance(job):
+    payload = job.payload
+    report(job, 0, len(payload["volunteer_hours"]), "Logging attendance")
+    try:
+        # Always keyed, so a retry after a crash past the commit replays instead of logging twice
+        result = mark_attendance(
+            payload["topic"], payload["volunteer_hours"],
+            idempotency_key=payload.get("idempotency_key") or f"job-{job.pk}",
+        )
+    except InvalidHours as e:
+        raise PermanentJobError(str(e))
+    report(job, len(payload["volunteer_hours"]))
+    return result
+
+
+def _delete_events(job):
+    ids = list(Event.objects.filter(
+        title=job.payload["event_name"], date=job.payload["event_date"]
+    ).values_list("id", flat=True))
+    report(job, 0, len(ids), "Deleting events")
+    deleted_count = 0
+    # One transaction per event keeps each cascade's locks short; a retry skips what is already gone
+    for done, event_id in enumerate(ids, 1):
+        count, _ = Event.objects.filter(pk=event_id).delete()  # the rollup follows via pre_delete
+        deleted_count += count
+        report(job, done)
+    return {"message": f"{deleted_count} event(s) deleted successfully", "deleted": deleted_count}
+
+
+def _export(job):
+    payload = job.payload
+    dataset, output = payload["dataset"], payload.get("output", "csv")
+    try:
+        filters = parse_filters(payload.get("start"), payload.get("end"), payload.get("event"))
+        lines = export_rows(dataset, output, **filters)
+    except ExportError as e:
+        raise PermanentJobError(str(e))
+
+    path = job_file(job, output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_name(path.name + ".part")
+    written = 0
+    report(job, 0, message=f"Exporting {dataset}")
+    with open(partial, "w", encoding="utf-8", newline="") as f:
+        for line in lines:
+            f.write(line)
+            written += 1
+            if written % EXPORT_PROGRESS_EVERY == 0:
+                report(job, written)
+    os.replace(partial, path)  # pollers never see a half-written file
+    report(job, written, written)
+    return {
+        "file": path.name,
+        "filename": f"{dataset}.{output}",
+        "content_type": EXPORT_FORMATS[output],
+        "lines": written,
+    }
+
+
+def _import_volunteers(job):
+    rows = job.payload["rows"]
+    report(job, 0, len(rows), "Importing volunteers")
+    result = import_volunteers(rows)  # hashes in a process pool, away from the web workers
+    # ✅ The rows are committed, so stop keeping their plaintext passwords in the job table.
+    # A retry after a crash past this point reports every row as "already exists".
+    _claimed(job).update(payload={
+        **job.payload, "rows": [{**row, "password": ""} if isinstance(row, dict) else row for row in rows],
+    })
+    report(job, len(rows))
+    return result
+
+
+def _refresh_analytics(job):
+    report(job, 0, message="Refreshing rollups")
+    result = analytics.refresh(full=bool(job.payload.get("full")))
+    return {**result, "watermark": result["watermark"].isoformat()}
+
+
+# Job kind -> (handler, max attempts, max running at once or None)
+KINDS = {
+    "mark_attendance": (_mark_attendance, 3, None),
+    "delete_events": (_delete_events, 3, None),
+    "export": (_export, 2, 2),
+    "import_volunteers": (_import_volunteers, 2, 1),
+    "refresh_analytics": (_refresh_analytics, 3, 1),
+}
+
+
+def enqueue(kind, payload, user=None):
+    if kind not in KINDS:
+        raise JobError(f"Unknown job kind. Choose one of: {', '.join(KINDS)}.")
+    return Job.objects.create(kind=kind, payload=payload, max_attempts=KINDS[kind][1], created_by=user)
+
+
+def describe(job):
+    """What the status endpoint reports for `job`."""
+    data = {
+        "id": job.pk,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "progress": {"done": job.progress, "total": job.total, "message": job.message},
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+    if job.status == Job.SUCCEEDED and (job.result or {}).get("file"):
+        data["file_url"] = reverse("job_file", args=[job.pk])
+    return data
+
+
+def _saturated_kinds():
+    limits = {kind: limit for kind, (_, _, limit) in KINDS.items() if limit}
+    running = Job.objects.filter(status=Job.RUNNING, kind__in=limits).order_by().values("kind").annotate(
+        n=Count("id")
+    ).values_list("kind", "n")
+    return {kind for kind, n in running if n >= limits[kind]}
+
+
+def claim(worker, kinds=None):
+    """
+    Mark the next due job as running for `worker` and return it, or None.
+
+    On databases with SKIP LOCKED (PostgreSQL) the row is taken with
+    SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never wait on or
+    double-claim a job. Elsewhere (SQLite) a conditional UPDATE decides the
+    race. Per-kind limits are soft: two workers can both see a free slot.
+    """
+    kinds = set(kinds or KINDS) - _saturated_kinds()
+    if not kinds:
+        return None
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.QUEUED, run_after__lte=now, kind__in=kinds).order_by("run_after", "id")
+    started = {"status": Job.RUNNING, "worker": worker, "started_at": now, "heartbeat_at": now}
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = due.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            Job.objects.filter(pk=job.pk).update(attempts=F("attempts") + 1, **started)
+        job.attempts += 1  # the row is locked, so this matches what was written
+        for name, value in started.items():
+            setattr(job, name, value)
+        return job
+
+    for job_id in due.values_list("id", flat=True)[:CLAIM_CANDIDATES]:
+        if Job.objects.filter(pk=job_id, status=Job.QUEUED).update(attempts=F("attempts") + 1, **started):
+            return Job.objects.get(pk=job_id)
+    return None
+
+
+def run(job):
+    """
+    Run a claimed job and record the outcome: succeeded, queued again with backoff,
+    or failed. Returns the new status, or None when the claim was lost meanwhile
+    (requeued as stale and claimed again); that run's outcome is then dropped.
+    """
+    try:
+        if job.kind not in KINDS:
+            raise PermanentJobError(f"Unknown job kind {job.kind!r}.")
+        result = KINDS[job.kind][0](job)
+    except Exception as e:
+        permanent = isinstance(e, PermanentJobError) or job.attempts >= job.max_attempts
+        if isinstance(e, PermanentJobError):
+            logger.warning("Job %s (%s) failed: %s", job.pk, job.kind, e)
+        else:
+            logger.exception("Job %s (%s) failed on attempt %s/%s", job.pk, job.kind, job.attempts, job.max_attempts)
+        error = str(e) if isinstance(e, PermanentJobError) else f"{type(e).__name__}: {e}"
+        if permanent:
+            fields = {"status": Job.FAILED, "finished_at": timezone.now()}
+        else:
+            backoff = RETRY_DELAY * 2 ** (job.attempts - 1)
+            fields = {"status": Job.QUEUED, "run_after": timezone.now() + backoff, "worker": ""}
+        fields["error"] = error
+    else:
+        fields = {"status": Job.SUCCEEDED, "result": result, "error": "", "finished_at": timezone.now()}
+    if not _claimed(job).update(heartbeat_at=None, **fields):
+        logger.warning("Job %s (%s) was requeued while %s ran it; dropping this outcome", job.pk, job.kind, job.worker)
+        return None
+    for name, value in fields.items():
+        setattr(job, name, value)
+    return job.status
+
+
+def run_pending(worker="inline", kinds=None, limit=None):
+    """Claim and run due jobs one after another in this thread until none is due; returns how many ran."""
+    ran = 0
+    while limit is None or ran < limit:
+        job = claim(worker, kinds)
+        if job is None:
+            break
+        run(job)
+        ran += 1
+    return ran
+
+
+def requeue_stale(lease=LEASE):
+    """Queue again the running jobs whose worker stopped heartbeating; fail those out of attempts."""
+    now = timezone.now()
+    stale = Job.objects.filter(status=Job.RUNNING, heartbeat_at__lt=now - lease)
+    failed = stale.filter(attempts__gte=F("max_attempts")).update(
+        status=Job.FAILED, finished_at=now, heartbeat_at=None, error="Worker stopped responding."
+    )
+    requeued = stale.update(status=Job.QUEUED, run_after=now, worker="", heartbeat_at=None)
+    return requeued, failed
+
+
+def prune(older_than=RETENTION):
+    """Delete finished jobs older than `older_than`, with their export files."""
+    old = Job.objects.filter(status__in=[Job.SUCCEEDED, Job.FAILED], finished_at__lt=timezone.now() - older_than)
+    for name in old.filter(kind="export").values_list("result__file", flat=True):
+        if name:
+            (Path(settings.JOB_FILES_DIR) / name).unlink(missing_ok=True)
+    deleted, _ = old.delete()
+    return deleted
+
+
+class Worker:
+    """
+    Runs queued jobs on `concurrency` threads, each with its own database
+    connection, plus one thread that heartbeats for the running jobs and
+    requeues/prunes in the background. `burst` stops once nothing is due.
+    """
+
+    def __init__(self, concurrency=1, kinds=None, poll_interval=1.0, burst=False, max_jobs=None, name=None):
+        self.concurrency = concurrency
+        self.kinds = kinds
+        self.poll_interval = poll_interval
+        self.burst = burst
+        self.max_jobs = max_jobs
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.counts = {Job.SUCCEEDED: 0, Job.QUEUED: 0, Job.FAILED: 0}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._running = set()
+        self._claimed = 0
+
+    def stop(self):
+        """Finish the jobs in hand, then return from run()."""
+        self._stop.set()
+
+    def run(self):
+        requeue_stale()
+        heartbeat = threading.Thread(target=self._heartbeat, name=f"{self.name}-heartbeat", daemon=True)
+        heartbeat.start()
+        try:
+            if self.concurrency == 1:
+                self._loop()  # in this thread, so signal handlers and test transactions apply
+            else:
+                threads = [
+                    threading.Thread(target=self._loop, name=f"{self.name}-{n}") for n in range(self.concurrency)
+                ]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+        finally:
+            self._stop.set()
+            heartbeat.join()
+        return self.counts
+
+    def _next(self):
+        with self._lock:
+            if self.max_jobs is not None and self._claimed >= self.max_jobs:
+                return None
+            job = claim(self.name, self.kinds)
+            if job is not None:
+                self._claimed += 1
+                self._running.add(job.pk)
+            return job
+
+    def _loop(self):
+        try:
+            while not self._stop.is_set():
+                try:
+                    job = self._next()
+                except Exception:
+                    logger.exception("Could not claim a job")
+                    connection.close()
+                    job = None
+                if job is None:
+                    if self.burst or (self.max_jobs is not None and self._claimed >= self.max_jobs):
+                        break
+                    self._stop.wait(self.poll_interval)
+                    continue
+                try:
+                    status = run(job)
+                except Exception:
+                    # Recording the outcome failed (e.g. the connection dropped); the lease requeues it
+                    logger.exception("Could not record the outcome of job %s", job.pk)
+                    connection.close()
+                    status = None
+                with self._lock:
+                    self._running.discard(job.pk)
+                    if status in self.counts:
+                        self.counts[status] += 1
+        finally:
+            if threading.current_thread() is not threading.main_thread():
+                connection.close()
+
+    def _heartbeat(self):
+        try:
+            while not self._stop.wait(HEARTBEAT.total_seconds()):
+                try:
+                    with self._lock:
+                        running = list(self._running)
+                    if running:
+                        Job.objects.filter(pk__in=running, status=Job.RUNNING, worker=self.name).update(
+                            heartbeat_at=timezone.now()
+                        )
+                    requeue_stale()
+                    prune()
+                except Exception:
+                    logger.exception("Job heartbeat failed")
+                    connection.close()
+        finally:
+            connection.close()
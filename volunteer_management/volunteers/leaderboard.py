@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+
+from django.db.models import F, Sum, Window
+from django.db.models.functions import Rank
+from django.utils.dateparse import parse_date
+
+from .cache import cached_versioned
+from .models import TOTAL_HOURS, VolunteerHours, VolunteerStats
+
+
+LEADERBOARD_TIMEOUT = 30
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 100
+DEFAULT_AROUND = 5
+MAX_AROUND = 50
+PERIODS = {
+    "week": 7,
+    "month": 30,
+    "year": 365,
+}
+
+
+class LeaderboardError(ValueError):
+    pass
+
+
+def parse_period(period=None, start=None, end=None):
+    """Turn `period` (all/week/month/year) or explicit `start`/`end` dates into a (start, end) range."""
+    if start or end:
+        bounds = []
+        for name, value in (("start", start), ("end", end)):
+            try:
+                parsed = parse_date(value) if value else None
+            except ValueError:
+                parsed = None
+            if value and parsed is None:
+                raise LeaderboardError(f"Invalid {name} date. Use YYYY-MM-DD.")
+            bounds.append(parsed)
+        return tuple(bounds)
+    if not period or period == "all":
+        return None, None
+    if period not in PERIODS:
+        raise LeaderboardError(f"Unknown period. Choose one of: all, {', '.join(PERIODS)}.")
+    today = date.today()
+    return today - timedelta(days=PERIODS[period]), today
+
+
+def _scored(start=None, end=None):
+    """Volunteers with a `score`: all-time from the VolunteerStats rollup, or event hours within a date range."""
+    if start is None and end is None:
+        return VolunteerStats.objects.filter(volunteer__is_staff=False).annotate(
+            score=TOTAL_HOURS, username=F("volunteer__username")
+        ).values("volunteer_id", "username", "event_hours", "online_hours", "score")
+
+    # A period ranks event hours only: attendance logged before created_at existed has no real date
+    hours = VolunteerHours.objects.filter(volunteer__is_staff=False)
+    if start:
+        hours = hours.filter(event__date__gte=start)
+    if end:
+        hours = hours.filter(event__date__lte=end)
+    return hours.values("volunteer_id").annotate(
+        username=F("volunteer__username"), event_hours=Sum("hours"), score=Sum("hours")
+    ).values("volunteer_id", "username", "event_hours", "score")
+
+
+def _ranked(scored):
+    # RANK() over score descending; ties share a rank. Filtering on `rank` runs outside the window,
+    # and PostgreSQL 15+ stops the window scan once the rank bound is passed.
+    return scored.annotate(rank=Window(Rank(), order_by=F("score").desc())).order_by("rank", "volunteer_id")
+
+
+def _row(r):
+    online = r.get("online_hours")
+    return {
+        "rank": r["rank"],
+        "volunteer_id": r["volunteer_id"],
+        "username": r["username"],
+        "event_hours": r["event_hours"] or 0,
+        "online_hours": float(online) if online is not None else None,
+        "total_hours": float(r["score"] or 0),
+    }
+
+
+def top(limit=DEFAULT_LIMIT, start=None, end=None):
+    """The volunteers ranked 1..limit (more rows if the last rank is tied)."""
+    return [_row(r) for r in _ranked(_scored(start, end)).filter(rank__lte=limit)]
+
+
+def around(volunteer_id, size=DEFAULT_AROUND, start=None, end=None):
+    """The volunteers within `size` ranks of `volunteer_id`; empty if they have no hours in the period."""
+    scored = _scored(start, end)
+    me = scored.filter(volunteer_id=volunteer_id).order_by("volunteer_id").first()
+    if me is None:
+        return []
+    my_rank = scored.filter(score__gt=me["score"]).count() + 1
+    rows = _ranked(scored).filter(rank__gte=max(1, my_rank - size), rank__lte=my_rank + size)
+    return [_row(r) for r in rows]
+
+
+def leaderboard(limit=DEFAULT_LIMIT, around_id=None, size=DEFAULT_AROUND, period=None, start=None, end=None):
+    """
+    The leaderboard payload, cached for LEADERBOARD_TIMEOUT seconds per distinct request.
+    `around_id` is a resolved user id, so only existing volunteers can add cache keys.
+    """
+    start, end = parse_period(period, start, end)
+    key = f"leaderboard:{start}:{end}:{around_id or ''}:{size if around_id else limit}"
+
+    def build():
+        rows = around(around_id, size, start, end) if around_id else top(limit, start, end)
+        return {
+            "start": start.isoformat() if start else None,
+            "end": end.isoformat() if end else None,
+            "includes_online_hours": start is None and end is None,
+            "results": rows,
+        }
+
+    return cached_versioned(key, (), build, LEADERBOARD_TIMEOUT)
@@ -0,0 +1,101 @@
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+
+
+# Attributes every LogRecord has; anything else was passed via `extra=` and is kept in the JSON
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, source location and any `extra` fields."""
+
+    def format(self, record):
+        data = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc_info"] = record.exc_text
+        return json.dumps(data, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Let through a `rate` fraction of records (0 drops everything, 1 keeps everything)."""
+
+    def __init__(self, rate=1.0):
+        super().__init__()
+        self.rate = float(rate)
+
+    def filter(self, record):
+        return self.rate >= 1 or (self.rate > 0 and random.random() < self.rate)
+
+
+class QueuedLogHandler(QueueHandler):
+    """
+    A stream or file handler behind a bounded queue and a background writer thread.
+
+    Records go to stderr unless `filename` is given; then they are appended
+    through a WatchedFileHandler, which reopens the file once an external tool
+    (logrotate) has moved it. Nothing here rotates, so any number of worker
+    processes can share the file.
+
+    The logging thread only snapshots the record and does a non-blocking put;
+    formatting and I/O happen on the listener thread. When the queue is full
+    the record is dropped and counted in `dropped` rather than making the
+    request wait.
+    """
+
+    def __init__(self, filename=None, queue_size=10000, encoding="utf-8"):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.dropped = 0
+        if filename:
+            self.target = WatchedFileHandler(filename, encoding=encoding, delay=True)
+        else:
+            self.target = logging.StreamHandler(sys.stderr)
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def setFormatter(self, fmt):
+        # dictConfig's `formatter` applies on the writer thread, not here
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Copy so the caller's record is left alone; render what cannot cross threads
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()  # drains the queue before returning
+            self.listener = None
+            self.target.close()
+        super().close()
+
@@ -0,0 +1,61 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from volunteers.benchmarks import latency_regressions, run_suite, uncovered_routes
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database at each scale and time every API route in urls.py. "
+        "Fails when a route has no benchmark case, exceeds its query budget, issues a scale-dependent "
+        "number of queries, or (with --baseline) regresses p95 latency beyond --tolerance."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scales', default='100,1000', help="Comma-separated volunteer counts.")
+        parser.add_argument('--repeat', type=int, default=20, help="Timed requests per case and scale.")
+        parser.add_argument('--baseline', help="JSON results from an earlier --save to compare p95 latency against.")
+        parser.add_argument('--tolerance', type=float, default=0.5, help="Allowed p95 slowdown over the baseline.")
+        parser.add_argument('--save', help="Write the results as JSON (usable as a later --baseline).")
+
+    def handle(self, *args, **options):
+        missing = uncovered_routes()
+        if missing:
+            raise CommandError(f"No benchmark case for: {', '.join(missing)}")
+        if 'volunteers.middleware.RequestMetricsMiddleware' not in settings.MIDDLEWARE:
+            raise CommandError("RequestMetricsMiddleware must be installed; query counts come from it.")
+        scales = [int(s) for s in options['scales'].split(',')]
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            results = run_suite(scales, repeat=options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        self.stdout.write(f"{'scale':>6}  {'queries':>7}  {'p50 ms':>8}  {'p95 ms':>8}  case")
+        for r in results:
+            line = f"{r['scale']:>6}  {r['queries']:>7}  {r['p50_ms']:>8.1f}  {r['p95_ms']:>8.1f}  {r['case']}"
+            self.stdout.write(self.style.ERROR(line) if r['failures'] else line)
+
+        for r in results:
+            for warning in r['warnings']:
+                self.stdout.write(self.style.WARNING(f"{r['case']} at {r['scale']}: {warning}"))
+
+        failures = [f"{r['case']} at {r['scale']}: {f}" for r in results for f in r['failures']]
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                failures += latency_regressions(results, json.load(f), options['tolerance'])
+
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump(results, f, indent=2)
+
+        if failures:
+            raise CommandError("Benchmark budget exceeded:\n  " + "\n  ".join(failures))
+        self.stdout.write(self.style.SUCCESS(f"{len(results)} benchmark(s) within budget."))
@@ -0,0 +1,74 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+ENDPOINTS = {
+    "profile": ("/api/volunteer/profile/", "/api/async/volunteer/profile/"),
+    "user": ("/user/", "/api/async/user/"),
+}
+
+
+def _percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare p50/p99 latency of the sync (WSGI) and async (ASGI) dashboard endpoints at a fixed concurrency. "
+        "Start both servers first, e.g. "
+        "`gunicorn volunteer_management.wsgi:application -b :8000` (the Procfile) and "
+        "`gunicorn volunteer_management.asgi:application -k uvicorn.workers.UvicornWorker -b :8001`, "
+        "with the same worker count and database, then pass a token for a volunteer (profile) or an admin (user)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--asgi-url', default='http://127.0.0.1:8001')
+        parser.add_argument('--token', required=True)
+        parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='profile')
+        parser.add_argument('--name', default='', help="Volunteer username for the user endpoint.")
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--warmup', type=int, default=20)
+
+    def handle(self, *args, **options):
+        sync_path, async_path = ENDPOINTS[options['endpoint']]
+        query = f"?name={options['name']}" if options['endpoint'] == 'user' else ""
+
+        for label, base, path in (("wsgi", options['wsgi_url'], sync_path), ("asgi", options['asgi_url'], async_path)):
+            url = base.rstrip('/') + path + query
+            samples, failures = self.run(url, options)
+            if not samples:
+                raise CommandError(f"{label}: every request to {url} failed")
+            self.stdout.write(
+                f"{label}: {len(samples)} ok, {failures} failed, concurrency {options['concurrency']}, "
+                f"p50 {_percentile(samples, 50):.1f} ms, p99 {_percentile(samples, 99):.1f} ms, "
+                f"mean {statistics.mean(samples):.1f} ms"
+            )
+
+    def run(self, url, options):
+        headers = {"Authorization": f"Token {options['token']}"}
+
+        def fetch(_):
+            request = urllib.request.Request(url, headers=headers)
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(request, timeout=30) as response:
+                    response.read()
+            except (urllib.error.URLError, OSError):
+                return None
+            return (time.perf_counter() - started) * 1000
+
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            list(pool.map(fetch, range(options['warmup'])))
+            results = list(pool.map(fetch, range(options['requests'])))
+
+        samples = [r for r in results if r is not None]
+        return samples, len(results) - len(samples)
@@ -0,0 +1,40 @@
+import time
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from volunteers.attendance import mark_attendance
+
+
+class Command(BaseCommand):
+    help = "Time the bulk MarkAttendance path for a large session. Runs inside a transaction that is rolled back."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--volunteers', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        count = options['volunteers']
+
+        with transaction.atomic():
+            User.objects.bulk_create(
+                [User(username=f"bench_attendance_{i}", password="!") for i in range(count)],
+                batch_size=1000,
+            )
+            volunteer_hours = {f"bench_attendance_{i}": 1.5 for i in range(count)}
+            volunteer_hours["bench_attendance_missing"] = 1
+
+            for run in range(1, options['repeat'] + 1):
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    result = mark_attendance(f"Benchmark session {run}", volunteer_hours)
+                    elapsed = time.perf_counter() - started
+                self.stdout.write(
+                    f"run {run}: {result['records_created']} records, "
+                    f"{len(result['unknown_usernames'])} unknown, "
+                    f"{len(queries)} queries, {elapsed * 1000:.1f} ms"
+                )
+
+            transaction.set_rollback(True)
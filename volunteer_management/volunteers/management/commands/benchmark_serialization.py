@@ -0,0 +1,89 @@
+import io
+import time
+from datetime import date, datetime, time as dtime, timedelta, timezone
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from volunteers.models import AttendanceRecord, Event
+from volunteers.renderers import ORJSONParser, ORJSONRenderer, orjson
+from volunteers.serializers import AttendanceSerializer, EventSerializer
+from volunteers.views import ATTENDANCE_READER, EVENT_READER
+
+
+class Command(BaseCommand):
+    help = (
+        "Time building and rendering list payloads per 10k rows: ModelSerializer vs the .values() read "
+        "path, and DRF's JSON renderer/parser vs the orjson ones. In memory; the database is not touched."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        count, repeat = options['rows'], options['repeat']
+        users = [User(id=i, username=f"volunteer_{i}") for i in range(1, 51)]
+        stamp = datetime(2025, 1, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+        events, event_rows, rosters = [], [], {}
+        for i in range(1, count + 1):
+            fields = {
+                "id": i, "title": f"Event {i} – cleanup", "description": "Litter pick\nBring gloves",
+                "date": date(2025, 1, 1) + timedelta(days=i % 365), "time": dtime(9, 30),
+                "created_at": stamp, "updated_at": stamp + timedelta(seconds=i),
+            }
+            event = Event(**fields)
+            roster = users[i % 40:i % 40 + 5]
+            event._prefetched_objects_cache = {"volunteers": roster}
+            events.append(event)
+            event_rows.append(fields)
+            rosters[i] = [u.username for u in roster]
+
+        records, attendance_rows = [], []
+        for i in range(1, count + 1):
+            volunteer = users[i % len(users)]
+            online_hours = Decimal(i % 8) + Decimal("0.25")
+            records.append(AttendanceRecord(id=i, volunteer=volunteer, topic=f"Meeting {i % 12}", online_hours=online_hours))
+            attendance_rows.append({
+                "id": i, "volunteer": volunteer.id, "volunteer__username": volunteer.username,
+                "topic": f"Meeting {i % 12}", "online_hours": online_hours,
+            })
+
+        cases = (
+            ("events", lambda: EventSerializer(events, many=True).data,
+             lambda: EVENT_READER.render(event_rows, {"volunteers": rosters})),
+            ("attendance", lambda: AttendanceSerializer(records, many=True).data,
+             lambda: ATTENDANCE_READER.render(attendance_rows)),
+        )
+        scale = 10000 / count
+        self.stdout.write(f"{'payload':<12}{'stage':<28}{'ms / 10k rows':>14}")
+        for name, serialize, read in cases:
+            expected = JSONRenderer().render(serialize())
+            if JSONRenderer().render(read()) != expected:
+                raise CommandError(f"{name}: the .values() path does not match the serializer output.")
+            if ORJSONRenderer().render(read()) != expected:
+                raise CommandError(f"{name}: ORJSONRenderer output differs from JSONRenderer.")
+
+            data = read()
+            for stage, run in (
+                ("ModelSerializer", serialize),
+                (".values() reader", read),
+                ("JSONRenderer", lambda: JSONRenderer().render(data)),
+                ("ORJSONRenderer", lambda: ORJSONRenderer().render(data)),
+                ("JSONParser", lambda: JSONParser().parse(io.BytesIO(expected))),
+                ("ORJSONParser", lambda: ORJSONParser().parse(io.BytesIO(expected))),
+            ):
+                timings = []
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    run()
+                    timings.append(time.perf_counter() - started)
+                self.stdout.write(f"{name:<12}{stage:<28}{min(timings) * 1000 * scale:>14.1f}")
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed: the ORJSON* rows used the stdlib fallback."))
+        self.stdout.write(self.style.SUCCESS("Both read paths and both renderers produced identical bytes."))
+
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from volunteers.query_plans import sequential_scans
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the hot lookup queries and fail if any of them falls back to a sequential scan."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        try:
+            failures = sequential_scans(using=options['database'])
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        for name, plan in failures.items():
+            self.stdout.write(f"{name}:\n{plan}\n")
+        if failures:
+            raise CommandError(f"{len(failures)} hot query(s) use a sequential scan: {', '.join(failures)}")
+        self.stdout.write(self.style.SUCCESS("All hot queries use an index."))
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from volunteers.exports import DATASETS, FORMATS, ExportError, export_rows, parse_filters
+
+
+class Command(BaseCommand):
+    help = "Stream the hours summary, event attendance or meeting attendance as CSV or NDJSON."
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=list(DATASETS))
+        parser.add_argument('--output', choices=list(FORMATS), default='csv')
+        parser.add_argument('--start', help="Only events on or after this date (YYYY-MM-DD).")
+        parser.add_argument('--end', help="Only events on or before this date (YYYY-MM-DD).")
+        parser.add_argument('--event', help="Only this event id.")
+        parser.add_argument('--file', help="Write to this path instead of stdout.")
+
+    def handle(self, *args, **options):
+        try:
+            filters = parse_filters(options['start'], options['end'], options['event'])
+            rows = export_rows(options['dataset'], options['output'], **filters)
+        except ExportError as e:
+            raise CommandError(str(e))
+
+        if options['file']:
+            with open(options['file'], 'w', newline='', encoding='utf-8') as fh:
+                for line in rows:
+                    fh.write(line)
+        else:
+            for line in rows:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from volunteers.imports import MAX_IMPORT_ROWS, import_volunteers, read_csv_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Create volunteers from a CSV with a username[,email,password,phone_number] header. "
+        "Passwords are hashed in a process pool; rows without one get an unusable password. "
+        "Duplicate or invalid rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', help="Path to the CSV file.")
+        parser.add_argument('--workers', type=int, help="Hashing processes (default: up to 4).")
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['file'], encoding='utf-8-sig', newline='') as fh:
+                rows = read_csv_rows(fh.read())
+        except (OSError, UnicodeDecodeError, ValueError) as e:
+            raise CommandError(str(e))
+        if len(rows) > MAX_IMPORT_ROWS:
+            raise CommandError(f"At most {MAX_IMPORT_ROWS} rows per import; split the file.")
+
+        started = time.perf_counter()
+        result = import_volunteers(rows, workers=options['workers'])
+        elapsed = time.perf_counter() - started
+
+        for error in result['errors']:
+            # +2: the header is line 1 and rows are 0-based
+            self.stdout.write(self.style.WARNING(f"line {error['row'] + 2} ({error['username']}): {error['error']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {result['created']} volunteer(s), skipped {len(result['errors'])}, in {elapsed:.1f}s."
+        ))
@@ -0,0 +1,17 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from volunteers.changes import TOMBSTONE_RETENTION, prune
+
+
+class Command(BaseCommand):
+    help = "Delete change-feed tombstones older than any token the feed still accepts."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=TOMBSTONE_RETENTION.days,
+                            help="Keep tombstones this many days (default: the token lifetime).")
+
+    def handle(self, *args, **options):
+        count = prune(timedelta(days=options['days']))
+        self.stdout.write(self.style.SUCCESS(f"Deleted {count} tombstone(s)."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from volunteers.stats import diff_stats, rebuild_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild (or with --verify, check) the VolunteerStats rollup from the raw hours and attendance rows."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verify', action='store_true', help="Only report drift; do not write anything.")
+
+    def handle(self, *args, **options):
+        if options['verify']:
+            mismatches = diff_stats()
+            for vid, (have, want) in sorted(mismatches.items()):
+                self.stdout.write(f"volunteer {vid}: stored {have} != expected {want}")
+            if mismatches:
+                raise CommandError(f"{len(mismatches)} volunteer rollup(s) out of date.")
+            self.stdout.write(self.style.SUCCESS("VolunteerStats is up to date."))
+            return
+
+        count = rebuild_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt VolunteerStats for {count} volunteer(s)."))
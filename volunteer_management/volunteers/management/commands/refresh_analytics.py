@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from volunteers.analytics import refresh
+
+
+class Command(BaseCommand):
+    help = "Fold hours and attendance changed since the last run into the daily/monthly HoursRollup tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help="Rebuild every rollup instead of only the changed days.")
+
+    def handle(self, *args, **options):
+        result = refresh(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Recomputed {result['days']} day(s), wrote {result['rows']} rollup row(s); "
+            f"watermark {result['watermark'].isoformat()}."
+        ))
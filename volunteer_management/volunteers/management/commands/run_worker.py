@@ -0,0 +1,43 @@
+import signal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from volunteers.jobs import KINDS, Worker
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs (bulk attendance, event deletes, exports, volunteer imports, rollup refreshes)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=1, help="Jobs run at once, one thread each (default 1).")
+        parser.add_argument('--kinds', help=f"Comma-separated job kinds to take (default all: {', '.join(KINDS)}).")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds to wait when nothing is due.")
+        parser.add_argument('--burst', action='store_true', help="Exit once no job is due instead of waiting.")
+        parser.add_argument('--max-jobs', type=int, help="Exit after claiming this many jobs.")
+
+    def handle(self, *args, **options):
+        if options['concurrency'] < 1:
+            raise CommandError("--concurrency must be at least 1.")
+        kinds = None
+        if options['kinds']:
+            kinds = [kind.strip() for kind in options['kinds'].split(',') if kind.strip()]
+            unknown = sorted(set(kinds) - set(KINDS))
+            if unknown:
+                raise CommandError(f"Unknown job kind(s): {', '.join(unknown)}. Choose from: {', '.join(KINDS)}.")
+
+        worker = Worker(
+            concurrency=options['concurrency'],
+            kinds=kinds,
+            poll_interval=options['poll_interval'],
+            burst=options['burst'],
+            max_jobs=options['max_jobs'],
+        )
+        # ✅ SIGTERM / Ctrl-C finish the jobs in hand instead of abandoning them to the lease
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda *_: worker.stop())
+
+        self.stdout.write(f"Worker {worker.name} running with concurrency {worker.concurrency}.")
+        counts = worker.run()
+        self.stdout.write(self.style.SUCCESS(
+            f"Succeeded {counts['succeeded']}, retrying {counts['queued']}, failed {counts['failed']} job(s)."
+        ))
@@ -0,0 +1,73 @@
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+from .request_metrics import current_queries, registry
+
+
+def _view_label(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"  # 404s: keep arbitrary paths out of the label set
+    return match.view_name if match.url_name else match.route
+
+
+def _response_bytes(response):
+    if response.streaming:
+        return 0  # unknown until the body has been sent
+    return len(response.content)
+
+
+# ✅ Per-view latency, SQL count/time and response size, served at /api/admin/metrics/
+class RequestMetricsMiddleware:
+    """
+    Record per-URL-name request metrics into volunteers.request_metrics.registry.
+
+    Queries are timed by an execute wrapper installed on each connection when it
+    is opened, which is a no-op outside a request. With DEBUG on, the figures for
+    the request are also sent back as X-Query-Count / X-SQL-Time-ms /
+    X-Response-Time-ms headers.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        queries = []
+        token = current_queries.set(queries)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_queries.reset(token)
+        return self.finish(request, response, started, queries)
+
+    async def __acall__(self, request):
+        queries = []
+        token = current_queries.set(queries)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_queries.reset(token)
+        return self.finish(request, response, started, queries)
+
+    def finish(self, request, response, started, queries):
+        duration = time.perf_counter() - started
+        sql_duration = sum(queries)
+        registry.observe(_view_label(request), duration, len(queries), sql_duration, _response_bytes(response))
+
+        if settings.DEBUG:
+            response["X-Query-Count"] = str(len(queries))
+            response["X-SQL-Time-ms"] = f"{sql_duration * 1000:.1f}"
+            response["X-Response-Time-ms"] = f"{duration * 1000:.1f}"
+        return response
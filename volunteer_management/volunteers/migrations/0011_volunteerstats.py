@@ -0,0 +1,47 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:38
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_stats(apps, schema_editor):
+    VolunteerHours = apps.get_model('volunteers', 'VolunteerHours')
+    AttendanceRecord = apps.get_model('volunteers', 'AttendanceRecord')
+    VolunteerStats = apps.get_model('volunteers', 'VolunteerStats')
+
+    stats = {}
+    for r in VolunteerHours.objects.values('volunteer_id').annotate(hours=Sum('hours'), rows=Count('id')):
+        stats.setdefault(r['volunteer_id'], {}).update(event_hours=r['hours'] or 0, event_count=r['rows'])
+    for r in AttendanceRecord.objects.values('volunteer_id').annotate(
+        hours=Sum('online_hours'), meetings=Count('id', filter=Q(online_hours__gt=0))
+    ):
+        stats.setdefault(r['volunteer_id'], {}).update(online_hours=r['hours'] or 0, meeting_count=r['meetings'])
+
+    VolunteerStats.objects.bulk_create(
+        [VolunteerStats(volunteer_id=vid, **values) for vid, values in stats.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0010_delete_task'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VolunteerStats',
+            fields=[
+                ('volunteer', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('event_hours', models.IntegerField(default=0)),
+                ('online_hours', models.DecimalField(decimal_places=2, default=0, max_digits=10)),
+                ('event_count', models.IntegerField(default=0)),
+                ('meeting_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0011_volunteerstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceSubmission',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=255, unique=True)),
+                ('topic', models.CharField(max_length=255)),
+                ('records_created', models.PositiveIntegerField(default=0)),
+                ('unknown_usernames', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:40
+
+from django.db import migrations
+from django.db.models import Count, F, Max
+
+
+def drop_duplicate_hours(apps, schema_editor):
+    # Keep the newest row for each volunteer/event pair so the unique constraint can be added
+    VolunteerHours = apps.get_model('volunteers', 'VolunteerHours')
+    VolunteerStats = apps.get_model('volunteers', 'VolunteerStats')
+
+    duplicates = VolunteerHours.objects.values('volunteer_id', 'event_id').annotate(
+        rows=Count('id'), keep=Max('id')
+    ).filter(rows__gt=1)
+
+    for dup in duplicates:
+        extra = VolunteerHours.objects.filter(
+            volunteer_id=dup['volunteer_id'], event_id=dup['event_id']
+        ).exclude(id=dup['keep'])
+        removed_hours = sum(extra.values_list('hours', flat=True))
+        removed_rows = extra.count()
+        extra.delete()
+        VolunteerStats.objects.filter(volunteer_id=dup['volunteer_id']).update(
+            event_hours=F('event_hours') - removed_hours,
+            event_count=F('event_count') - removed_rows,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0012_attendancesubmission'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_duplicate_hours, migrations.RunPython.noop),
+    ]
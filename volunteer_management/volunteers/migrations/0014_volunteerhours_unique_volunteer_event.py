@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0013_drop_duplicate_volunteerhours'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='volunteerhours',
+            constraint=models.UniqueConstraint(fields=('volunteer', 'event'), name='unique_volunteer_event_hours'),
+        ),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.6 on 2026-10-18 08:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+# username__iexact is UPPER(username) = UPPER(%s) on PostgreSQL and a NOCASE LIKE on SQLite
+USERNAME_INDEX_SQL = {
+    'postgresql': 'CREATE INDEX IF NOT EXISTS auth_user_username_upper_idx ON auth_user (UPPER("username"::text))',
+    'sqlite': 'CREATE INDEX IF NOT EXISTS auth_user_username_upper_idx ON auth_user ("username" COLLATE NOCASE)',
+}
+
+
+def add_username_index(apps, schema_editor):
+    sql = USERNAME_INDEX_SQL.get(schema_editor.connection.vendor)
+    if sql:
+        schema_editor.execute(sql)
+
+
+def drop_username_index(apps, schema_editor):
+    if schema_editor.connection.vendor in USERNAME_INDEX_SQL:
+        schema_editor.execute('DROP INDEX IF EXISTS auth_user_username_upper_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0014_volunteerhours_unique_volunteer_event'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendancerecord',
+            index=models.Index(fields=['volunteer', '-id'], name='attendance_volunteer_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['title', 'date'], name='event_title_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['date', 'time'], name='event_date_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerhours',
+            index=models.Index(fields=['volunteer', 'hours'], name='hours_volunteer_hours_idx'),
+        ),
+        migrations.RunPython(add_username_index, drop_username_index),
+    ]
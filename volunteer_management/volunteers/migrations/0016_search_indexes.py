@@ -0,0 +1,50 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:05
+
+from django.db import migrations
+
+
+# Expressions must match volunteers.search._document_sql so the planner can use them.
+# SQLite gets FTS5 tables instead, created by volunteers.search.ensure_sqlite_fts after migrate.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """CREATE INDEX IF NOT EXISTS auth_user_search_tsv_idx ON auth_user USING GIN
+       (to_tsvector('simple', COALESCE("username", '') || ' ' || COALESCE("email", '')))""",
+    "CREATE INDEX IF NOT EXISTS auth_user_username_trgm_idx ON auth_user USING GIN (username gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS auth_user_email_trgm_idx ON auth_user USING GIN (email gin_trgm_ops)",
+    """CREATE INDEX IF NOT EXISTS event_search_tsv_idx ON volunteers_event USING GIN
+       (to_tsvector('simple', COALESCE("title", '') || ' ' || COALESCE("description", '')))""",
+    "CREATE INDEX IF NOT EXISTS event_title_trgm_idx ON volunteers_event USING GIN (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS event_description_trgm_idx ON volunteers_event USING GIN (description gin_trgm_ops)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS auth_user_search_tsv_idx",
+    "DROP INDEX IF EXISTS auth_user_username_trgm_idx",
+    "DROP INDEX IF EXISTS auth_user_email_trgm_idx",
+    "DROP INDEX IF EXISTS event_search_tsv_idx",
+    "DROP INDEX IF EXISTS event_title_trgm_idx",
+    "DROP INDEX IF EXISTS event_description_trgm_idx",
+]
+
+
+def add_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_FORWARD:
+            schema_editor.execute(sql)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for sql in POSTGRES_REVERSE:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0015_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_search_indexes, drop_search_indexes),
+    ]
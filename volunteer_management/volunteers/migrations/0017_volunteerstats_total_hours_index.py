@@ -0,0 +1,20 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:00
+
+import django.db.models.expressions
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0016_search_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='volunteerstats',
+            index=models.Index(models.OrderBy(models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('event_hours'), '+', models.F('online_hours')), output_field=models.DecimalField(decimal_places=2, max_digits=12)), descending=True), models.F('volunteer'), name='stats_total_hours_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.6 on 2026-10-18 09:04
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('volunteers', '0017_volunteerstats_total_hours_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('value', models.DateTimeField(null=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='attendancerecord',
+            name='created_at',
+            field=models.DateTimeField(db_index=True, default=django.utils.timezone.now),
+        ),
+        migrations.AddField(
+            model_name='attendancerecord',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='volunteerhours',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.CreateModel(
+            name='HoursRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('day', 'Day'), ('month', 'Month')], max_length=5)),
+                ('bucket', models.DateField()),
+                ('dimension', models.CharField(choices=[('event', 'Event'), ('volunteer', 'Volunteer'), ('topic', 'Topic')], max_length=10)),
+                ('key', models.CharField(max_length=255)),
+                ('event_hours', models.IntegerField(default=0)),
+                ('online_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('entries', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['dimension', 'granularity', 'bucket'], name='rollup_dimension_bucket_idx'), models.Index(fields=['granularity', 'bucket'], name='rollup_bucket_idx')],
+                'constraints': [models.UniqueConstraint(fields=('dimension', 'key', 'granularity', 'bucket'), name='unique_hours_rollup')],
+            },
+        ),
+    ]
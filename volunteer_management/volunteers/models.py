@@ -1,5 +1,8 @@
-from django.db import models
+from collections import defaultdict
+
+from django.db import models, transaction
 from django.contrib.auth.models import User
+from django.utils import timezone
 
 class Event(models.Model):
     title = models.CharField(max_length=255)
@@ -7,45 +10,407 @@ class Event(models.Model):
     date = models.DateField()
     time = models.TimeField(default="00:00:00")  # ✅ Added default value
     volunteers = models.ManyToManyField(User, related_name="events_attended")
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # ✅ Change feed; roster changes touch it too
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['title', 'date'], name='event_title_date_idx'),  # ✅ Lookups by title + date
+            models.Index(fields=['date', 'time'], name='event_date_time_idx'),  # ✅ Upcoming events / ordering
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.date} {self.time}"
 
 
-class VolunteerHours(models.Model):
+class VolunteerRowQuerySet(models.QuerySet):
+    def delete(self):
+        with transaction.atomic(using=self.db):
+            forget_deleted_rows(self.model, self)
+            return super().delete()
+
+
+class VolunteerRow(models.Model):
+    """
+    Hours and attendance rows deleted directly (admin, shell) settle the rollup,
+    cached dashboards, analytics days and change feed in delete() below. These
+    models have no delete receivers, so rows cascading from an Event or User
+    keep Django's fast delete; the parent's pre_delete does that work in bulk.
+    """
+    objects = VolunteerRowQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            forget_deleted_rows(type(self), type(self).objects.filter(pk=self.pk))
+            return super().delete(*args, **kwargs)
+
+
+class VolunteerHours(VolunteerRow):
     volunteer = models.ForeignKey(User, on_delete=models.CASCADE)  # This is the 'volunteer' field (already correct)
     event = models.ForeignKey(Event, on_delete=models.CASCADE)
     hours = models.PositiveIntegerField()
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)  # ✅ Watermark for incremental analytics
+
+    class Meta:
+        constraints = [
+            # ✅ One hours row per volunteer/event; lets batch assignment upsert with ON CONFLICT
+            models.UniqueConstraint(fields=['volunteer', 'event'], name='unique_volunteer_event_hours'),
+        ]
+        indexes = [
+            models.Index(fields=['volunteer', 'hours'], name='hours_volunteer_hours_idx'),  # ✅ Covers per-volunteer sums
+        ]
 
     def __str__(self):
         return f"{self.volunteer.username} - {self.event.title} - {self.hours} hours"
     
-class AttendanceRecord(models.Model):
+class AttendanceRecord(VolunteerRow):
     volunteer = models.ForeignKey(User, on_delete=models.CASCADE)
     topic = models.CharField(max_length=255, null= True)
     online_hours = models.DecimalField(max_digits=5, decimal_places=2, null = True)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)  # ✅ The day the meeting counts towards
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['volunteer', '-id'], name='attendance_volunteer_id_idx'),  # ✅ Latest-first per volunteer
+        ]
 
     def __str__(self):
         return f"{self.volunteer.username} - {self.topic} ({self.online_hours} hrs)"
 
 
+class AttendanceSubmission(models.Model):
+    # ✅ One row per idempotency key so a retried MarkAttendance submission is not logged twice
+    key = models.CharField(max_length=255, unique=True)
+    topic = models.CharField(max_length=255)
+    records_created = models.PositiveIntegerField(default=0)
+    unknown_usernames = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.key} - {self.topic} ({self.records_created} records)"
+
+
     
 class UserProfile(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='profile')
     phone_number = models.CharField(max_length=15, blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    TRACKED_FIELDS = ('phone_number',)
 
     def __str__(self):
         return f"{self.user.username} Profile"
-    
 
-from django.db.models.signals import post_save
+    # ✅ Remember the loaded values so saving an unchanged profile can be skipped
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = {f: getattr(instance, f) for f in cls.TRACKED_FIELDS if f in field_names}
+        return instance
+
+    def changed_fields(self):
+        """Tracked fields that differ from the database, or None if that is unknown (not loaded from it)."""
+        loaded = getattr(self, '_loaded_values', None)
+        if loaded is None or self._state.adding:
+            return None
+        return [f for f in self.TRACKED_FIELDS if f not in loaded or getattr(self, f) != loaded[f]]
+
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'updated_at'}  # auto_now only writes when listed
+        super().save(*args, **kwargs)
+        self._loaded_values = {f: getattr(self, f) for f in self.TRACKED_FIELDS}
+
+
+# Combined event + online hours; the leaderboard orders by exactly this so the index below applies
+TOTAL_HOURS = models.ExpressionWrapper(
+    models.F('event_hours') + models.F('online_hours'),
+    output_field=models.DecimalField(max_digits=12, decimal_places=2),
+)
+
+
+class VolunteerStats(models.Model):
+    # ✅ Rollup of VolunteerHours / AttendanceRecord per volunteer, kept in step by volunteers.stats
+    volunteer = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    event_hours = models.IntegerField(default=0)
+    online_hours = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    event_count = models.IntegerField(default=0)
+    meeting_count = models.IntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(TOTAL_HOURS.desc(), models.F('volunteer'), name='stats_total_hours_idx'),  # ✅ Leaderboard
+        ]
+
+    def __str__(self):
+        return f"{self.volunteer.username} - {self.event_hours} event hrs, {self.online_hours} online hrs"
+
+
+class HoursRollup(models.Model):
+    # ✅ Precomputed hours per day/month and event/volunteer/topic, kept in step by volunteers.analytics
+    DAY = 'day'
+    MONTH = 'month'
+    GRANULARITIES = [(DAY, 'Day'), (MONTH, 'Month')]
+    EVENT = 'event'
+    VOLUNTEER = 'volunteer'
+    TOPIC = 'topic'
+    DIMENSIONS = [(EVENT, 'Event'), (VOLUNTEER, 'Volunteer'), (TOPIC, 'Topic')]
+
+    granularity = models.CharField(max_length=5, choices=GRANULARITIES)
+    bucket = models.DateField()  # the day, or the first day of the month
+    dimension = models.CharField(max_length=10, choices=DIMENSIONS)
+    key = models.CharField(max_length=255)  # event id, volunteer id or meeting topic
+    event_hours = models.IntegerField(default=0)
+    online_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    entries = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['dimension', 'key', 'granularity', 'bucket'], name='unique_hours_rollup'),
+        ]
+        indexes = [
+            models.Index(fields=['dimension', 'granularity', 'bucket'], name='rollup_dimension_bucket_idx'),  # ✅ Totals across keys
+            models.Index(fields=['granularity', 'bucket'], name='rollup_bucket_idx'),  # ✅ Refresh deletes by bucket
+        ]
+
+    def __str__(self):
+        return f"{self.dimension} {self.key} - {self.granularity} {self.bucket}"
+
+
+class RollupWatermark(models.Model):
+    # ✅ Rows updated after `value` have not been folded into HoursRollup yet
+    name = models.CharField(max_length=50, unique=True)
+    value = models.DateTimeField(null=True)
+
+    def __str__(self):
+        return f"{self.name} @ {self.value}"
+
+
+class Tombstone(models.Model):
+    # ✅ What the change feed reports as deleted; `model` is the feed name (event, hours, attendance, profile)
+    model = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['model', 'deleted_at'], name='tombstone_model_deleted_idx'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_idx'),  # ✅ Pruning
+        ]
+
+    def __str__(self):
+        return f"{self.model} {self.object_id} deleted {self.deleted_at}"
+
+
+class RollupDirtyDay(models.Model):
+    # ✅ Days whose rows were deleted (deletes leave no updated_at behind); repeats are fine
+    day = models.DateField()
+
+    def __str__(self):
+        return str(self.day)
+
+
+class Job(models.Model):
+    # ✅ Background work for `manage.py run_worker`; handlers and claiming live in volunteers.jobs
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUSES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (SUCCEEDED, 'Succeeded'), (FAILED, 'Failed')]
+
+    kind = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUSES, default=QUEUED)
+    run_after = models.DateTimeField(default=timezone.now)  # retries are pushed back by their backoff
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    progress = models.PositiveIntegerField(default=0)
+    total = models.PositiveIntegerField(null=True)
+    message = models.CharField(max_length=255, blank=True)
+    result = models.JSONField(null=True)
+    error = models.TextField(blank=True)
+    worker = models.CharField(max_length=100, blank=True)
+    heartbeat_at = models.DateTimeField(null=True)  # a running job that stops beating is requeued
+    created_by = models.ForeignKey(User, null=True, on_delete=models.SET_NULL, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'run_after'], name='job_status_run_after_idx'),  # ✅ Claiming the next job
+            models.Index(fields=['status', 'finished_at'], name='job_status_finished_idx'),  # ✅ Pruning
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+from django.db.models.signals import post_save, post_delete, pre_delete, pre_save, m2m_changed
 from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from .authentication import invalidate_token, invalidate_user
+from .cache import bump_users, bump_versions, EVENTS_SCOPE, ROSTERS_SCOPE
+from .analytics import mark_dirty
+from .changes import record_deletes, touch_events
+from .stats import apply_stats_deltas, online_hours_delta, remove_event_hours
+from django.utils.dateparse import parse_date
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
     if created:
-        UserProfile.objects.create(user=instance)
+        # ✅ Callers can set `profile_fields` on the unsaved user so the profile is inserted once, complete
+        UserProfile.objects.create(user=instance, **getattr(instance, 'profile_fields', {}))
+
+@receiver(post_save, sender=User)
+def save_user_profile(sender, instance, created, **kwargs):
+    # ✅ Only write the profile when it was loaded on this user and a field actually changed;
+    # a plain User.save() (e.g. the last_login update on login) no longer touches UserProfile
+    if created or 'profile' not in instance._state.fields_cache:
+        return
+    profile = instance._state.fields_cache['profile']
+    if profile is None:
+        return
+    changed = profile.changed_fields()
+    if changed is None:
+        profile.save()
+    elif changed:
+        profile.save(update_fields=changed)
+
+
+# ✅ Keep the cached token authentication honest
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+    bump_users([instance.pk])
+
+# ✅ Rosters list usernames: a rename or a deleted volunteer (its M2M rows go without m2m_changed) changes them
+@receiver(pre_save, sender=User)
+def note_username_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or instance._state.adding or (update_fields is not None and 'username' not in update_fields):
+        return
+    old = User.objects.filter(pk=instance.pk).values_list('username', flat=True).first()
+    instance._username_changed = old is not None and old != instance.username
 
 @receiver(post_save, sender=User)
-def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
\ No newline at end of file
+@receiver(post_delete, sender=User)
+def bump_rosters_for_user(sender, instance, **kwargs):
+    if kwargs.get('created') is None or instance.__dict__.pop('_username_changed', False):
+        bump_versions([ROSTERS_SCOPE])  # post_delete sends no `created`
+
+@receiver(post_delete, sender=Token)
+def invalidate_cached_token(sender, instance, **kwargs):
+    invalidate_token(instance.key)
+
+
+# ✅ Bump cached-response versions whenever dashboard data changes
+@receiver(post_save, sender=VolunteerHours)
+@receiver(post_save, sender=AttendanceRecord)
+def bump_volunteer_version(sender, instance, **kwargs):
+    bump_users([instance.volunteer_id])
+
+@receiver(post_save, sender=UserProfile)
+def bump_profile_version(sender, instance, **kwargs):
+    bump_users([instance.user_id])
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def bump_events_version(sender, instance, **kwargs):
+    bump_versions([EVENTS_SCOPE])
+
+@receiver(m2m_changed, sender=Event.volunteers.through)
+def bump_roster_version(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    bump_versions([ROSTERS_SCOPE])
+    if reverse:
+        bump_users([instance.pk])
+    elif pk_set:
+        bump_users(pk_set)
+    elif action == "post_clear":
+        bump_versions([EVENTS_SCOPE])  # the cleared users are unknown here
+
+
+# ✅ An event's hours rows cascade on the fast path: settle the rollup and their volunteers' caches up front
+@receiver(pre_delete, sender=Event)
+def remove_deleted_event_hours(sender, instance, **kwargs):
+    # Lock the event first, so an assign_hours on it (which locks it too) is either counted or waits
+    list(Event.objects.select_for_update().filter(pk=instance.pk).values_list('pk'))
+    bump_users(remove_event_hours([instance.pk]))
+
+def forget_deleted_rows(model, rows):
+    """Rollup, cache, analytics and change-feed bookkeeping for hours or attendance `rows` about to be deleted."""
+    deltas = defaultdict(lambda: defaultdict(int))
+    if model is VolunteerHours:
+        found = list(rows.values_list('id', 'volunteer_id', 'hours', 'event__date'))
+        for _, volunteer_id, hours, _ in found:
+            deltas[volunteer_id]['event_hours'] -= hours
+            deltas[volunteer_id]['event_count'] -= 1
+        days = {day for *_, day in found}
+    else:
+        found = list(rows.values_list('id', 'volunteer_id', 'online_hours', 'created_at'))
+        for _, volunteer_id, hours, _ in found:
+            online_hours, meetings = online_hours_delta(hours)
+            deltas[volunteer_id]['online_hours'] -= online_hours
+            deltas[volunteer_id]['meeting_count'] -= meetings
+        days = {timezone.localdate(created_at) for *_, created_at in found}
+    apply_stats_deltas(deltas)
+    mark_dirty(days)
+    record_deletes({'hours' if model is VolunteerHours else 'attendance': [row[0] for row in found]})
+    bump_users({row[1] for row in found})
+
+
+# ✅ Queue analytics days whose rows disappear or move; plain inserts/updates are found by updated_at
+@receiver(pre_delete, sender=Event)
+def mark_deleted_event_day(sender, instance, **kwargs):
+    mark_dirty([instance.date])
+
+@receiver(pre_delete, sender=User)
+def mark_deleted_volunteer_days(sender, instance, **kwargs):
+    days = set(VolunteerHours.objects.filter(volunteer=instance).values_list('event__date', flat=True).distinct())
+    days |= {timezone.localdate(d) for d in AttendanceRecord.objects.filter(volunteer=instance).values_list('created_at', flat=True)}
+    mark_dirty(days)
+
+@receiver(pre_save, sender=Event)
+def mark_moved_event_days(sender, instance, raw=False, **kwargs):
+    if raw or instance._state.adding:
+        return
+    old = Event.objects.filter(pk=instance.pk).values_list('date', flat=True).first()
+    if old is not None and str(old) != str(instance.date):
+        mark_dirty([old, parse_date(str(instance.date))])
+
+
+# ✅ Change feed tombstones; cascades are written in bulk from the parent's pre_delete
+@receiver(pre_delete, sender=Event)
+def tombstone_event(sender, instance, **kwargs):
+    record_deletes({
+        'event': [instance.pk],
+        'hours': VolunteerHours.objects.filter(event=instance).values_list('id', flat=True),
+    })
+
+@receiver(pre_delete, sender=User)
+def tombstone_volunteer_rows(sender, instance, **kwargs):
+    record_deletes({
+        'profile': UserProfile.objects.filter(user=instance).values_list('id', flat=True),
+        'hours': VolunteerHours.objects.filter(volunteer=instance).values_list('id', flat=True),
+        'attendance': AttendanceRecord.objects.filter(volunteer=instance).values_list('id', flat=True),
+    })
+
+@receiver(post_delete, sender=UserProfile)
+def tombstone_profile(sender, instance, origin=None, **kwargs):
+    if getattr(origin, 'model', type(origin)) is not User:
+        record_deletes({'profile': [instance.pk]})
+
+@receiver(m2m_changed, sender=Event.volunteers.through)
+def touch_roster_events(sender, instance, action, reverse, pk_set, **kwargs):
+    if action in ("post_add", "post_remove"):
+        touch_events(pk_set if reverse else [instance.pk])
+    elif action == "pre_clear":
+        touch_events(instance.events_attended.values_list('id', flat=True) if reverse else [instance.pk])
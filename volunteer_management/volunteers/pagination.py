@@ -0,0 +1,30 @@
+from rest_framework.pagination import CursorPagination
+
+
+# ✅ Keyset pagination that only kicks in when the client asks for it
+class OptInCursorPagination(CursorPagination):
+    """
+    Cursor (keyset) pagination over an indexed ordering.
+
+    - Responses stay plain lists unless the request sends `page_size` or `cursor`,
+      so existing clients keep working.
+    - Views pick their ordering with a `cursor_ordering` attribute; the cursor
+      encodes the last seen position, so deep pages avoid OFFSET scans.
+    - The `next` link keeps the other query params (e.g. `search`).
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = '-id'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, 'cursor_ordering', self.ordering)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
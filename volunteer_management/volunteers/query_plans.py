@@ -0,0 +1,63 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connections, transaction
+from django.db.models import Sum
+
+from .models import AttendanceRecord, Event, VolunteerHours
+
+
+def _sample():
+    volunteer = User.objects.filter(is_staff=False).order_by("id").first()
+    event = Event.objects.order_by("id").first()
+    return volunteer, event
+
+
+# ✅ The lookups the hot views run, keyed by a readable name
+HOT_QUERIES = {
+    "event_by_title_and_date": lambda volunteer, event: Event.objects.filter(title=event.title, date=event.date),
+    "upcoming_events": lambda volunteer, event: Event.objects.filter(date__gte=date.today()).values(
+        "title", "date", "time", "description"
+    ),
+    "hours_by_volunteer": lambda volunteer, event: VolunteerHours.objects.filter(volunteer=volunteer).values(
+        "volunteer"
+    ).annotate(total_hours=Sum("hours")),
+    "attendance_latest_first": lambda volunteer, event: AttendanceRecord.objects.filter(volunteer=volunteer).order_by(
+        "-id"
+    ).values("topic", "online_hours"),
+    "username_iexact": lambda volunteer, event: User.objects.filter(username__iexact=volunteer.username.upper()),
+    "events_attended": lambda volunteer, event: Event.objects.filter(volunteers=volunteer).values("title", "date"),
+}
+
+
+def _is_sequential(vendor, plan):
+    if vendor == "postgresql":
+        return "Seq Scan" in plan
+    if vendor == "sqlite":
+        # Plan rows look like "3 0 0 SCAN volunteers_event"; SEARCH means an index was used
+        return any(line.split(" ", 3)[-1].startswith("SCAN ") for line in plan.splitlines())
+    return False
+
+
+def sequential_scans(using="default"):
+    """
+    EXPLAIN every hot query and return {name: plan} for those that fall back to a
+    sequential scan. Needs at least one volunteer and one event to build the
+    sample lookups. On PostgreSQL seq scans are disabled for the check so the
+    result reflects whether a usable index exists rather than the table size.
+    """
+    vendor = connections[using].vendor
+    volunteer, event = _sample()
+    if volunteer is None or event is None:
+        raise ValueError("Seed at least one volunteer and one event before checking query plans.")
+
+    failures = {}
+    with transaction.atomic(using=using):
+        if vendor == "postgresql":
+            with connections[using].cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        for name, build in HOT_QUERIES.items():
+            plan = build(volunteer, event).using(using).explain()
+            if _is_sequential(vendor, plan):
+                failures[name] = plan
+    return failures
@@ -0,0 +1,70 @@
+import re
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders, json
+
+try:
+    import orjson
+except ImportError:  # optional: without it these behave exactly like DRF's JSON renderer / parser
+    orjson = None
+
+
+# orjson writes exponent floats as 1e16 / 1e-7 where json writes 1e+16 / 1e-07. Any "e"
+# followed by a digit or "-" (also matched inside strings, which only costs a fallback) sends
+# the payload back through the stdlib encoder so the bytes never differ. A literal first
+# character keeps the scan at memchr speed.
+_EXPONENT = re.compile(rb"e[-0-9]")
+_LONG_NUMBER = re.compile(rb"[0-9]{19}")
+_ORJSON_OPTIONS = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS) if orjson else 0
+_default = encoders.JSONEncoder().default
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    DRF's JSONRenderer, with the compact output produced by orjson.
+
+    Dates, times, decimals and lazy strings go through DRF's own encoder, and
+    \\u2028 / \\u2029 are escaped the same way, so the bytes match JSONRenderer.
+    Indented output (browsable API, `; indent=` media types) and anything orjson
+    refuses (non-string keys, integers past 64 bits) use JSONRenderer itself.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None or data is None or self.ensure_ascii or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=_default, option=_ORJSON_OPTIONS)
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+        if _EXPONENT.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        if b"\xe2\x80" in ret:
+            ret = ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """DRF's JSONParser, decoding with orjson; input orjson rejects gets the stdlib's verdict."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        encoding = (parser_context or {}).get('encoding', settings.DEFAULT_CHARSET)
+        raw = stream.read()
+        # orjson reads integers past 64 bits as floats; a 19+ digit run goes to the stdlib instead
+        if encoding.lower().replace('_', '-') in ('utf-8', 'utf8') and not _LONG_NUMBER.search(raw):
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                pass  # let the stdlib decide, so clients see the errors they always have
+        try:
+            parse_constant = json.strict_constant if self.strict else None
+            return json.loads(raw.decode(encoding), parse_constant=parse_constant)
+        except ValueError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
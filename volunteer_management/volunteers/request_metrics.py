@@ -0,0 +1,132 @@
+import bisect
+import contextvars
+import logging
+import threading
+import time
+import traceback
+from pathlib import Path
+
+from django.conf import settings
+
+
+logger = logging.getLogger('volunteers.slow_queries')
+sql_logger = logging.getLogger('volunteers.sql')  # sampled by settings.SQL_LOG_SAMPLE_RATE
+
+# Latency histogram bucket upper bounds, in seconds (Prometheus convention)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROJECT_ROOT = str(Path(__file__).resolve().parent.parent)
+
+# The SQL durations of the request being served; sync_to_async copies the context,
+# so queries run on worker threads for an async view are recorded too
+current_queries = contextvars.ContextVar('current_queries', default=None)
+
+
+class _ViewStats:
+    __slots__ = ("buckets", "count", "duration", "queries", "sql_duration", "response_bytes")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.duration = 0.0
+        self.queries = 0
+        self.sql_duration = 0.0
+        self.response_bytes = 0
+
+
+class Registry:
+    """Per-view request metrics for this worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views = {}
+
+    def observe(self, view, duration, queries, sql_duration, response_bytes):
+        with self._lock:
+            stats = self._views.get(view)
+            if stats is None:
+                stats = self._views[view] = _ViewStats()
+            stats.buckets[bisect.bisect_left(BUCKETS, duration)] += 1
+            stats.count += 1
+            stats.duration += duration
+            stats.queries += queries
+            stats.sql_duration += sql_duration
+            stats.response_bytes += response_bytes
+
+    def reset(self):
+        with self._lock:
+            self._views = {}
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                view: {
+                    "buckets": list(s.buckets),
+                    "count": s.count,
+                    "duration": s.duration,
+                    "queries": s.queries,
+                    "sql_duration": s.sql_duration,
+                    "response_bytes": s.response_bytes,
+                }
+                for view, s in self._views.items()
+            }
+
+    def render_prometheus(self):
+        """The registry in the Prometheus text exposition format (0.0.4)."""
+        views = sorted(self.snapshot().items())
+        lines = [
+            "# HELP volunteer_http_request_duration_seconds Request latency by view.",
+            "# TYPE volunteer_http_request_duration_seconds histogram",
+        ]
+        for view, s in views:
+            cumulative = 0
+            for bound, n in zip((*BUCKETS, "+Inf"), s["buckets"]):
+                cumulative += n
+                lines.append(f'volunteer_http_request_duration_seconds_bucket{{view="{view}",le="{bound}"}} {cumulative}')
+            lines.append(f'volunteer_http_request_duration_seconds_sum{{view="{view}"}} {s["duration"]:.6f}')
+            lines.append(f'volunteer_http_request_duration_seconds_count{{view="{view}"}} {s["count"]}')
+
+        for name, key, help_text, fmt in (
+            ("volunteer_http_sql_queries_total", "queries", "SQL queries issued by view.", "{}"),
+            ("volunteer_http_sql_duration_seconds_total", "sql_duration", "Time spent in SQL by view.", "{:.6f}"),
+            ("volunteer_http_response_bytes_total", "response_bytes", "Response body bytes by view.", "{}"),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for view, s in views:
+                lines.append(f'{name}{{view="{view}"}} ' + fmt.format(s[key]))
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+def _origin():
+    # The innermost frame from our own code, i.e. the line that triggered the query
+    for frame in reversed(traceback.extract_stack()[:-3]):
+        if frame.filename.startswith(PROJECT_ROOT) and "/site-packages/" not in frame.filename:
+            return f"{frame.filename[len(PROJECT_ROOT) + 1:]}:{frame.lineno} in {frame.name}"
+    return "unknown"
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper: times every query and logs the slow ones with their origin."""
+    queries = current_queries.get()
+    if queries is None:
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        queries.append(elapsed)  # list.append is atomic, so concurrent worker threads are safe
+        if elapsed * 1000 >= getattr(settings, 'SLOW_QUERY_MS', 200):
+            logger.warning("slow query (%.1f ms) from %s: %s", elapsed * 1000, _origin(), sql[:1000])
+        if getattr(settings, 'SQL_LOG_SAMPLE_RATE', 0):
+            sql_logger.info("query", extra={"sql": sql[:1000], "duration_ms": round(elapsed * 1000, 3)})
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    # connection_created fires on every (re)connect of the same wrapper object
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
@@ -0,0 +1,152 @@
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from django.utils.module_loading import import_string
+from rest_framework.filters import SearchFilter
+
+
+# ✅ What each view's search box covers: table, text columns and the SQLite FTS5 shadow table
+SEARCH_INDEXES = {
+    "user": {"table": "auth_user", "fields": ("username", "email"), "fts": "volunteers_user_fts"},
+    "event": {"table": "volunteers_event", "fields": ("title", "description"), "fts": "volunteers_event_fts"},
+}
+
+TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _words(terms):
+    return [w.lower() for term in terms for w in TERM_RE.findall(term)]
+
+
+def _document_sql(index):
+    # Must match the expression indexed in migration 0016 exactly, or PostgreSQL will not use it
+    fields = " || ' ' || ".join(f"COALESCE(\"{index['table']}\".\"{f}\", '')" for f in index["fields"])
+    return f"to_tsvector('simple', {fields})"
+
+
+class PostgresSearchBackend:
+    """tsvector prefix matching plus pg_trgm similarity, both served by GIN indexes."""
+
+    def search(self, queryset, index, terms):
+        words = _words(terms)
+        if not words:
+            return queryset.none()
+        tsquery = " & ".join(f"{w}:*" for w in words)
+        text = " ".join(words)
+        table = index["table"]
+
+        document = _document_sql(index)
+        trigram_match = " OR ".join(f"\"{table}\".\"{f}\" %% %s" for f in index["fields"])
+        similarity = ", ".join(f"similarity(\"{table}\".\"{f}\", %s)" for f in index["fields"])
+
+        matches = RawSQL(
+            f"({document} @@ to_tsquery('simple', %s) OR {trigram_match})",
+            [tsquery, *([text] * len(index["fields"]))],
+            output_field=BooleanField(),
+        )
+        rank = RawSQL(
+            f"ts_rank({document}, to_tsquery('simple', %s)) + GREATEST({similarity})",
+            [tsquery, *([text] * len(index["fields"]))],
+            output_field=FloatField(),
+        )
+        return queryset.filter(matches).annotate(search_rank=rank).order_by("-search_rank", "pk")
+
+
+class SQLiteFTSSearchBackend:
+    """FTS5 prefix queries ranked by bm25, for local and test runs."""
+
+    def search(self, queryset, index, terms):
+        words = _words(terms)
+        if not words:
+            return queryset.none()
+        match = " ".join(f'"{w}"*' for w in words)
+        table, fts = index["table"], index["fts"]
+
+        matching_ids = RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [match])
+        # FTS5 rank is bm25(); lower is better, so negate it to sort like PostgreSQL
+        rank = RawSQL(
+            f"(SELECT -rank FROM {fts} WHERE {fts} MATCH %s AND rowid = \"{table}\".\"id\")",
+            [match],
+            output_field=FloatField(),
+        )
+        return queryset.filter(pk__in=matching_ids).annotate(search_rank=rank).order_by("-search_rank", "pk")
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SQLiteFTSSearchBackend,
+}
+
+
+def get_search_backend(using):
+    """The backend for this database, `VOLUNTEER_SEARCH_BACKEND` if set, or None to fall back to icontains."""
+    override = getattr(settings, "VOLUNTEER_SEARCH_BACKEND", None)
+    if override:
+        return import_string(override)()
+    backend = BACKENDS.get(connections[using].vendor)
+    return backend() if backend else None
+
+
+# ✅ Drop-in replacement for SearchFilter that uses the indexed backend when the view names one
+class IndexedSearchFilter(SearchFilter):
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        index = SEARCH_INDEXES.get(getattr(view, "search_index", None))
+        if not terms or index is None:
+            return super().filter_queryset(request, queryset, view)
+
+        backend = get_search_backend(queryset.db)
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+        return backend.search(queryset, index, terms)
+
+
+SQLITE_FTS_STATEMENTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({columns}, content='{table}', content_rowid='id')",
+    """CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN
+        INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old});
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old});
+        INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new});
+    END""",
+)
+
+
+def ensure_sqlite_fts(using="default"):
+    """
+    Create the FTS5 tables and sync triggers on SQLite and rebuild any that were missing.
+
+    Runs after every migrate because SQLite's ALTER TABLE emulation recreates a
+    table and silently drops its triggers.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+
+    with connection.cursor() as cursor:
+        for index in SEARCH_INDEXES.values():
+            fts = index["fts"]
+            cursor.execute(
+                "SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name IN (%s, %s, %s)",
+                [f"{fts}_ai", f"{fts}_ad", f"{fts}_au"],
+            )
+            if cursor.fetchone()[0] == 3:
+                continue
+
+            names = {
+                "fts": fts,
+                "table": index["table"],
+                "columns": ", ".join(index["fields"]),
+                "new": ", ".join(f"new.{f}" for f in index["fields"]),
+                "old": ", ".join(f"old.{f}" for f in index["fields"]),
+            }
+            for statement in SQLITE_FTS_STATEMENTS:
+                cursor.execute(statement.format(**names))
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
@@ -0,0 +1,102 @@
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from rest_framework.authtoken.models import Token
+
+from .cache import bump_users, bump_versions, EVENTS_SCOPE, ROSTERS_SCOPE
+from .models import AttendanceRecord, Event, UserProfile, VolunteerHours, VolunteerStats
+
+
+SEED_PASSWORD = "seed-pass-123"
+BATCH_SIZE = 1000
+
+FIRST_NAMES = ("asha", "ben", "carmen", "dev", "elena", "farid", "grace", "hiro", "isla", "jonas", "kavya", "liam")
+LAST_NAMES = ("shah", "okafor", "garcia", "nguyen", "kowalski", "mehta", "brown", "silva", "tanaka", "ali")
+EVENT_KINDS = ("Beach Cleanup", "Food Drive", "Tree Planting", "Blood Camp", "Book Sorting", "Shelter Visit")
+PLACES = ("Riverside", "Old Town", "North Park", "Harbour", "Central Library", "East Market")
+TOPICS = ("Orientation", "Safety Briefing", "Team Sync", "Fundraising", "First Aid", "Volunteer Training")
+
+
+def seed(volunteers=100, events=20, roster_size=10, meetings=3, prefix="seed", rng_seed=0):
+    """
+    Bulk-insert a realistic dataset and return what was created.
+
+    Every volunteer gets a profile, a token and a rollup row; every event gets
+    a roster of `roster_size` volunteers with hours; every volunteer attends
+    `meetings` online sessions. bulk_create skips signals, so the rollup is
+    written directly and the cache versions are bumped by hand.
+    """
+    rng = random.Random(rng_seed)
+    password = make_password(SEED_PASSWORD)  # hash once; every seeded user shares it
+    today = date.today()
+
+    with transaction.atomic():
+        admin = User.objects.create_user(
+            username=f"{prefix}_admin", email=f"{prefix}_admin@example.org", password=SEED_PASSWORD, is_staff=True
+        )
+        users = User.objects.bulk_create([
+            User(
+                username=f"{prefix}_{rng.choice(FIRST_NAMES)}_{i}",
+                first_name=rng.choice(FIRST_NAMES).title(),
+                last_name=rng.choice(LAST_NAMES).title(),
+                email=f"{prefix}_{i}@example.org",
+                password=password,
+            )
+            for i in range(volunteers)
+        ], batch_size=BATCH_SIZE)
+        UserProfile.objects.bulk_create([
+            UserProfile(user=u, phone_number=f"555-{rng.randrange(10000):04d}") for u in users
+        ], batch_size=BATCH_SIZE)
+        tokens = Token.objects.bulk_create(
+            [Token(key=Token.generate_key(), user=u) for u in [admin, *users]], batch_size=BATCH_SIZE
+        )
+
+        created_events = Event.objects.bulk_create([
+            Event(
+                title=f"{rng.choice(EVENT_KINDS)} {rng.choice(PLACES)}",
+                description=f"{prefix} event {i}",
+                date=today + timedelta(days=rng.randint(-180, 180)),
+                time=time(rng.randint(7, 18), rng.choice((0, 30))),
+            )
+            for i in range(events)
+        ], batch_size=BATCH_SIZE)
+
+        stats = {u.id: {"event_hours": 0, "event_count": 0, "online_hours": Decimal("0"), "meeting_count": 0} for u in users}
+        roster_links, hours_rows = [], []
+        for event in created_events:
+            for user in rng.sample(users, min(roster_size, len(users))):
+                hours = rng.randint(1, 8)
+                roster_links.append(Event.volunteers.through(event_id=event.id, user_id=user.id))
+                hours_rows.append(VolunteerHours(volunteer_id=user.id, event_id=event.id, hours=hours))
+                stats[user.id]["event_hours"] += hours
+                stats[user.id]["event_count"] += 1
+        Event.volunteers.through.objects.bulk_create(roster_links, batch_size=BATCH_SIZE)
+        VolunteerHours.objects.bulk_create(hours_rows, batch_size=BATCH_SIZE)
+
+        attendance = []
+        for user in users:
+            for topic in rng.sample(TOPICS, min(meetings, len(TOPICS))):
+                online_hours = Decimal(rng.choice(("0.50", "1.00", "1.50", "2.00")))
+                attendance.append(AttendanceRecord(volunteer_id=user.id, topic=topic, online_hours=online_hours))
+                stats[user.id]["online_hours"] += online_hours
+                stats[user.id]["meeting_count"] += 1
+        AttendanceRecord.objects.bulk_create(attendance, batch_size=BATCH_SIZE)
+
+        VolunteerStats.objects.bulk_create(
+            [VolunteerStats(volunteer_id=vid, **values) for vid, values in stats.items()], batch_size=BATCH_SIZE
+        )
+        bump_users(stats)
+        bump_versions([EVENTS_SCOPE, ROSTERS_SCOPE])
+
+    return {
+        "admin": admin,
+        "volunteers": users,
+        "events": created_events,
+        "tokens": {t.user_id: t.key for t in tokens},
+        "hours": len(hours_rows),
+        "attendance": len(attendance),
+    }
@@ -1,17 +1,20 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
 from rest_framework.authtoken.models import Token
 from .models import Event, VolunteerHours
-from django.db.models import Sum
+from django.db import transaction
+from django.db.models import Sum, Prefetch
 
 from .models import AttendanceRecord
+from .stats import record_event_hours
 
 class AttendanceSerializer(serializers.ModelSerializer):
     volunteer_username = serializers.CharField(source="volunteer.username", read_only=True)
 
     class Meta:
         model = AttendanceRecord
-        fields = ["volunteer", "volunteer_username", "meeting_topic", "online_hours"]
+        fields = ["volunteer", "volunteer_username", "topic", "online_hours"]
 
 
 
@@ -27,16 +30,41 @@ class UserSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'username', 'email', 'total_hours', 'events_attended', 'meetings_attended', 'phone_number']
 
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # ✅ Load everything the method fields need in a fixed number of queries
+        return queryset.select_related('profile').annotate(
+            total_hours_sum=Sum('volunteerhours__hours')
+        ).prefetch_related(
+            Prefetch(
+                'volunteerhours_set',
+                queryset=VolunteerHours.objects.select_related('event').only('volunteer_id', 'event__title').order_by('id'),
+                to_attr='prefetched_hours',
+            ),
+            Prefetch(
+                'attendancerecord_set',
+                queryset=AttendanceRecord.objects.filter(online_hours__gt=0).only('volunteer_id', 'topic', 'online_hours').order_by('id'),
+                to_attr='prefetched_meetings',
+            ),
+        )
+
     def get_total_hours(self, obj):
+        if hasattr(obj, 'total_hours_sum'):
+            return obj.total_hours_sum or 0
         total_hours = VolunteerHours.objects.filter(volunteer=obj).aggregate(total=Sum('hours'))['total']
         return total_hours or 0
 
     def get_events_attended(self, obj):
+        if hasattr(obj, 'prefetched_hours'):
+            return list(dict.fromkeys(h.event.title for h in obj.prefetched_hours))
         events = VolunteerHours.objects.filter(volunteer=obj).values_list('event__title', flat=True).distinct()
         return list(events)
 
     def get_meetings_attended(self, obj):
-        records = AttendanceRecord.objects.filter(volunteer=obj, online_hours__gt=0).values("topic", "online_hours")
+        if hasattr(obj, 'prefetched_meetings'):
+            records = [{"topic": r.topic, "online_hours": r.online_hours} for r in obj.prefetched_meetings]
+        else:
+            records = AttendanceRecord.objects.filter(volunteer=obj, online_hours__gt=0).values("topic", "online_hours")
         return [
             {
                 "topic": r["topic"],
@@ -60,15 +88,54 @@ class RegisterSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         phone_number = validated_data.pop('phone_number', '')  # ✅ Get phone number safely
-        user = User.objects.create_user(**validated_data)
-        Token.objects.create(user=user)
-        user.profile.phone_number = phone_number
-        user.profile.save()
+        password = validated_data.pop('password')
+        # ✅ One transaction, three INSERTs: user, profile (with the phone number, via the
+        # create_user_profile receiver) and token
+        with transaction.atomic():
+            user = User(**validated_data)
+            user.username = User.normalize_username(user.username)
+            user.email = User.objects.normalize_email(user.email)
+            user.set_password(password)
+            user.profile_fields = {'phone_number': phone_number}
+            user.save()
+            Token.objects.create(user=user)
         return user
 
+# ✅ many=True slug field that resolves the whole list with one `slug__in` query
+class BulkSlugManyRelatedField(serializers.ManyRelatedField):
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, '__iter__'):
+            self.fail('not_a_list', input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail('empty')
+        if any(not isinstance(item, str) for item in data):
+            raise serializers.ValidationError("Each entry must be a username string.")
+
+        slug_field = self.child_relation.slug_field
+        names = list(dict.fromkeys(data))  # drop repeats, keep order
+        found = {
+            getattr(obj, slug_field): obj
+            for obj in self.child_relation.get_queryset().filter(**{f'{slug_field}__in': names})
+        }
+        missing = [name for name in names if name not in found]
+        if missing:
+            raise serializers.ValidationError(f"Unknown username(s): {', '.join(missing)}")
+        return [found[name] for name in names]
+
+
+class BulkSlugRelatedField(serializers.SlugRelatedField):
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {'child_relation': cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return BulkSlugManyRelatedField(**list_kwargs)
+
+
 # ✅ Event Serializer
 class EventSerializer(serializers.ModelSerializer):
-    volunteers = serializers.SlugRelatedField(
+    volunteers = BulkSlugRelatedField(
         queryset=User.objects.all(),
         many=True,
         required=False,  # ✅ Volunteers field remains optional
@@ -77,7 +144,21 @@ class EventSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Event
-        fields = "__all__"
+        fields = ['id', 'title', 'description', 'date', 'time', 'volunteers']  # ✅ Not the change-feed timestamps
+
+    @staticmethod
+    def setup_eager_loading(queryset):
+        # ✅ One query for every roster on the page, loading only the usernames it shows
+        # (in user id order, which the .values() read path in volunteers.fast_read matches)
+        return queryset.prefetch_related(
+            Prefetch('volunteers', queryset=User.objects.only('id', 'username').order_by('id'))
+        )
+
+
+# ✅ Events as the change feed sends them: with the timestamps every feed row carries
+class ChangedEventSerializer(EventSerializer):
+    class Meta(EventSerializer.Meta):
+        fields = EventSerializer.Meta.fields + ['created_at', 'updated_at']
         
 
 # ✅ Volunteer Hours Serializer
@@ -107,8 +188,10 @@ class VolunteerHoursSerializer(serializers.ModelSerializer):
         except Event.DoesNotExist:
             raise serializers.ValidationError({"event": "Event not found with this title and date."})
 
-        # Create VolunteerHours entry
-        volunteer_hours = VolunteerHours.objects.create(volunteer=volunteer, event=event, **validated_data)
+        # Create VolunteerHours entry and bump the rollup in the same transaction
+        with transaction.atomic():
+            volunteer_hours = VolunteerHours.objects.create(volunteer=volunteer, event=event, **validated_data)
+            record_event_hours(volunteer.id, volunteer_hours.hours, 1)
         return volunteer_hours
 
 
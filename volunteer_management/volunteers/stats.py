@@ -0,0 +1,142 @@
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from .cache import bump_users
+from .models import AttendanceRecord, VolunteerHours, VolunteerStats
+
+
+BATCH_SIZE = 500
+
+STAT_FIELDS = ('event_hours', 'online_hours', 'event_count', 'meeting_count')
+
+
+def apply_stats_deltas(deltas):
+    """
+    Add per-volunteer deltas to the VolunteerStats rollup.
+
+    `deltas` maps volunteer_id -> {field: amount}. Missing rows are created first,
+    then volunteers sharing the same delta are updated together with F()
+    expressions, so concurrent writers never lose each other's increments and an
+    attendance session where everyone logged the same hours is a single UPDATE.
+    """
+    groups = defaultdict(list)
+    for vid, d in deltas.items():
+        key = tuple((field, d[field]) for field in STAT_FIELDS if d.get(field))
+        if key:
+            groups[key].append(vid)
+    if not groups:
+        return
+
+    with transaction.atomic():
+        VolunteerStats.objects.bulk_create(
+            [VolunteerStats(volunteer_id=vid) for vids in groups.values() for vid in vids],
+            ignore_conflicts=True,
+            batch_size=BATCH_SIZE,
+        )
+
+        for key, vids in groups.items():
+            updates = {field: F(field) + amount for field, amount in key}
+            for i in range(0, len(vids), BATCH_SIZE):
+                VolunteerStats.objects.filter(volunteer_id__in=vids[i:i + BATCH_SIZE]).update(**updates)
+
+
+def record_event_hours(volunteer_id, hours_delta, count_delta=0):
+    apply_stats_deltas({volunteer_id: {'event_hours': hours_delta, 'event_count': count_delta}})
+
+
+def online_hours_delta(hours):
+    """Return the (online_hours, meeting_count) contribution of one attendance record."""
+    if hours is None:
+        return Decimal('0'), 0
+    hours = Decimal(str(hours)).quantize(Decimal('0.01'))
+    return hours, 1 if hours > 0 else 0
+
+
+def remove_event_hours(events):
+    """
+    Subtract the hours of every VolunteerHours row under `events` before they are
+    deleted (the Event pre_delete receiver calls this). Returns the volunteer ids.
+    """
+    rows = VolunteerHours.objects.filter(event__in=events).values('volunteer_id').annotate(
+        hours=Sum('hours'), rows=Count('id')
+    )
+    deltas = {
+        r['volunteer_id']: {'event_hours': -r['hours'], 'event_count': -r['rows']}
+        for r in rows
+    }
+    apply_stats_deltas(deltas)
+    return deltas.keys()
+
+
+def compute_stats():
+    """Aggregate the raw VolunteerHours / AttendanceRecord rows into {volunteer_id: stats}."""
+    stats = {}
+
+    def row(vid):
+        return stats.setdefault(vid, {field: 0 for field in STAT_FIELDS})
+
+    for r in VolunteerHours.objects.values('volunteer_id').annotate(hours=Sum('hours'), rows=Count('id')):
+        row(r['volunteer_id']).update(event_hours=r['hours'] or 0, event_count=r['rows'])
+
+    for r in AttendanceRecord.objects.values('volunteer_id').annotate(
+        hours=Sum('online_hours'), meetings=Count('id', filter=Q(online_hours__gt=0))
+    ):
+        row(r['volunteer_id']).update(online_hours=r['hours'] or Decimal('0'), meeting_count=r['meetings'])
+
+    return stats
+
+
+def rebuild_stats():
+    """
+    Bring the whole rollup in line with values recomputed from the raw rows.
+
+    The rollup rows are locked before the raw rows are read and corrected in
+    place, so a writer logging hours meanwhile either committed first (and is
+    counted) or waits and adds its F() delta on top of the rebuilt value.
+    """
+    empty = {field: 0 for field in STAT_FIELDS}
+    with transaction.atomic():
+        existing = list(VolunteerStats.objects.select_for_update())
+        stats = compute_stats()
+        changed = []
+        for row in existing:
+            values = stats.get(row.volunteer_id, empty)
+            if any(Decimal(getattr(row, f)) != Decimal(values[f]) for f in STAT_FIELDS):
+                for field in STAT_FIELDS:
+                    setattr(row, field, values[field])
+                changed.append(row)
+        VolunteerStats.objects.bulk_update(changed, STAT_FIELDS, batch_size=BATCH_SIZE)
+        have = {row.volunteer_id for row in existing}
+        VolunteerStats.objects.bulk_create(
+            [VolunteerStats(volunteer_id=vid, **values) for vid, values in stats.items() if vid not in have],
+            ignore_conflicts=True,
+            batch_size=BATCH_SIZE,
+        )
+        bump_users(have | stats.keys())  # cached profiles show these totals; bulk writes send no signals
+    return len(stats)
+
+
+def diff_stats():
+    """Return {volunteer_id: (stored, expected)} for every volunteer whose rollup has drifted."""
+    expected = compute_stats()
+    stored = {
+        s['volunteer_id']: {field: s[field] for field in STAT_FIELDS}
+        for s in VolunteerStats.objects.values('volunteer_id', *STAT_FIELDS)
+    }
+    empty = {field: 0 for field in STAT_FIELDS}
+
+    mismatches = {}
+    for vid in expected.keys() | stored.keys():
+        have = stored.get(vid, empty)
+        want = expected.get(vid, empty)
+        if any(Decimal(have[f]) != Decimal(want[f]) for f in STAT_FIELDS):
+            mismatches[vid] = (have, want)
+    return mismatches
+
+
+def stats_for(user):
+    """Return the rollup row for `user`, or an unsaved zero row if it has no activity yet."""
+    return VolunteerStats.objects.filter(volunteer=user).first() or VolunteerStats(volunteer=user)
@@ -0,0 +1,1458 @@
+import io
+import json
+import logging
+import os
+import runpy
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models.deletion import Collector
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from .models import (
+    Event, VolunteerHours, AttendanceRecord, VolunteerStats, AttendanceSubmission, UserProfile, HoursRollup, Job,
+    RollupDirtyDay, Tombstone,
+)
+from . import analytics, jobs
+from .changes import OVERLAP, make_token
+from .renderers import ORJSONParser, ORJSONRenderer
+from .serializers import AttendanceSerializer, EventSerializer
+from .views import ATTENDANCE_READER, EVENT_READER
+from . import db_metrics
+from .authentication import counters as auth_counters
+from .cache import cached_versioned
+from .query_plans import sequential_scans
+from .request_metrics import registry as request_registry
+from .imports import PARALLEL_THRESHOLD, SYNC_IMPORT_ROWS
+from .logging_pipeline import JsonFormatter, QueuedLogHandler, SamplingFilter
+from .stats import diff_stats, record_event_hours
+from .benchmarks import run_suite, uncovered_routes
+
+
+def make_volunteers(count, prefix="vol"):
+    volunteers = []
+    for i in range(count):
+        user = User.objects.create_user(username=f"{prefix}{i}", email=f"{prefix}{i}@example.com", password="pass12345")
+        user.profile.phone_number = f"555{i:04d}"
+        user.profile.save()
+        volunteers.append(user)
+    return volunteers
+
+
+class VolunteerListQueryTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.event_a = Event.objects.create(title="Cleanup", description="Beach", date=date(2025, 1, 1))
+        self.event_b = Event.objects.create(title="Food Drive", description="Bank", date=date(2025, 2, 1))
+
+    def add_activity(self, volunteers):
+        for user in volunteers:
+            VolunteerHours.objects.create(volunteer=user, event=self.event_a, hours=3)
+            VolunteerHours.objects.create(volunteer=user, event=self.event_b, hours=2)
+            AttendanceRecord.objects.create(volunteer=user, topic="Orientation", online_hours=1.5)
+            AttendanceRecord.objects.create(volunteer=user, topic="Skipped", online_hours=0)
+
+    def test_payload_matches_per_row_serializer(self):
+        volunteers = make_volunteers(2)
+        self.add_activity(volunteers[:1])
+
+        response = self.client.get("/api/admin/volunteers/")
+
+        self.assertEqual(response.status_code, 200)
+        data = {row["username"]: row for row in response.data}
+        self.assertEqual(data["vol0"], {
+            "id": volunteers[0].id,
+            "username": "vol0",
+            "email": "vol0@example.com",
+            "total_hours": 5,
+            "events_attended": ["Cleanup", "Food Drive"],
+            "meetings_attended": [{"topic": "Orientation", "online_hours": 1.5}],
+            "phone_number": "5550000",
+        })
+        self.assertEqual(data["vol1"]["total_hours"], 0)
+        self.assertEqual(data["vol1"]["events_attended"], [])
+        self.assertEqual(data["vol1"]["meetings_attended"], [])
+
+    def test_query_count_does_not_grow_with_volunteers(self):
+        self.add_activity(make_volunteers(3, prefix="small"))
+        with self.assertNumQueries(3):
+            self.client.get("/api/admin/volunteers/")
+
+        self.add_activity(make_volunteers(30, prefix="large"))
+        with self.assertNumQueries(3):
+            response = self.client.get("/api/admin/volunteers/")
+        self.assertEqual(len(response.data), 33)
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def collect_pages(self, url):
+        rows, pages = [], 0
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            rows.extend(response.data["results"])
+            url = response.data["next"]
+            pages += 1
+        return rows, pages
+
+    def test_unpaginated_by_default(self):
+        make_volunteers(3)
+        response = self.client.get("/api/admin/volunteers/")
+        self.assertIsInstance(response.data, list)
+        self.assertEqual(len(response.data), 3)
+
+    def test_volunteers_follow_next_cursor_with_search(self):
+        make_volunteers(5, prefix="alpha")
+        make_volunteers(2, prefix="beta")
+
+        rows, pages = self.collect_pages("/api/admin/volunteers/?page_size=2&search=alpha")
+
+        self.assertEqual(pages, 3)
+        self.assertEqual([r["username"] for r in rows], [f"alpha{i}" for i in range(5)])
+
+    def test_events_ordered_by_date_and_time(self):
+        for day in (3, 1, 2):
+            Event.objects.create(title=f"Event {day}", description="", date=date(2025, 1, day))
+
+        rows, _ = self.collect_pages("/api/events/list/?page_size=2")
+
+        self.assertEqual([r["title"] for r in rows], ["Event 1", "Event 2", "Event 3"])
+
+    def test_attendance_latest_first(self):
+        volunteer = make_volunteers(1)[0]
+        for i in range(3):
+            AttendanceRecord.objects.create(volunteer=volunteer, topic=f"Topic {i}", online_hours=1)
+        self.client.force_authenticate(volunteer)
+
+        rows, _ = self.collect_pages("/api/volunteer/attendance/?page_size=2")
+
+        self.assertEqual([r["topic"] for r in rows], ["Topic 2", "Topic 1", "Topic 0"])
+
+
+class VolunteerStatsTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.volunteer = make_volunteers(1)[0]
+        self.event = Event.objects.create(title="Cleanup", description="Beach", date=date(2025, 1, 1))
+
+    def assign(self, hours):
+        return self.client.post("/api/assign_hours/", {
+            "volunteer": "vol0", "event": "Cleanup", "event_date": "2025-01-01", "hours": hours,
+        }, format="json")
+
+    def stats(self):
+        return VolunteerStats.objects.get(volunteer=self.volunteer)
+
+    def test_writes_keep_rollup_in_step(self):
+        self.assertEqual(self.assign(4).status_code, 201)
+        self.assign(6)  # update, not a second event
+        self.client.post("/api/admin/attendance/mark/", {
+            "topic": "Orientation", "volunteer_hours": {"vol0": 1.5},
+        }, format="json")
+
+        stats = self.stats()
+        self.assertEqual((stats.event_hours, stats.event_count), (6, 1))
+        self.assertEqual((stats.online_hours, stats.meeting_count), (Decimal("1.50"), 1))
+
+        summary = self.client.get("/api/admin/hours/summary/").data
+        self.assertEqual(summary[0]["total_hours"], 6)
+        self.assertEqual(summary[0]["online_hours"], 1.5)
+
+        self.client.delete("/api/events/delete_event/?event_name=Cleanup&event_date=2025-01-01")
+        stats = self.stats()
+        self.assertEqual((stats.event_hours, stats.event_count), (0, 0))
+        call_command("rebuild_volunteer_stats", "--verify", stdout=StringIO())
+
+    def test_invalid_attendance_value_writes_nothing(self):
+        make_volunteers(1, prefix="other")
+        response = self.client.post("/api/admin/attendance/mark/", {
+            "topic": "Orientation", "volunteer_hours": {"vol0": 2, "other0": "lots"},
+        }, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(AttendanceRecord.objects.exists())
+        self.assertFalse(VolunteerStats.objects.exists())
+
+    def test_verify_detects_drift_and_rebuild_fixes_it(self):
+        VolunteerHours.objects.create(volunteer=self.volunteer, event=self.event, hours=3)  # bypasses the rollup
+
+        with self.assertRaises(CommandError):
+            call_command("rebuild_volunteer_stats", "--verify", stdout=StringIO())
+
+        call_command("rebuild_volunteer_stats", stdout=StringIO())
+        self.assertEqual(self.stats().event_hours, 3)
+        call_command("rebuild_volunteer_stats", "--verify", stdout=StringIO())
+
+    def test_every_delete_path_settles_the_rollup(self):
+        self.assign(4)
+        VolunteerHours.objects.get().delete()
+        self.assertEqual((self.stats().event_hours, self.stats().event_count), (0, 0))
+
+        self.assign(4)
+        Event.objects.get().delete()  # not the bulk delete endpoint: the receiver settles the rollup either way
+        self.assertEqual((self.stats().event_hours, self.stats().event_count), (0, 0))
+        self.assertEqual(diff_stats(), {})
+
+    def test_direct_row_deletes_keep_caches_analytics_and_feed_in_step(self):
+        self.assign(4)
+        self.client.post("/api/admin/attendance/mark/", {
+            "topic": "Orientation", "volunteer_hours": {"vol0": 1.5},
+        }, format="json")
+        hours = VolunteerHours.objects.get()
+        RollupDirtyDay.objects.all().delete()
+
+        hours.delete()
+        AttendanceRecord.objects.filter(volunteer=self.volunteer).delete()
+
+        stats = self.stats()
+        self.assertEqual((stats.event_hours, stats.event_count, stats.online_hours, stats.meeting_count), (0, 0, 0, 0))
+        self.assertEqual(diff_stats(), {})
+        self.assertEqual(set(Tombstone.objects.values_list("model", flat=True)), {"hours", "attendance"})
+        self.assertIn(date(2025, 1, 1), RollupDirtyDay.objects.values_list("day", flat=True))
+
+    def test_cascades_keep_the_fast_delete_path(self):
+        # Any delete receiver on these models would make Django load and signal every cascaded row
+        collector = Collector(using="default")
+        self.assertTrue(collector.can_fast_delete(VolunteerHours.objects.all()))
+        self.assertTrue(collector.can_fast_delete(AttendanceRecord.objects.all()))
+
+
+class MarkAttendanceBulkTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def mark(self, volunteer_hours, **headers):
+        return self.client.post("/api/admin/attendance/mark/", {
+            "topic": "Orientation", "volunteer_hours": volunteer_hours,
+        }, format="json", headers=headers)
+
+    def test_reports_unknown_and_staff_usernames(self):
+        make_volunteers(2)
+        response = self.mark({"vol0": 1, "vol1": 2, "ghost": 1, "admin": 3})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["records_created"], 2)
+        self.assertEqual(response.data["unknown_usernames"], ["admin", "ghost"])
+        self.assertEqual(AttendanceRecord.objects.count(), 2)
+
+    def test_idempotency_key_prevents_double_logging(self):
+        make_volunteers(1)
+        first = self.mark({"vol0": 2}, **{"Idempotency-Key": "session-42"})
+        retry = self.mark({"vol0": 2}, **{"Idempotency-Key": "session-42"})
+
+        self.assertFalse(first.data["replayed"])
+        self.assertTrue(retry.data["replayed"])
+        self.assertEqual(retry.data["records_created"], 1)
+        self.assertEqual(AttendanceRecord.objects.count(), 1)
+        self.assertEqual(AttendanceSubmission.objects.count(), 1)
+        self.assertEqual(VolunteerStats.objects.get().online_hours, Decimal("2.00"))
+
+    def test_rejects_non_finite_negative_and_oversized_hours(self):
+        make_volunteers(1)
+        for hours in ("nan", "inf", -1, 1000, "999.999", True):
+            response = self.mark({"vol0": hours})
+            self.assertEqual(response.status_code, 400, hours)
+            self.assertEqual(response.data["error"], "Invalid hours for vol0.")
+        self.assertEqual(AttendanceRecord.objects.count(), 0)
+
+        self.assertEqual(self.mark({"vol0": "999.99"}).status_code, 200)
+        self.assertEqual(VolunteerStats.objects.get().online_hours, Decimal("999.99"))
+
+    def statements_for(self, count, prefix):
+        User.objects.bulk_create([User(username=f"{prefix}{i}", password="!") for i in range(count)])
+        with CaptureQueriesContext(connection) as queries:
+            response = self.mark({f"{prefix}{i}": 1.5 for i in range(count)})
+        self.assertEqual(response.data["records_created"], count)
+        return [q["sql"] for q in queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+
+    def test_statement_count_is_flat_for_large_sessions(self):
+        # user lookup, record insert, stats insert, stats update
+        self.assertEqual(len(self.statements_for(5, "small")), 4)
+        self.assertEqual(len(self.statements_for(150, "large")), 4)
+
+
+class AssignHoursBatchTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.volunteers = make_volunteers(3)
+        self.event = Event.objects.create(title="Cleanup", description="Beach", date=date(2025, 1, 1))
+
+    def test_upserts_links_and_reports_bad_rows(self):
+        VolunteerHours.objects.create(volunteer=self.volunteers[0], event=self.event, hours=1)
+        call_command("rebuild_volunteer_stats", stdout=StringIO())
+
+        response = self.client.post("/api/assign_hours/batch/", {"entries": [
+            {"volunteer": "vol0", "event": "Cleanup", "event_date": "2025-01-01", "hours": 4},
+            {"volunteer": "vol1", "event": "Cleanup", "event_date": "2025-01-01", "hours": 2},
+            {"volunteer": "ghost", "event": "Cleanup", "event_date": "2025-01-01", "hours": 2},
+            {"volunteer": "vol2", "event": "Missing", "event_date": "2025-01-01", "hours": 2},
+            {"volunteer": "vol2", "event": "Cleanup", "event_date": "2025-01-01", "hours": "lots"},
+            {"volunteer": "vol1", "event": "Cleanup", "event_date": "2025-01-01", "hours": 9},
+        ]}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["created"], response.data["updated"]), (1, 1))
+        self.assertEqual([e["row"] for e in response.data["errors"]], [2, 3, 4, 5])
+        self.assertEqual(
+            dict(VolunteerHours.objects.values_list("volunteer__username", "hours")),
+            {"vol0": 4, "vol1": 2},
+        )
+        self.assertEqual(set(self.event.volunteers.values_list("username", flat=True)), {"vol0", "vol1"})
+        call_command("rebuild_volunteer_stats", "--verify", stdout=StringIO())
+
+    def test_rejects_truncated_boolean_and_oversized_hours(self):
+        response = self.client.post("/api/assign_hours/batch/", {"entries": [
+            {"volunteer": "vol0", "event": "Cleanup", "event_date": "2025-01-01", "hours": 2.7},
+            {"volunteer": "vol0", "event": "Cleanup", "event_date": "2025-01-01", "hours": True},
+            {"volunteer": "vol0", "event": "Cleanup", "event_date": "2025-01-01", "hours": 2147483648},
+            {"volunteer": "vol1", "event": "Cleanup", "event_date": "2025-01-01", "hours": 3.0},
+        ]}, format="json")
+
+        self.assertEqual([e["row"] for e in response.data["errors"]], [0, 1, 2])
+        self.assertEqual(response.data["created"], 1)
+        self.assertEqual(VolunteerStats.objects.get(volunteer=self.volunteers[1]).event_hours, 3)
+
+    def test_new_pairs_are_counted_under_the_event_lock(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post("/api/assign_hours/batch/", {"entries": [
+                {"volunteer": "vol0", "event": "Cleanup", "event_date": "2025-01-01", "hours": 2},
+            ]}, format="json")
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        locked = next(i for i, sql in enumerate(selects) if '"volunteers_event"."id" IN' in sql)
+        self.assertLess(locked, next(i for i, sql in enumerate(selects) if "volunteers_volunteerhours" in sql))
+
+    def test_csv_upload(self):
+        csv_file = SimpleUploadedFile(
+            "hours.csv",
+            b"volunteer,event,event_date,hours\nvol0,Cleanup,2025-01-01,3\nvol1,Cleanup,2025-01-01,5\n",
+            content_type="text/csv",
+        )
+        response = self.client.post("/api/assign_hours/batch/", {"file": csv_file}, format="multipart")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(VolunteerStats.objects.get(volunteer=self.volunteers[1]).event_hours, 5)
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.volunteers = make_volunteers(2)
+        Event.objects.create(title="Cleanup", description="", date=date(2025, 1, 1))
+        late = Event.objects.create(title="Food Drive", description="", date=date(2025, 6, 1))
+        self.client.post("/api/assign_hours/batch/", {"entries": [
+            {"volunteer": "vol0", "event": "Cleanup", "event_date": "2025-01-01", "hours": 3},
+            {"volunteer": "vol0", "event": "Food Drive", "event_date": "2025-06-01", "hours": 4},
+        ]}, format="json")
+        self.late = late
+
+    def export(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_hours_csv_matches_summary(self):
+        body = self.export("/api/admin/export/hours/")
+        self.assertEqual(body.splitlines(), [
+            "id,username,email,total_hours",
+            f"{self.volunteers[0].id},vol0,vol0@example.com,7",
+            f"{self.volunteers[1].id},vol1,vol1@example.com,0",
+        ])
+
+    def test_date_range_and_event_filters_ndjson(self):
+        body = self.export("/api/admin/export/hours/?output=ndjson&start=2025-03-01")
+        self.assertEqual(body, f'{{"id": {self.volunteers[0].id}, "username": "vol0", "email": "vol0@example.com", "total_hours": 4}}\n')
+
+        body = self.export(f"/api/admin/export/attendance/?output=ndjson&event={self.late.id}")
+        self.assertEqual(len(body.splitlines()), 1)
+        self.assertIn('"event": "Food Drive"', body)
+
+    def test_rejects_bad_filters(self):
+        self.assertEqual(self.client.get("/api/admin/export/hours/?start=yesterday").status_code, 400)
+        self.assertEqual(self.client.get("/api/admin/export/nope/").status_code, 400)
+        self.assertEqual(self.client.get("/api/admin/export/meetings/?start=2025-01-01").status_code, 400)
+        self.assertEqual(self.client.get(f"/api/admin/export/meetings/?event={self.late.id}").status_code, 400)
+        self.assertEqual(self.client.get("/api/admin/export/meetings/").status_code, 200)
+
+
+class QueryPlanTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        volunteers = make_volunteers(20)
+        for day in range(1, 21):
+            event = Event.objects.create(title=f"Event {day}", description="", date=date(2025, 1, day))
+            VolunteerHours.objects.create(volunteer=volunteers[day - 1], event=event, hours=day)
+            AttendanceRecord.objects.create(volunteer=volunteers[day - 1], topic="Weekly", online_hours=1)
+            event.volunteers.add(volunteers[day - 1])
+
+        self.assertEqual(sequential_scans(), {})
+
+
+class CachedTokenAuthenticationTests(TestCase):
+    def setUp(self):
+        caches["auth_tokens"].clear()
+        auth_counters.reset()
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.volunteer = make_volunteers(1)[0]
+        self.token = Token.objects.create(user=self.volunteer)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def get_attendance(self):
+        return self.client.get("/api/volunteer/attendance/")
+
+    def test_second_request_skips_token_query(self):
+        self.assertEqual(self.get_attendance().status_code, 200)
+        with self.assertNumQueries(1):  # only the attendance query itself
+            self.assertEqual(self.get_attendance().status_code, 200)
+        self.assertEqual(auth_counters.snapshot()["hits"], 1)
+        self.assertEqual(auth_counters.snapshot()["misses"], 1)
+
+    def test_invalidated_by_password_reset(self):
+        self.get_attendance()
+        admin_client = APIClient()
+        admin_client.force_authenticate(self.admin)
+        admin_client.post("/api/admin/reset-password/", {"username": "vol0", "new_password": "n3w-pass!"})
+
+        self.get_attendance()
+        self.assertEqual(auth_counters.snapshot()["misses"], 2)
+
+    def test_deactivation_and_token_deletion_take_effect(self):
+        self.get_attendance()
+        self.volunteer.is_active = False
+        self.volunteer.save()
+        self.assertEqual(self.get_attendance().status_code, 401)
+
+        self.volunteer.is_active = True
+        self.volunteer.save()
+        self.assertEqual(self.get_attendance().status_code, 200)
+        self.token.delete()
+        self.assertEqual(self.get_attendance().status_code, 401)
+
+    def test_deactivation_takes_effect_after_lru_eviction(self):
+        # A tiny LRU, churned by other entries between hits: only what the hits read stays cached
+        tiny = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tiny-auth",
+                "OPTIONS": {"MAX_ENTRIES": 4, "CULL_FREQUENCY": 4}}
+        with override_settings(CACHES={**settings.CACHES, "auth_tokens": tiny}):
+            self.get_attendance()
+            for i in range(10):
+                caches["auth_tokens"].set(f"filler:{i}", i)
+                self.assertEqual(self.get_attendance().status_code, 200)
+            self.assertEqual(auth_counters.snapshot()["hits"], 10)
+
+            self.volunteer.is_active = False
+            self.volunteer.save()
+            self.assertEqual(self.get_attendance().status_code, 401)
+
+
+class ProfileCacheTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(self.admin)
+        self.volunteer = make_volunteers(1)[0]
+        self.client = APIClient()
+        self.client.force_authenticate(self.volunteer)
+        Event.objects.create(title="Cleanup", description="", date=date(2099, 1, 1))
+
+    def profile(self):
+        return self.client.get("/api/volunteer/profile/").data
+
+    def test_hit_runs_no_sql(self):
+        first = self.profile()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.profile(), first)
+
+    def test_writes_invalidate(self):
+        self.profile()
+
+        self.admin_client.post("/api/assign_hours/", {
+            "volunteer": "vol0", "event": "Cleanup", "event_date": "2099-01-01", "hours": 4,
+        }, format="json")
+        data = self.profile()
+        self.assertEqual(data["hours_worked"], 4)
+        self.assertEqual([e["title"] for e in data["events_attended"]], ["Cleanup"])
+
+        self.admin_client.post("/api/admin/attendance/mark/", {
+            "topic": "Orientation", "volunteer_hours": {"vol0": 2},
+        }, format="json")
+        self.assertEqual(self.profile()["attendance"], [{"topic": "Orientation", "hours": 2.0}])
+
+        Event.objects.create(title="Food Drive", description="", date=date(2099, 2, 1))
+        self.assertEqual(len(self.profile()["upcoming_events"]), 2)
+
+        self.volunteer.profile.phone_number = "555-1234"
+        self.volunteer.profile.save()
+        self.assertEqual(self.profile()["phone_number"], "555-1234")
+
+    def test_stats_rebuild_invalidates(self):
+        self.admin_client.post("/api/assign_hours/", {
+            "volunteer": "vol0", "event": "Cleanup", "event_date": "2099-01-01", "hours": 4,
+        }, format="json")
+        self.assertEqual(self.profile()["hours_worked"], 4)
+
+        VolunteerHours.objects.update(hours=9)  # no signals, so the rollup and the cache drift
+        call_command("rebuild_volunteer_stats", stdout=StringIO())
+        self.assertEqual(self.profile()["hours_worked"], 9)
+
+
+class SharedEventCacheTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.volunteer = make_volunteers(1)[0]
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.event = Event.objects.create(title="Cleanup", description="", date=date(2099, 1, 1))
+
+    def test_event_list_cached_and_invalidated_by_roster_changes(self):
+        first = self.client.get("/api/events/list/").data
+        self.assertEqual(first[0]["title"], "Cleanup")
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get("/api/events/list/").data, first)
+
+        self.event.volunteers.add(self.volunteer)
+        self.assertEqual(self.client.get("/api/events/list/").data[0]["volunteers"], ["vol0"])
+
+        self.event.title = "Beach Cleanup"
+        self.event.save()
+        self.assertEqual(self.client.get("/api/events/list/").data[0]["title"], "Beach Cleanup")
+
+        self.volunteer.last_login = timezone.now()
+        self.volunteer.save(update_fields=["last_login"])
+        with self.assertNumQueries(0):  # not a rename, so the shared list stays cached
+            self.client.get("/api/events/list/")
+
+        self.volunteer.username = "renamed"
+        self.volunteer.save()
+        self.assertEqual(self.client.get("/api/events/list/").data[0]["volunteers"], ["renamed"])
+
+        self.volunteer.delete()
+        self.assertEqual(self.client.get("/api/events/list/").data[0]["volunteers"], [])
+
+    def test_expiry_under_load_recomputes_once(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.2)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cached_versioned("herd", ("events",), compute, 60)))
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(results, ["value"] * 8)
+        self.assertEqual(len(calls), 1)
+
+
+class ConnectionPoolingTests(TestCase):
+    def load_settings(self, **env):
+        # Only the DB_* variables given here, whatever the caller's environment sets
+        environ = {k: v for k, v in os.environ.items() if not k.startswith("DB_")} | env
+        with mock.patch.dict(os.environ, environ, clear=True):
+            return runpy.run_path(str(Path(settings.BASE_DIR) / "volunteer_management" / "settings.py"))
+
+    def test_mode_is_read_from_environment(self):
+        persistent = self.load_settings(DB_CONN_MODE="persistent", DB_CONN_MAX_AGE="120")["DATABASES"]["default"]
+        self.assertEqual(persistent["CONN_MAX_AGE"], 120)
+        self.assertTrue(persistent["CONN_HEALTH_CHECKS"])
+
+        pooled = self.load_settings(DB_CONN_MODE="pool", DB_POOL_MAX_SIZE="25")["DATABASES"]["default"]
+        self.assertEqual(pooled["OPTIONS"]["pool"]["max_size"], 25)
+        self.assertNotIn("CONN_MAX_AGE", pooled)
+
+        sqlite = self.load_settings(DB_ENGINE="sqlite", DB_CONN_MODE="pool")["DATABASES"]["default"]
+        self.assertNotIn("OPTIONS", sqlite)
+
+    def test_metrics_endpoint(self):
+        admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        db_metrics.counters.reset()
+        self.client.get("/api/admin/db-pool/")
+        data = self.client.get("/api/admin/db-pool/").json()
+
+        self.assertEqual(data["vendor"], connection.vendor)
+        self.assertEqual(data["requests"], 2)
+        self.assertEqual(data["connects"], 0)  # the test connection stays open across requests
+        self.assertIsNone(data["pool"])
+
+
+class RequestMetricsTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        request_registry.reset()
+        make_volunteers(3)
+        admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def test_per_view_prometheus_metrics(self):
+        with self.settings(DEBUG=True):
+            per_request = int(self.client.get("/api/admin/volunteers/")["X-Query-Count"])
+        self.client.get("/api/admin/volunteers/")
+
+        response = self.client.get("/api/admin/metrics/")
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        text = response.content.decode()
+        self.assertIn('volunteer_http_request_duration_seconds_count{view="volunteers"} 2', text)
+        self.assertIn('volunteer_http_request_duration_seconds_bucket{view="volunteers",le="+Inf"} 2', text)
+        self.assertGreater(per_request, 0)
+        self.assertIn(f'volunteer_http_sql_queries_total{{view="volunteers"}} {2 * per_request}', text)
+        self.assertNotIn('view="request_metrics"', text)  # recorded after its own response is built
+
+    @override_settings(DEBUG=True)
+    def test_debug_headers(self):
+        response = self.client.get("/api/admin/volunteers/")
+        self.assertGreater(int(response["X-Query-Count"]), 0)
+        self.assertIn("X-Response-Time-ms", response)
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_slow_queries_logged_with_origin(self):
+        with self.assertLogs("volunteers.slow_queries", level="WARNING") as logs:
+            self.client.get("/api/admin/volunteers/")
+        self.assertIn("volunteers/", logs.output[0])
+
+
+class SeedAndBenchmarkTests(TransactionTestCase):
+    # No wrapping transaction, so atomic blocks issue the same statements as in production
+    def test_seed_builds_consistent_dataset(self):
+        out = StringIO()
+        call_command("seed_volunteers", volunteers=30, events=5, roster_size=4, meetings=2, prefix="t", stdout=out)
+
+        self.assertEqual(User.objects.filter(username__startswith="t_", is_staff=False).count(), 30)
+        self.assertEqual(VolunteerHours.objects.count(), 20)
+        self.assertEqual(Event.volunteers.through.objects.count(), 20)
+        self.assertEqual(AttendanceRecord.objects.count(), 60)
+        self.assertEqual(Token.objects.count(), 31)
+        self.assertEqual(diff_stats(), {})
+        with self.assertRaises(CommandError):
+            call_command("seed_volunteers", volunteers=1, prefix="t", stdout=out)
+
+    def test_every_route_is_benchmarked_within_budget(self):
+        self.assertEqual(uncovered_routes(), [])
+        with tempfile.TemporaryDirectory() as files, override_settings(JOB_FILES_DIR=files):
+            results = run_suite([20, 60], repeat=1)
+        self.assertEqual([(r["case"], r["failures"]) for r in results if r["failures"]], [])
+
+
+class LoggingPipelineTests(TestCase):
+    def test_background_writer_emits_json_lines(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "app.log")
+            handler = QueuedLogHandler(path)
+            handler.setFormatter(JsonFormatter())
+            logger = logging.getLogger("volunteers.tests.pipeline")
+            logger.addHandler(handler)
+            try:
+                logger.warning("hello %s", "world", extra={"request_id": "abc"})
+                try:
+                    1 / 0
+                except ZeroDivisionError:
+                    logger.exception("boom")
+            finally:
+                logger.removeHandler(handler)
+                handler.close()  # drains the queue
+
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([r["message"] for r in records], ["hello world", "boom"])
+        self.assertEqual(records[0]["request_id"], "abc")
+        self.assertIn("ZeroDivisionError", records[1]["exc_info"])
+
+    def test_file_is_reopened_after_external_rotation(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "app.log")
+            handler = QueuedLogHandler(path)
+            logger = logging.getLogger("volunteers.tests.pipeline")
+            logger.addHandler(handler)
+            try:
+                logger.warning("before")
+                handler.listener.stop()  # drain, then rotate the way logrotate does
+                handler.listener.start()
+                os.rename(path, path + ".1")
+                logger.warning("after")
+            finally:
+                logger.removeHandler(handler)
+                handler.close()
+
+            with open(path + ".1") as f:
+                self.assertEqual(f.read().splitlines(), ["before"])
+            with open(path) as f:
+                self.assertEqual(f.read().splitlines(), ["after"])
+
+    def test_defaults_to_stderr(self):
+        handler = QueuedLogHandler()
+        try:
+            self.assertIsInstance(handler.target, logging.StreamHandler)
+            self.assertIs(handler.target.stream, sys.stderr)
+        finally:
+            handler.close()
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            handler = QueuedLogHandler(os.path.join(tmp, "app.log"), queue_size=1)
+            handler.listener.stop()  # nothing drains the queue now
+            record = logging.makeLogRecord({"msg": "x"})
+            handler.emit(record)
+            handler.emit(record)
+            self.assertEqual(handler.dropped, 1)
+            handler.listener = None
+            handler.target.close()
+
+    def test_sampling_filter(self):
+        record = logging.makeLogRecord({"msg": "x"})
+        self.assertFalse(SamplingFilter(0).filter(record))
+        self.assertTrue(SamplingFilter(1).filter(record))
+        kept = sum(SamplingFilter(0.5).filter(record) for _ in range(2000))
+        self.assertTrue(800 < kept < 1200)
+
+
+class WriteAmplificationTests(TestCase):
+    def capture_writes(self):
+        statements = []
+
+        def record(execute, sql, params, many, context):
+            if sql.lstrip().split(None, 1)[0].upper() in ("INSERT", "UPDATE", "DELETE"):
+                statements.append(sql.split(None, 3)[:3])
+            return execute(sql, params, many, context)
+
+        return statements, lambda: connection.execute_wrapper(record)
+
+    def test_registration_is_three_inserts(self):
+        writes, wrapper = self.capture_writes()
+        with wrapper():
+            response = self.client.post("/register/", {
+                "username": "newbie", "password": "pass12345", "email": "NEW@EXAMPLE.com", "phone_number": "555-0001",
+            }, content_type="application/json")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([w[0] for w in writes], ["INSERT"] * 3)
+
+        user = User.objects.get(username="newbie")
+        self.assertEqual(user.profile.phone_number, "555-0001")
+        self.assertEqual(user.email, "NEW@example.com")
+        self.assertTrue(user.check_password("pass12345"))
+        self.assertTrue(Token.objects.filter(user=user).exists())
+
+    def test_login_does_not_rewrite_profile(self):
+        User.objects.create_user(username="vol", password="pass12345")
+
+        writes, wrapper = self.capture_writes()
+        with wrapper():
+            self.client.post("/token/", {"username": "vol", "password": "pass12345"}, content_type="application/json")
+        self.assertEqual(len(writes), 1)  # the token, on first login only
+        writes.clear()
+        with wrapper():
+            self.client.post("/token/", {"username": "vol", "password": "pass12345"}, content_type="application/json")
+            self.client.login(username="vol", password="pass12345")  # session login updates last_login
+        self.assertTrue(all("volunteers_userprofile" not in " ".join(w) for w in writes), writes)
+
+    def test_profile_saved_only_when_changed(self):
+        user = User.objects.create_user(username="vol", password="pass12345")
+        user = User.objects.select_related("profile").get(pk=user.pk)
+
+        writes, wrapper = self.capture_writes()
+        with wrapper():
+            user.save()
+        self.assertEqual([" ".join(w) for w in writes if "userprofile" in " ".join(w)], [])
+
+        user.profile.phone_number = "555-0002"
+        with wrapper():
+            user.save()
+        self.assertEqual(UserProfile.objects.get(user=user).phone_number, "555-0002")
+
+
+class VolunteerImportTests(TestCase):
+    def setUp(self):
+        User.objects.create_user(username="taken", password="pass12345")
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_csv_import_reports_duplicates_and_creates_the_rest(self):
+        csv_text = (
+            "username,email,password,phone_number\n"
+            "asha,asha@example.org,pass-asha-1,555-0101\n"
+            "taken,t@example.org,pass-x,\n"
+            "ben,not-an-email,pass-ben-1,\n"
+            "asha,again@example.org,pass-asha-2,\n"
+            "carmen,,,\n"
+        )
+        upload = SimpleUploadedFile("cohort.csv", csv_text.encode(), content_type="text/csv")
+        writes = []
+
+        def record(execute, sql, params, many, context):
+            if sql.startswith("INSERT"):
+                writes.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            response = self.client.post("/api/admin/volunteers/import/", {"file": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(
+            [(e["row"], e["username"]) for e in response.data["errors"]], [(1, "taken"), (2, "ben"), (3, "asha")]
+        )
+        self.assertEqual(len(writes), 3)  # users, profiles, tokens: one bulk INSERT each
+
+        asha = User.objects.get(username="asha")
+        self.assertTrue(asha.check_password("pass-asha-1"))
+        self.assertEqual(asha.profile.phone_number, "555-0101")
+        self.assertTrue(Token.objects.filter(user=asha).exists())
+        self.assertFalse(User.objects.get(username="carmen").has_usable_password())
+
+    def test_api_never_starts_a_process_pool(self):
+        rows = [{"username": f"small{i}", "password": f"pw-{i}"} for i in range(PARALLEL_THRESHOLD)]
+        with mock.patch("volunteers.imports.ProcessPoolExecutor") as pool:
+            response = self.client.post("/api/admin/volunteers/import/", {"volunteers": rows}, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["created"], PARALLEL_THRESHOLD)
+        pool.assert_not_called()
+
+    def test_large_imports_run_as_a_job(self):
+        rows = [{"username": f"big{i}", "password": f"pw-{i}"} for i in range(SYNC_IMPORT_ROWS + 1)]
+        rows[-1]["username"] = "taken"
+        with mock.patch("volunteers.imports._hash", side_effect=lambda password: f"hashed:{password}"):
+            response = self.client.post("/api/admin/volunteers/import/", {"volunteers": rows}, format="json")
+            self.assertEqual(response.status_code, 202)
+            self.assertFalse(User.objects.filter(username="big0").exists())
+
+            self.assertEqual(jobs.run_pending(), 1)
+
+        job = Job.objects.get(pk=response.data["job_id"])
+        self.assertEqual(job.status, Job.SUCCEEDED)
+        self.assertEqual(job.result["created"], SYNC_IMPORT_ROWS)
+        self.assertEqual([e["username"] for e in job.result["errors"]], ["taken"])
+        self.assertEqual(User.objects.get(username="big7").password, "hashed:pw-7")
+        # Plaintext passwords do not outlive the import
+        self.assertEqual({row["password"] for row in job.payload["rows"]}, {""})
+
+    def test_command_hashes_in_process_pool(self):
+        rows = "username,password\n" + "".join(f"cohort{i},pw-{i}\n" for i in range(PARALLEL_THRESHOLD))
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False) as fh:
+            fh.write(rows)
+        try:
+            out = StringIO()
+            call_command("import_volunteers", fh.name, workers=2, stdout=out)
+        finally:
+            os.unlink(fh.name)
+
+        self.assertIn(f"Imported {PARALLEL_THRESHOLD} volunteer(s)", out.getvalue())
+        self.assertTrue(User.objects.get(username="cohort7").check_password("pw-7"))
+        self.assertEqual(UserProfile.objects.filter(user__username__startswith="cohort").count(), PARALLEL_THRESHOLD)
+
+
+class EventRosterQueryTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.volunteers = make_volunteers(60)
+        admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def create_event(self, volunteers):
+        return self.client.post("/api/events/", {
+            "title": "Cleanup", "description": "Beach", "date": "2099-01-01", "volunteers": volunteers,
+        }, format="json")
+
+    def test_roster_resolved_with_one_query(self):
+        names = [v.username for v in self.volunteers]
+        lookups = []
+
+        def record(execute, sql, params, many, context):
+            # username lookups; the roster set() and the response read go through the join table
+            if sql.startswith("SELECT") and 'FROM "auth_user" WHERE' in sql:
+                lookups.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            response = self.create_event(names + names[:5])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["volunteers"], names)
+        self.assertEqual(len(lookups), 1)
+
+    def test_unknown_usernames_are_listed(self):
+        response = self.create_event(["vol0", "ghost", "vol1", "nobody"])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["volunteers"], ["Unknown username(s): ghost, nobody"])
+        self.assertFalse(Event.objects.exists())
+
+    def test_event_lists_prefetch_rosters(self):
+        for i in range(5):
+            event = Event.objects.create(title=f"Event {i}", description="", date=date(2099, 1, i + 1))
+            event.volunteers.set(self.volunteers[i * 10:(i + 1) * 10])
+
+        with self.assertNumQueries(2):
+            data = self.client.get("/api/events/").data
+        self.assertEqual(data[0]["volunteers"], [v.username for v in self.volunteers[:10]])
+        with self.assertNumQueries(2):
+            self.client.get("/api/events/list/", {"search": "event"})
+
+
+class LeaderboardTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.volunteers = make_volunteers(8)
+        # total hours: vol0 5.5, vol1 and vol2 tied on 10, then 30, 40, ... up to vol7 with 70
+        for v, hours in zip(self.volunteers, (5, 10, 10, 30, 40, 50, 60, 70)):
+            VolunteerStats.objects.create(
+                volunteer=v, event_hours=hours, online_hours=Decimal("0.5") if hours == 5 else Decimal("0")
+            )
+        admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        VolunteerStats.objects.create(volunteer=admin, event_hours=999)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def ranks(self, **params):
+        response = self.client.get("/api/admin/leaderboard/", params)
+        return [(r["username"], r["rank"]) for r in response.data["results"]]
+
+    def test_top_n_ranks_with_ties_and_skips_staff(self):
+        self.assertEqual(self.ranks(limit=3), [("vol7", 1), ("vol6", 2), ("vol5", 3)])
+        self.assertEqual(self.ranks(limit=8)[-3:], [("vol1", 6), ("vol2", 6), ("vol0", 8)])
+        first = self.client.get("/api/admin/leaderboard/", {"limit": 1}).data["results"][0]
+        self.assertEqual(first["total_hours"], 70.0)
+
+    def test_page_around_volunteer(self):
+        self.assertEqual(self.ranks(around="vol3", size=1), [("vol4", 4), ("vol3", 5), ("vol1", 6), ("vol2", 6)])
+        self.assertEqual(self.client.get("/api/admin/leaderboard/", {"around": "nobody"}).status_code, 404)
+
+    def test_unknown_around_adds_no_cache_entries(self):
+        with mock.patch("volunteers.leaderboard.cached_versioned") as cached:
+            for n in range(3):
+                response = self.client.get("/api/admin/leaderboard/", {"around": f"nobody{n}"})
+                self.assertEqual(response.status_code, 404)
+        cached.assert_not_called()
+
+        with mock.patch("volunteers.leaderboard.cached_versioned", wraps=cached_versioned) as cached:
+            self.ranks(around="vol3", size=1)
+        self.assertEqual(cached.call_args.args[0], f"leaderboard:None:None:{self.volunteers[3].pk}:1")
+
+    def test_period_ranks_event_hours_in_range(self):
+        event = Event.objects.create(title="Cleanup", description="", date=date.today())
+        old = Event.objects.create(title="Old", description="", date=date(2000, 1, 1))
+        VolunteerHours.objects.create(volunteer=self.volunteers[0], event=event, hours=3)
+        VolunteerHours.objects.create(volunteer=self.volunteers[1], event=event, hours=2)
+        VolunteerHours.objects.create(volunteer=self.volunteers[1], event=old, hours=50)
+
+        data = self.client.get("/api/admin/leaderboard/", {"period": "week"}).data
+        self.assertFalse(data["includes_online_hours"])
+        self.assertEqual([(r["username"], r["total_hours"]) for r in data["results"]], [("vol0", 3.0), ("vol1", 2.0)])
+        self.assertEqual(self.client.get("/api/admin/leaderboard/", {"period": "decade"}).status_code, 400)
+
+    def test_cached_briefly(self):
+        self.ranks(limit=3)
+        with self.assertNumQueries(0):
+            self.ranks(limit=3)
+
+
+class AnalyticsRollupTests(TestCase):
+    def setUp(self):
+        self.volunteers = make_volunteers(2)
+        self.jan = Event.objects.create(title="Cleanup", description="Beach", date=date(2025, 1, 10))
+        self.feb = Event.objects.create(title="Food Drive", description="Pantry", date=date(2025, 2, 3))
+        VolunteerHours.objects.create(volunteer=self.volunteers[0], event=self.jan, hours=3)
+        VolunteerHours.objects.create(volunteer=self.volunteers[1], event=self.jan, hours=2)
+        VolunteerHours.objects.create(volunteer=self.volunteers[0], event=self.feb, hours=4)
+        self.meeting_at = timezone.make_aware(datetime(2025, 1, 10, 18, 0))
+        AttendanceRecord.objects.create(
+            volunteer=self.volunteers[0], topic="Orientation", online_hours=Decimal("1.5"), created_at=self.meeting_at
+        )
+        admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def rollup(self, dimension, key, bucket, granularity=HoursRollup.DAY):
+        row = HoursRollup.objects.filter(dimension=dimension, key=str(key), bucket=bucket, granularity=granularity).first()
+        return row and (row.event_hours, row.online_hours, row.entries)
+
+    def test_full_refresh_builds_daily_and_monthly_rollups(self):
+        analytics.refresh()
+        day = date(2025, 1, 10)
+        self.assertEqual(self.rollup("event", self.jan.id, day), (5, Decimal("0"), 2))
+        self.assertEqual(self.rollup("volunteer", self.volunteers[0].id, day), (3, Decimal("1.5"), 2))
+        self.assertEqual(self.rollup("topic", "Orientation", day), (0, Decimal("1.5"), 1))
+        self.assertEqual(self.rollup("volunteer", self.volunteers[0].id, date(2025, 2, 1), HoursRollup.MONTH), (4, Decimal("0"), 1))
+
+    @mock.patch.object(analytics, "OVERLAP", timedelta(0))
+    def test_incremental_refresh_only_recomputes_changed_days(self):
+        analytics.refresh()
+        self.assertEqual(analytics.refresh()["days"], 0)
+
+        hours = VolunteerHours.objects.get(volunteer=self.volunteers[1], event=self.jan)
+        hours.hours = 6
+        hours.save()
+        result = analytics.refresh()
+        self.assertEqual(result["days"], 1)
+        self.assertEqual(self.rollup("event", self.jan.id, date(2025, 1, 10)), (9, Decimal("0"), 2))
+        self.assertEqual(self.rollup("event", self.jan.id, date(2025, 1, 1), HoursRollup.MONTH), (9, Decimal("0"), 2))
+
+    def test_deletes_and_moved_events_are_picked_up(self):
+        analytics.refresh()
+        response = self.client.delete("/api/events/delete_event/?event_name=Food%20Drive&event_date=2025-02-03")
+        self.assertEqual(response.status_code, 200)
+        self.jan.date = date(2025, 1, 20)
+        self.jan.save()
+        analytics.refresh()
+
+        self.assertIsNone(self.rollup("volunteer", self.volunteers[0].id, date(2025, 2, 3)))
+        self.assertIsNone(self.rollup("volunteer", self.volunteers[0].id, date(2025, 2, 1), HoursRollup.MONTH))
+        self.assertEqual(self.rollup("volunteer", self.volunteers[0].id, date(2025, 1, 10)), (0, Decimal("1.5"), 1))
+        self.assertEqual(self.rollup("event", self.jan.id, date(2025, 1, 20)), (5, Decimal("0"), 2))
+
+    def test_api_serves_zero_filled_bounded_series(self):
+        analytics.refresh()
+        data = self.client.get("/api/admin/analytics/volunteer/", {
+            "granularity": "month", "start": "2024-12-01", "end": "2025-03-15", "key": self.volunteers[0].id,
+        }).data
+        self.assertEqual([(p["bucket"], p["total_hours"]) for p in data["series"]],
+                         [("2024-12-01", 0), ("2025-01-01", 4.5), ("2025-02-01", 4), ("2025-03-01", 0)])
+
+        days = self.client.get("/api/admin/analytics/event/", {"start": "2025-01-09", "end": "2025-01-11"}).data
+        self.assertEqual([p["event_hours"] for p in days["series"]], [0, 5, 0])
+        self.assertIsNotNone(days["refreshed_at"])
+
+        too_long = self.client.get("/api/admin/analytics/event/", {"start": "2020-01-01", "end": "2025-01-01"})
+        self.assertEqual(too_long.status_code, 400)
+        self.assertEqual(self.client.get("/api/admin/analytics/weather/").status_code, 400)
+
+    def test_huge_or_overflowing_ranges_are_rejected_up_front(self):
+        started = time.perf_counter()
+        for granularity in ("day", "month"):
+            for start, end in (("0001-01-01", "9000-12-31"), ("0001-01-01", "9999-12-31"), (None, "0001-01-05")):
+                response = self.client.get("/api/admin/analytics/event/", {
+                    "granularity": granularity, **({"start": start} if start else {}), "end": end,
+                })
+                self.assertEqual(response.status_code, 400, (granularity, start, end))
+        self.assertLess(time.perf_counter() - started, 1)  # nothing was generated before the check
+
+        last = self.client.get("/api/admin/analytics/event/", {"start": "9999-12-01", "end": "9999-12-31"}).data
+        self.assertEqual(last["series"][-1]["bucket"], "9999-12-31")
+
+
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.volunteer = make_volunteers(1)[0]
+        self.event = Event.objects.create(title="Cleanup", description="Beach", date=date(2099, 1, 1))
+        self.hours = VolunteerHours.objects.create(volunteer=self.volunteer, event=self.event, hours=3)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def backdate(self, *querysets):
+        # Push existing rows out of the window so only what the test does next is a change
+        earlier = timezone.now() - OVERLAP - timedelta(minutes=1)
+        for queryset in querysets:
+            queryset.update(created_at=earlier, updated_at=earlier)
+
+    def feed(self, token, **params):
+        response = self.client.get("/api/changes/", {"since": token, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data["changes"]
+
+    def test_only_the_feed_carries_event_timestamps(self):
+        public = {"id", "title", "description", "date", "time", "volunteers"}
+        self.assertEqual(set(self.client.get("/api/events/").data[0]), public)
+        self.assertEqual(set(self.client.get("/api/events/list/").data[0]), public)
+
+        changes = self.feed(make_token(timezone.now() - OVERLAP), models="event")
+        self.assertEqual(set(changes["event"]["created"][0]), public | {"created_at", "updated_at"})
+
+    def test_bootstrap_returns_a_token_only(self):
+        data = self.client.get("/api/changes/").data
+        self.assertEqual(data["changes"], {})
+        self.assertTrue(data["token"].isdigit())
+
+    def test_created_updated_and_deleted_rows(self):
+        self.backdate(Event.objects.all(), VolunteerHours.objects.all(), UserProfile.objects.all())
+        token = make_token(timezone.now() - OVERLAP)
+
+        self.hours.refresh_from_db()
+        self.hours.hours = 5
+        self.hours.save()
+        self.volunteer.profile.phone_number = "555-0000"
+        self.volunteer.save()
+        other = Event.objects.create(title="Food Drive", description="Pantry", date=date(2099, 2, 1))
+
+        changes = self.feed(token)
+        self.assertEqual([e["id"] for e in changes["event"]["created"]], [other.id])
+        self.assertEqual([(h["id"], h["hours"]) for h in changes["hours"]["updated"]], [(self.hours.id, 5)])
+        self.assertEqual([p["phone_number"] for p in changes["profile"]["updated"]], ["555-0000"])
+        self.assertEqual(changes["attendance"], {"created": [], "updated": [], "deleted": []})
+
+        response = self.client.delete("/api/events/delete_event/?event_name=Cleanup&event_date=2099-01-01")
+        self.assertEqual(response.status_code, 200)
+        changes = self.feed(token, models="event,hours")
+        self.assertEqual(changes["event"]["deleted"], [self.event.id])
+        self.assertEqual(changes["hours"]["deleted"], [self.hours.id])
+        self.assertEqual(changes["hours"]["updated"], [])
+
+    def test_roster_changes_touch_the_event(self):
+        self.backdate(Event.objects.all())
+        token = make_token(timezone.now() - OVERLAP)
+        self.event.volunteers.add(self.volunteer)
+        updated = self.feed(token, models="event")["event"]["updated"]
+        self.assertEqual([e["volunteers"] for e in updated], [[self.volunteer.username]])
+
+    def test_bad_and_expired_tokens_and_volunteer_access(self):
+        self.assertEqual(self.client.get("/api/changes/", {"since": "yesterday"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/changes/", {"since": "99999999999999999999999"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/changes/", {"since": "1"}).status_code, 410)
+
+        self.client.force_authenticate(self.volunteer)
+        self.assertEqual(self.client.get("/api/changes/", {"models": "hours"}).status_code, 400)
+        self.assertEqual(list(self.feed(make_token(timezone.now()))), ["event"])
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.volunteer = make_volunteers(1)[0]
+        self.event = Event.objects.create(title="Cleanup", description="Beach", date=date(2099, 1, 1))
+        AttendanceRecord.objects.create(volunteer=self.volunteer, topic="Orientation", online_hours=Decimal("1.5"))
+        self.client = APIClient()
+        self.client.force_authenticate(self.volunteer)
+        self.admin_client = APIClient()
+        self.admin_client.force_authenticate(User.objects.create_user(username="admin", password="pass12345", is_staff=True))
+
+    def revalidate(self, path):
+        client = self.admin_client if path.startswith("/api/events/") else self.client
+        first = client.get(path)
+        self.assertEqual(first.status_code, 200)
+        queries = []
+
+        def record(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            second = client.get(path, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(queries, [])
+        return first["ETag"]
+
+    def test_unchanged_responses_are_304_without_sql(self):
+        for path in ("/api/events/list/", "/api/volunteer/profile/", "/api/volunteer/attendance/"):
+            with self.subTest(path=path):
+                self.revalidate(path)
+
+    def test_writes_change_the_etag(self):
+        events = self.revalidate("/api/events/list/")
+        self.event.volunteers.add(self.volunteer)
+        self.assertNotEqual(self.revalidate("/api/events/list/"), events)
+
+        attendance = self.revalidate("/api/volunteer/attendance/")
+        AttendanceRecord.objects.create(volunteer=self.volunteer, topic="Safety", online_hours=Decimal("1"))
+        response = self.client.get("/api/volunteer/attendance/", HTTP_IF_NONE_MATCH=attendance)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 2)
+
+    def test_etag_depends_on_the_query(self):
+        etag = self.revalidate("/api/events/list/")
+        response = self.admin_client.get("/api/events/list/?search=clean", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class FastReadPathTests(TestCase):
+    def setUp(self):
+        self.volunteers = make_volunteers(3)
+        for i, title in enumerate(("Beach cleanup", "Food drive – weekend", "Park\u2028survey")):
+            event = Event.objects.create(title=title, description="Bring gloves", date=date(2025, 3, 1 + i))
+            event.volunteers.add(*self.volunteers[i:])
+        AttendanceRecord.objects.create(volunteer=self.volunteers[0], topic="Orientation", online_hours=Decimal("1.5"))
+        AttendanceRecord.objects.create(volunteer=self.volunteers[0], topic=None, online_hours=None)
+
+    def assertSameBytes(self, reader, serializer_class, queryset):
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        fast = reader.render(reader.values(queryset))
+        self.assertEqual(JSONRenderer().render(fast), expected)
+        self.assertEqual(ORJSONRenderer().render(fast), expected)
+
+    def test_values_reader_matches_the_serializers(self):
+        self.assertSameBytes(EVENT_READER, EventSerializer, EventSerializer.setup_eager_loading(Event.objects.all()))
+        self.assertSameBytes(ATTENDANCE_READER, AttendanceSerializer, AttendanceRecord.objects.order_by("-id"))
+
+    def test_paginated_list_uses_the_reader(self):
+        admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        page = client.get("/api/events/list/", {"page_size": 2})
+        self.assertEqual([e["title"] for e in page.data["results"]], ["Beach cleanup", "Food drive – weekend"])
+        rest = client.get(page.data["next"])
+        self.assertEqual([e["volunteers"] for e in rest.data["results"]], [["vol2"]])
+
+    def test_orjson_renderer_is_byte_compatible(self):
+        payloads = [
+            {"float": 4.5, "big": 1e16, "small": 1e-7, "huge_int": 2 ** 70},
+            {"decimal": Decimal("1.50"), "when": timezone.make_aware(datetime(2025, 1, 1, 9, 30)), "day": date(2025, 1, 1)},
+            {"text": "é \u2028 \u2029 \"quoted\"", "nested": [{"a": None, "b": True}], 1: "int key"},
+        ]
+        for data in payloads:
+            with self.subTest(data=data):
+                self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertEqual(
+            ORJSONRenderer().render({"a": [1]}, "application/json; indent=2"),
+            JSONRenderer().render({"a": [1]}, "application/json; indent=2"),
+        )
+
+    def test_orjson_parser_matches_json_parser(self):
+        for body in (b'{"hours": 1.5, "names": ["a", "\\u00e9"]}', b'{"id": 123456789012345678901234567890}'):
+            self.assertEqual(ORJSONParser().parse(io.BytesIO(body)), JSONParser().parse(io.BytesIO(body)))
+        for body in (b'{"hours": NaN}', b"{broken"):
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(io.BytesIO(body))
+
+
+class AsyncDashboardTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.volunteer = make_volunteers(1)[0]
+        self.volunteer.profile.phone_number = "555-1234"
+        self.volunteer.profile.save()
+        event = Event.objects.create(title="Cleanup", description="", date=date(2099, 1, 1))
+        event.volunteers.add(self.volunteer)
+        VolunteerHours.objects.create(volunteer=self.volunteer, event=event, hours=3)
+        record_event_hours(self.volunteer.id, 3, 1)
+        AttendanceRecord.objects.create(volunteer=self.volunteer, topic="Orientation", online_hours=Decimal("1.5"))
+        self.volunteer_token = Token.objects.create(user=self.volunteer).key
+        self.admin_token = Token.objects.create(user=self.admin).key
+
+    def sync_get(self, path, token, **params):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token}")
+        return client.get(path, params)
+
+    async def test_profile_matches_sync_view(self):
+        response = await self.async_client.get(
+            "/api/async/volunteer/profile/", headers={"Authorization": f"Token {self.volunteer_token}"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["hours_worked"], 3)
+        await caches["default"].aclear()
+        expected = await sync_to_async(self.sync_get)("/api/volunteer/profile/", self.volunteer_token)
+        self.assertEqual(response.json(), expected.json())
+
+    async def test_user_info_matches_sync_view_and_requires_admin(self):
+        response = await self.async_client.get(
+            "/api/async/user/", {"name": "VOL0"}, headers={"Authorization": f"Token {self.admin_token}"}
+        )
+        expected = await sync_to_async(self.sync_get)("/user/", self.admin_token, name="VOL0")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), expected.json())
+        self.assertEqual(response.json()["topics_attended"], ["Orientation"])
+
+        forbidden = await self.async_client.get(
+            "/api/async/user/", {"name": "vol0"}, headers={"Authorization": f"Token {self.volunteer_token}"}
+        )
+        self.assertEqual(forbidden.status_code, 403)
+        anonymous = await self.async_client.get("/api/async/user/", {"name": "vol0"})
+        self.assertEqual(anonymous.status_code, 401)
+
+
+class IndexedSearchTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def search_volunteers(self, term):
+        return [row["username"] for row in self.client.get("/api/admin/volunteers/", {"search": term}).data]
+
+    def test_prefix_matches_username_and_email_ranked(self):
+        User.objects.create_user(username="maria", email="maria@example.com")
+        User.objects.create_user(username="marius", email="m@example.com")
+        User.objects.create_user(username="bob", email="mar.bob@example.com")
+
+        self.assertEqual(self.search_volunteers("mari"), ["maria", "marius"])
+        self.assertEqual(self.search_volunteers("mar")[0], "maria")  # matches in both columns rank first
+        self.assertEqual(set(self.search_volunteers("mar")), {"maria", "marius", "bob"})
+
+    def test_index_follows_updates_and_deletes(self):
+        user = User.objects.create_user(username="oldname", email="x@example.com")
+        user.username = "newname"
+        user.save()
+        self.assertEqual(self.search_volunteers("old"), [])
+        self.assertEqual(self.search_volunteers("newn"), ["newname"])
+
+        user.delete()
+        self.assertEqual(self.search_volunteers("newn"), [])
+
+    def test_event_search_covers_description(self):
+        Event.objects.create(title="Cleanup", description="Beach litter pick", date=date(2025, 1, 1))
+        Event.objects.create(title="Food Drive", description="Pantry", date=date(2025, 1, 2))
+
+        response = self.client.get("/api/events/list/", {"search": "litt"})
+        self.assertEqual([e["title"] for e in response.data], ["Cleanup"])
+
+
+class BackgroundJobTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="pass12345", is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        files = tempfile.TemporaryDirectory()
+        self.addCleanup(files.cleanup)
+        files_setting = override_settings(JOB_FILES_DIR=files.name)
+        files_setting.enable()
+        self.addCleanup(files_setting.disable)
+
+    def test_mark_attendance_returns_202_and_worker_reports_result(self):
+        make_volunteers(2)
+        response = self.client.post("/api/admin/attendance/mark/", {
+            "topic": "Orientation", "volunteer_hours": {"vol0": 1, "vol1": 2, "ghost": 1},
+        }, format="json", headers={"Prefer": "respond-async"})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response["Location"], f"/api/admin/jobs/{response.data['job_id']}/")
+        self.assertEqual(AttendanceRecord.objects.count(), 0)
+        self.assertEqual(jobs.run_pending(), 1)
+
+        job = self.client.get(response["Location"]).data
+        self.assertEqual(job["status"], "succeeded")
+        self.assertEqual(job["progress"], {"done": 3, "total": 3, "message": "Logging attendance"})
+        self.assertEqual(job["result"]["records_created"], 2)
+        self.assertEqual(job["result"]["unknown_usernames"], ["ghost"])
+        self.assertEqual(AttendanceRecord.objects.count(), 2)
+
+        bad = self.client.post("/api/admin/attendance/mark/?background=1", {
+            "topic": "Orientation", "volunteer_hours": {"vol0": "lots"},
+        }, format="json")
+        self.assertEqual(bad.status_code, 400)
+        self.assertEqual(Job.objects.count(), 1)
+        self.assertEqual(self.client.get("/api/admin/jobs/999/").status_code, 404)
+
+    def test_delete_and_export_run_in_worker_command(self):
+        make_volunteers(1)
+        Event.objects.create(title="Cleanup", description="", date=date(2025, 1, 1))
+        Event.objects.create(title="Gone", description="", date=date(2025, 2, 1))
+        self.client.post("/api/assign_hours/", {"volunteer": "vol0", "event": "Gone", "event_date": "2025-02-01", "hours": 4})
+        self.client.post("/api/assign_hours/", {"volunteer": "vol0", "event": "Cleanup", "event_date": "2025-01-01", "hours": 3})
+
+        deleted = self.client.delete("/api/events/delete_event/?event_name=Gone&event_date=2025-02-01&background=1")
+        self.assertEqual(deleted.status_code, 202)
+        self.assertTrue(Event.objects.filter(title="Gone").exists())
+        out = StringIO()
+        call_command("run_worker", "--burst", "--kinds", "delete_events", stdout=out)
+        self.assertIn("Succeeded 1, retrying 0, failed 0", out.getvalue())
+        self.assertFalse(Event.objects.filter(title="Gone").exists())
+        self.assertEqual(VolunteerStats.objects.get().event_hours, 3)
+        self.assertEqual(Job.objects.get(pk=deleted.data["job_id"]).result["deleted"], 3)  # event, hours, roster row
+
+        exported = self.client.get("/api/admin/export/hours/?background=1")
+        self.assertEqual(exported.status_code, 202)
+        file_url = f"/api/admin/jobs/{exported.data['job_id']}/file/"
+        self.assertEqual(self.client.get(file_url).status_code, 409)
+        call_command("run_worker", "--burst", stdout=StringIO())
+
+        self.assertEqual(self.client.get(exported["Location"]).data["file_url"], file_url)
+        response = self.client.get(file_url)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="hours.csv"')
+        expected = b"".join(self.client.get("/api/admin/export/hours/").streaming_content)
+        self.assertEqual(b"".join(response.streaming_content), expected)
+
+    def test_failures_retry_with_backoff_until_attempts_run_out(self):
+        job = jobs.enqueue("refresh_analytics", {})
+        failing = (mock.Mock(side_effect=RuntimeError("database went away")), 3, 1)
+        with mock.patch.dict(jobs.KINDS, {"refresh_analytics": failing}), self.assertLogs("volunteers.jobs") as logs:
+            self.assertEqual(jobs.run_pending(), 1)
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), ("queued", 1))
+            self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=20))
+            self.assertEqual(jobs.run_pending(), 0)  # not due yet
+
+            for _ in range(2):
+                Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+                jobs.run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 3))
+        self.assertEqual(job.error, "RuntimeError: database went away")
+        self.assertEqual(len(logs.records), 3)
+
+        bad_export = jobs.enqueue("export", {"dataset": "nope"})
+        with self.assertLogs("volunteers.jobs", "WARNING"):
+            jobs.run_pending()
+        bad_export.refresh_from_db()
+        self.assertEqual((bad_export.status, bad_export.attempts), ("failed", 1))  # bad input is not retried
+
+    def test_outcome_of_a_superseded_run_is_dropped(self):
+        job = jobs.enqueue("refresh_analytics", {})
+        first = jobs.claim("w1")
+        Job.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - jobs.LEASE - timedelta(seconds=1))
+        jobs.requeue_stale()
+        second = jobs.claim("w1")  # same worker name, later attempt
+
+        with self.assertLogs("volunteers.jobs", "WARNING"):
+            self.assertIsNone(jobs.run(first))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("running", 2))
+
+        self.assertEqual(jobs.run(second), "succeeded")
+        job.refresh_from_db()
+        self.assertEqual(job.status, "succeeded")
+
+    def test_kind_limits_stale_leases_and_pruning(self):
+        running = jobs.enqueue("refresh_analytics", {})
+        self.assertEqual(jobs.claim("w1").pk, running.pk)
+        jobs.enqueue("refresh_analytics", {"full": True})
+        self.assertIsNone(jobs.claim("w2"))  # one rollup refresh at a time
+
+        Job.objects.filter(pk=running.pk).update(heartbeat_at=timezone.now() - jobs.LEASE - timedelta(seconds=1))
+        self.assertEqual(jobs.requeue_stale(), (1, 0))
+        self.assertEqual(jobs.run_pending(), 2)
+
+        export = jobs.enqueue("export", {"dataset": "meetings", "output": "ndjson"})
+        jobs.run_pending()
+        export.refresh_from_db()
+        self.assertTrue(jobs.result_file(export).exists())
+        Job.objects.update(finished_at=timezone.now() - jobs.RETENTION - timedelta(days=1))
+        self.assertEqual(jobs.prune(), 3)
+        self.assertFalse(jobs.result_file(export).exists())
@@ -1,9 +1,8 @@
 from rest_framework.authtoken.views import ObtainAuthToken
 from rest_framework.authtoken.models import Token
 from rest_framework.response import Response
-from rest_framework import generics, permissions, filters
+from rest_framework import generics, permissions
 from django.contrib.auth.models import User
-from django.db.models import Sum
 from .serializers import (
     RegisterSerializer, UserSerializer, EventSerializer, VolunteerHoursSerializer
 )
@@ -17,10 +16,64 @@ from rest_framework.views import APIView, status
 from rest_framework.decorators import action
 from .models import AttendanceRecord
 from .serializers import AttendanceSerializer
+from .fast_read import ValuesReader
+
+# ✅ Serializer-shaped payloads read straight from .values() for the hot list endpoints
+EVENT_READER = ValuesReader(EventSerializer, extra_columns=('date', 'time', 'id'))
+ATTENDANCE_READER = ValuesReader(AttendanceSerializer, extra_columns=('id',))
+
 from datetime import datetime
 from django.utils.timezone import now
 from rest_framework.filters import SearchFilter
 from django.db.models import Q
+from django.db import transaction
+from .stats import record_event_hours
+from .attendance import mark_attendance, parse_hours, InvalidHours
+from .hours import assign_hours_batch, read_csv_entries, MAX_BATCH_ENTRIES
+from .imports import import_volunteers, read_csv_rows, MAX_IMPORT_ROWS, SYNC_IMPORT_ROWS
+from .leaderboard import leaderboard, LeaderboardError, DEFAULT_LIMIT, MAX_LIMIT, DEFAULT_AROUND, MAX_AROUND
+from .analytics import series as analytics_series, AnalyticsError
+from .changes import changes as change_feed, available_feeds, ChangeFeedError, ResyncRequired
+from .exports import export_rows, parse_filters, ExportError, FORMATS as EXPORT_FORMATS
+from django.http import StreamingHttpResponse
+from .authentication import counters as auth_counters
+from . import db_metrics
+from .request_metrics import registry as request_registry
+from django.http import HttpResponse
+from .cache import cached_profile, cached_event_list, versions_etag, user_scope, EVENTS_SCOPE, ROSTERS_SCOPE
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+from django.http import FileResponse
+from django.urls import reverse
+from .jobs import enqueue, describe as describe_job, result_file
+from .models import Job
+
+
+# ✅ Heavy admin operations can run on the job queue: `Prefer: respond-async` (or ?background=1) gets a 202
+def wants_background(request):
+    return "respond-async" in request.headers.get("Prefer", "") or request.query_params.get("background") in ("1", "true")
+
+def job_accepted(job):
+    url = reverse("job_status", args=[job.pk])
+    return Response({"job_id": job.pk, "status": job.status, "status_url": url},
+                    status=status.HTTP_202_ACCEPTED, headers={"Location": url})
+
+
+# ✅ ETags from the cache version counters: If-None-Match gets a 304 before any SQL runs
+def event_list_etag(request, *args, **kwargs):
+    return versions_etag((EVENTS_SCOPE, ROSTERS_SCOPE), request.get_full_path(), request.accepted_renderer.format)
+
+def volunteer_profile_etag(request, *args, **kwargs):
+    return versions_etag(
+        (user_scope(request.user.pk), EVENTS_SCOPE), request.user.pk, date.today().isoformat(),
+        request.accepted_renderer.format,
+    )
+
+def volunteer_attendance_etag(request, *args, **kwargs):
+    return versions_etag((user_scope(request.user.pk),), request.user.pk, request.get_full_path(), request.accepted_renderer.format)
+
+from .search import IndexedSearchFilter
+from .dashboard import build_parts, profile_payload, user_info_payload, PROFILE_PARTS, USER_INFO_PARTS
 
 
 # ✅ User Registration View
@@ -61,25 +114,8 @@ class UserView(generics.ListAPIView):
         if not user:
             return Response({"error": "Volunteer not found"}, status=404)
 
-        hours_worked = VolunteerHours.objects.filter(volunteer=user).aggregate(total_hours=Sum('hours'))['total_hours'] or 0
-        events_attended = Event.objects.filter(volunteers=user).values("title", "date")
-
-        # ✅ List of meeting topics where user has online_hours > 0
-        topics_attended = AttendanceRecord.objects.filter(
-            volunteer=user, online_hours__gt=0
-        ).values_list("topic", flat=True)
-
-        phone_number = getattr(user.profile, "phone_number", None)
-
-        return Response({
-            "id": user.id,
-            "username": user.username,
-            "email": user.email,
-            "phone_number": phone_number,
-            "hours_worked": hours_worked,
-            "events_attended": list(events_attended),
-            "topics_attended": list(topics_attended),  # 🔄 now a list of strings
-        })
+        # ✅ Same pieces as the async view in async_views.py, run one after another here
+        return Response(user_info_payload(user, build_parts(user, USER_INFO_PARTS)))
 
 
 
@@ -90,6 +126,10 @@ class EventListCreateView(generics.ListCreateAPIView):
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAdminUser]
+    cursor_ordering = ('date', 'time', 'id')
+
+    def get_queryset(self):
+        return EventSerializer.setup_eager_loading(super().get_queryset())
 
 
 # ✅ List Volunteers (Admin Only)
@@ -97,8 +137,14 @@ class VolunteerListView(generics.ListAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
     queryset = User.objects.filter(is_staff=False)
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['username']
+    filter_backends = [IndexedSearchFilter]
+    search_fields = ['username']  # icontains fallback on databases without an indexed backend
+    search_index = 'user'  # ✅ Ranked prefix search over username + email
+    cursor_ordering = 'id'
+
+    def get_queryset(self):
+        # ✅ Annotate/prefetch so the list costs the same number of queries for any size
+        return UserSerializer.setup_eager_loading(super().get_queryset())
 
 
 from rest_framework.permissions import IsAdminUser
@@ -123,19 +169,80 @@ class AssignVolunteerHoursView(APIView):
         # Fetch event by title and date
         event = get_object_or_404(Event, title=event_title, date=event_date)
 
-        # ✅ Ensure volunteer is linked to event
-        if not event.volunteers.filter(id=volunteer.id).exists():
-            event.volunteers.add(volunteer)  # ✅ Auto-link volunteer to event
+        with transaction.atomic():
+            # ✅ Lock the event like the batch path does, so a new volunteer/event pair is counted once
+            list(Event.objects.select_for_update().filter(pk=event.pk).values_list("pk"))
+            # ✅ Ensure volunteer is linked to event
+            if not event.volunteers.filter(id=volunteer.id).exists():
+                event.volunteers.add(volunteer)  # ✅ Auto-link volunteer to event
 
-        # ✅ Create or update VolunteerHours entry
-        volunteer_hours, created = VolunteerHours.objects.update_or_create(
-            volunteer=volunteer,
-            event=event,
-            defaults={'hours': hours}
-        )
+            previous_hours = VolunteerHours.objects.select_for_update().filter(
+                volunteer=volunteer, event=event
+            ).values_list('hours', flat=True).first() or 0
+
+            # ✅ Create or update VolunteerHours entry
+            volunteer_hours, created = VolunteerHours.objects.update_or_create(
+                volunteer=volunteer,
+                event=event,
+                defaults={'hours': hours}
+            )
+
+            # ✅ Keep the rollup in step with the change
+            record_event_hours(volunteer.id, int(volunteer_hours.hours) - previous_hours, 1 if created else 0)
 
         return Response({"message": "Volunteer hours assigned successfully"}, status=status.HTTP_201_CREATED)
+
+
+# ✅ Assign Volunteer Hours in bulk (Admin Only) — JSON {"entries": [...]} or a CSV upload in "file"
+class AssignVolunteerHoursBatchView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is not None:
+            try:
+                entries = read_csv_entries(upload.read().decode("utf-8-sig"))
+            except (UnicodeDecodeError, ValueError) as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            entries = request.data.get("entries") if isinstance(request.data, dict) else request.data
+
+        if not isinstance(entries, list) or not entries:
+            return Response({"error": "Provide a non-empty list of entries or a CSV file."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(entries) > MAX_BATCH_ENTRIES:
+            return Response({"error": f"At most {MAX_BATCH_ENTRIES} entries per batch."}, status=status.HTTP_400_BAD_REQUEST)
+
+        result = assign_hours_batch(entries)
+        return Response(result, status=status.HTTP_200_OK)
     
+# ✅ Import volunteers in bulk (Admin Only) — CSV upload in "file" or JSON {"volunteers": [...]}
+class ImportVolunteersView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+        if upload is not None:
+            try:
+                rows = read_csv_rows(upload.read().decode("utf-8-sig"))
+            except (UnicodeDecodeError, ValueError) as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        else:
+            rows = request.data.get("volunteers") if isinstance(request.data, dict) else request.data
+
+        if not isinstance(rows, list) or not rows:
+            return Response({"error": "Provide a non-empty list of volunteers or a CSV file."}, status=status.HTTP_400_BAD_REQUEST)
+
+        if len(rows) > MAX_IMPORT_ROWS:
+            return Response({"error": f"At most {MAX_IMPORT_ROWS} volunteers per import."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # ✅ PBKDF2 costs tens of ms per row: only small imports are hashed here, and never in a process pool
+        if len(rows) > SYNC_IMPORT_ROWS or wants_background(request):
+            return job_accepted(enqueue("import_volunteers", {"rows": rows}, request.user))
+
+        result = import_volunteers(rows, workers=1)
+        return Response(result, status=status.HTTP_201_CREATED if result["created"] else status.HTTP_200_OK)
+
 class EventPermissions(permissions.BasePermission):
     """
     Custom permission:
@@ -165,14 +272,29 @@ class EventViewSet(viewsets.ModelViewSet):
     serializer_class = EventSerializer
     permission_classes = [EventPermissions]
     queryset = Event.objects.all()
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [IndexedSearchFilter]
     search_fields = ['title']  # Enable search by event title
+    search_index = 'event'  # ✅ Ranked prefix search over title + description
+    cursor_ordering = ('date', 'time', 'id')
+
+    def get_queryset(self):
+        return EventSerializer.setup_eager_loading(super().get_queryset())
 
     @action(detail=False, methods=["get"], url_path="list", url_name="list")
+    @method_decorator(condition(etag_func=event_list_etag))
     def list_events(self, request):
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        return Response(serializer.data)
+        if not request.query_params:
+            # ✅ Unfiltered list is the same for everyone: serve it from the shared cache
+            data = cached_event_list(lambda: EVENT_READER.render(EVENT_READER.values(self.get_queryset())))
+            return Response(data)
+
+        queryset = EVENT_READER.values(self.filter_queryset(self.get_queryset()))
+
+        page = self.paginate_queryset(queryset)  # ✅ Only when ?page_size= or ?cursor= is sent
+        if page is not None:
+            return self.get_paginated_response(EVENT_READER.render(page))
+
+        return Response(EVENT_READER.render(queryset))
         
     # ✅ DELETE Event by Name and Date
 @action(detail=False, methods=['delete'], permission_classes=[permissions.IsAdminUser])
@@ -196,22 +318,162 @@ class VolunteerHoursSummaryView(generics.ListAPIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get(self, request, *args, **kwargs):
-        volunteers = User.objects.filter(is_staff=False).annotate(
-            total_hours=Sum('volunteerhours__hours')
+        # ✅ One scan over users joined to their VolunteerStats rollup, as plain tuples
+        volunteers = User.objects.filter(is_staff=False).values_list(
+            'id', 'username', 'email', 'stats__event_hours', 'stats__online_hours'
         )
 
         data = [
             {
-                "id": v.id,
-                "username": v.username,
-                "email": v.email,
-                "total_hours": v.total_hours or 0
+                "id": user_id,
+                "username": username,
+                "email": email,
+                "total_hours": event_hours if event_hours is not None else 0,
+                "online_hours": float(online_hours) if online_hours is not None else 0,
             }
-            for v in volunteers
+            for user_id, username, email, event_hours, online_hours in volunteers
         ]
-        
+
         return Response(data)
 
+# ✅ Leaderboard (Admin Only): /api/admin/leaderboard/?limit=10 or ?around=<username>&size=5, with ?period=all|week|month|year or ?start=&end=
+class LeaderboardView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+            size = min(int(request.query_params.get("size", DEFAULT_AROUND)), MAX_AROUND)
+        except ValueError:
+            return Response({"error": "limit and size must be whole numbers."}, status=status.HTTP_400_BAD_REQUEST)
+        if limit < 1 or size < 0:
+            return Response({"error": "limit must be at least 1 and size at least 0."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # ✅ Resolve `around` first: the cache key holds the user id, never the raw parameter
+        around_id = None
+        if "around" in request.query_params:
+            around_id = User.objects.filter(username=request.query_params["around"]).values_list("pk", flat=True).first()
+            if around_id is None:
+                return Response({"error": "Volunteer not found."}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            data = leaderboard(
+                limit=limit,
+                around_id=around_id,
+                size=size,
+                period=request.query_params.get("period"),
+                start=request.query_params.get("start"),
+                end=request.query_params.get("end"),
+            )
+        except LeaderboardError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if around_id and not data["results"]:
+            return Response({"error": "Volunteer has no hours in this period."}, status=status.HTTP_404_NOT_FOUND)
+        return Response(data)
+
+# ✅ Delta sync: /api/changes/?since=<token>&models=event,hours,attendance,profile
+# Without `since` only a starting token is returned; volunteers can follow events only
+class ChangeFeedView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        allowed = available_feeds(request.user)
+        requested = request.query_params.get("models")
+        feeds = [name.strip() for name in requested.split(",") if name.strip()] if requested else allowed
+        unknown = [name for name in feeds if name not in allowed]
+        if unknown:
+            return Response(
+                {"error": f"Unknown or unavailable model(s): {', '.join(unknown)}. Choose from: {', '.join(allowed)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            data = change_feed(request.query_params.get("since"), list(dict.fromkeys(feeds)))
+        except ResyncRequired as e:
+            return Response({"error": str(e)}, status=status.HTTP_410_GONE)
+        except ChangeFeedError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+
+# ✅ Hours time series (Admin Only): /api/admin/analytics/<event|volunteer|topic>/?granularity=day|month&key=&start=&end=
+# Served from the HoursRollup tables that `manage.py refresh_analytics` keeps up to date
+class AnalyticsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, dimension):
+        try:
+            data = analytics_series(
+                dimension,
+                granularity=request.query_params.get("granularity", "day"),
+                key=request.query_params.get("key"),
+                start=request.query_params.get("start"),
+                end=request.query_params.get("end"),
+            )
+        except AnalyticsError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
+
+# ✅ Rebuild the HoursRollup tables in the background (Admin Only): POST {"full": true} for a full rebuild
+class RefreshAnalyticsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def post(self, request):
+        full = request.data.get("full", False) if isinstance(request.data, dict) else False
+        return job_accepted(enqueue("refresh_analytics", {"full": bool(full)}, user=request.user))
+
+# ✅ Background job status (Admin Only): /api/admin/jobs/<id>/, and the file an export job wrote at .../file/
+class JobStatusView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, job_id):
+        job = Job.objects.filter(pk=job_id).first()
+        if job is None:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(describe_job(job))
+
+class JobFileView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, job_id):
+        job = Job.objects.filter(pk=job_id).first()
+        if job is None:
+            return Response({"error": "Job not found"}, status=status.HTTP_404_NOT_FOUND)
+        if job.status != Job.SUCCEEDED:
+            return Response({"error": f"Job is {job.status}"}, status=status.HTTP_409_CONFLICT)
+        path = result_file(job)
+        if path is None:
+            return Response({"error": "Job has no file"}, status=status.HTTP_404_NOT_FOUND)
+        if not path.exists():
+            return Response({"error": "Job file has been pruned"}, status=status.HTTP_410_GONE)
+        return FileResponse(
+            open(path, "rb"), as_attachment=True, filename=job.result["filename"], content_type=job.result["content_type"]
+        )
+
+# ✅ Streaming exports (Admin Only): /api/admin/export/<hours|attendance|meetings>/?output=csv|ndjson&start=&end=&event=
+class ExportView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, dataset):
+        output = request.query_params.get("output", "csv")
+        try:
+            export_filters = parse_filters(
+                request.query_params.get("start"),
+                request.query_params.get("end"),
+                request.query_params.get("event"),
+            )
+            rows = export_rows(dataset, output, **export_filters)
+        except ExportError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if wants_background(request):
+            payload = {"dataset": dataset, "output": output,
+                       **{name: request.query_params.get(name) for name in ("start", "end", "event")}}
+            return job_accepted(enqueue("export", payload, user=request.user))
+
+        response = StreamingHttpResponse(rows, content_type=EXPORT_FORMATS[output])
+        response["Content-Disposition"] = f'attachment; filename="{dataset}.{output}"'
+        return response
+
+
 class DeleteEventView(APIView):
     permission_classes = [IsAdminUser]
 
@@ -228,7 +490,11 @@ class DeleteEventView(APIView):
             if not events.exists():
                 return Response({"error": "No matching events found"}, status=status.HTTP_404_NOT_FOUND)
 
-            deleted_count, _ = events.delete()
+            if wants_background(request):
+                payload = {"event_name": event_name, "event_date": event_date}
+                return job_accepted(enqueue("delete_events", payload, user=request.user))
+
+            deleted_count, _ = events.delete()  # ✅ The rollup and caches follow via Event's pre_delete
             return Response({"message": f"{deleted_count} event(s) deleted successfully"}, status=status.HTTP_200_OK)
 
         except Exception as e:
@@ -251,23 +517,22 @@ class MarkAttendanceView(APIView):
         if not isinstance(volunteer_hours, dict):
             return Response({"error": "Invalid format for volunteer_hours."}, status=status.HTTP_400_BAD_REQUEST)
 
-        all_volunteers = User.objects.filter(is_staff=False)
-
-        for volunteer in all_volunteers:
-            username = volunteer.username
-            if username in volunteer_hours:
-                try:
-                    hours = float(volunteer_hours[username])
-                except ValueError:
-                    return Response({"error": f"Invalid hours for {username}."}, status=status.HTTP_400_BAD_REQUEST)
+        # ✅ One username__in lookup + one bulk_create in a single transaction
+        idempotency_key = request.headers.get("Idempotency-Key") or request.data.get("idempotency_key")
+        if wants_background(request):
+            try:
+                parse_hours(volunteer_hours)  # reject bad hours now rather than in the worker
+            except InvalidHours as e:
+                return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+            payload = {"topic": topic, "volunteer_hours": volunteer_hours, "idempotency_key": idempotency_key}
+            return job_accepted(enqueue("mark_attendance", payload, user=request.user))
 
-                AttendanceRecord.objects.create(
-                    volunteer=volunteer,
-                    topic=topic,
-                    online_hours=hours
-                )
+        try:
+            result = mark_attendance(topic, volunteer_hours, idempotency_key=idempotency_key)
+        except InvalidHours as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response({"message": "Online hours logged successfully."}, status=status.HTTP_200_OK)
+        return Response({"message": "Online hours logged successfully.", **result}, status=status.HTTP_200_OK)
 
 
     
@@ -275,9 +540,21 @@ class MarkAttendanceView(APIView):
 class VolunteerAttendanceView(generics.ListAPIView):
     serializer_class = AttendanceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cursor_ordering = '-id'
+
+    @method_decorator(condition(etag_func=volunteer_attendance_etag))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
+    def list(self, request, *args, **kwargs):
+        queryset = ATTENDANCE_READER.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(ATTENDANCE_READER.render(page))
+        return Response(ATTENDANCE_READER.render(queryset))
 
     def get_queryset(self):
-        return AttendanceRecord.objects.filter(volunteer=self.request.user).order_by("-id")  # latest first
+        return AttendanceRecord.objects.filter(volunteer=self.request.user).select_related("volunteer").order_by("-id")  # latest first
 
 
 
@@ -286,37 +563,17 @@ from .models import Event, VolunteerHours, AttendanceRecord
 class VolunteerProfileView(APIView):
     permission_classes = [IsAuthenticated]
 
+    @method_decorator(condition(etag_func=volunteer_profile_etag))
     def get(self, request):
         user = request.user
-
-        hours_worked = VolunteerHours.objects.filter(volunteer=user).aggregate(total_hours=Sum('hours'))['total_hours'] or 0
-        events_attended = Event.objects.filter(volunteers=user).values("title", "date")
-        upcoming_events = Event.objects.filter(date__gte=date.today()).values("title", "date", "time", "description")
-        
-        attendance_records = AttendanceRecord.objects.filter(volunteer=user).order_by("-id").values(
-            "topic", "online_hours"
-        )
-
-        phone_number = getattr(user.profile, "phone_number", None)
-
-        response_data = {
-            "username": user.username,
-            "email": user.email,
-            "phone_number": phone_number,
-            "hours_worked": hours_worked,
-            "events_attended": list(events_attended),
-            "upcoming_events": list(upcoming_events),
-            "attendance": [
-                {
-                    "topic": record["topic"],
-                    "hours": float(record["online_hours"]) if record["online_hours"] is not None else 0
-                }
-                for record in attendance_records
-            ],
-        }
-
+        # ✅ Versioned per-user cache: a hit is one cache round trip and no SQL
+        response_data = cached_profile(user.pk, lambda: self.build_profile(user))
         return Response(response_data, status=200)
 
+    def build_profile(self, user):
+        # ✅ hours from the VolunteerStats rollup, upcoming events from the shared cache
+        return profile_payload(user, build_parts(user, PROFILE_PARTS))
+
 from rest_framework.decorators import api_view, permission_classes
 
 @api_view(['POST'])
@@ -334,4 +591,25 @@ def reset_volunteer_password(request):
         user.save()
         return Response({'message': 'Password reset successfully.'})
     except User.DoesNotExist:
-        return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
\ No newline at end of file
+        return Response({'error': 'User not found.'}, status=status.HTTP_404_NOT_FOUND)
+
+
+# ✅ Admin: token cache hit/miss counters for this worker process
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def auth_cache_stats(request):
+    return Response(auth_counters.snapshot())
+
+
+# ✅ Admin: connection reuse (churn) and pool checkout/wait counters for this worker process
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def db_pool_stats(request):
+    return Response(db_metrics.snapshot())
+
+
+# ✅ Admin: per-view latency histogram, SQL and response-size counters in Prometheus text format
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def request_metrics(request):
+    return HttpResponse(request_registry.render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")